@@ -0,0 +1,370 @@
+"""API JSON de los métodos numéricos: /api/v1/<método>.
+
+Recibe en un objeto JSON los mismos campos que el formulario del método y
+llama a las mismas funciones de app/backend.py que las rutas de las secciones
+(con su caché), sin armar ni devolver HTML. Los números pueden ir como número
+o como texto y las matrices y vectores como listas o con la sintaxis de MATLAB:
+
+    POST /api/v1/newton
+    {"f": "x^2-2", "x": 1, "tol": 1e-6, "niter": 100, "et": "Decimales Correctos"}
+
+    {"metodo": "newton", "clave": "...", "salidas": {"resultado": "..."},
+     "tabla": {"Iteration": [1, 2, ...], "xn": [...], "fxn": [...], ...}}
+
+Los métodos lote* resuelven muchos problemas en una petición (ver
+app/numerico/lotes.py): f, los extremos, el parámetro p, tol, niter y el tipo
+de error pueden ser un valor o una lista con uno por problema, y la tabla
+tiene una fila por problema:
+
+    POST /api/v1/loteBiseccion
+    {"f": "x^2 - p", "p": [1, 2, 3], "xi": 0, "xs": 5, "tol": 1e-8, "niter": 100,
+     "tipe": "Decimales Correctos"}
+
+La tabla va por columnas (una lista por columna) y los valores que no son
+finitos como null. La respuesta se serializa con orjson si está instalado.
+clave sirve para pedir la descarga de la tabla en /<método>/descargar (la de
+los lotes en /api/v1/lote/descargar y la de raicesPolinomio en
+/api/v1/polinomio/descargar).
+
+/api/v1/interpolacion/evaluar evalúa el polinomio de lagrange, newtonint o
+vandermonde, o el trazador de spline, en muchos puntos sin reconstruirlo: con
+la clave de un resultado o con los mismos datos del método, y t como lista o
+como rejilla uniforme:
+
+    POST /api/v1/interpolacion/evaluar
+    {"metodo": "lagrange", "clave": "...", "t": {"a": 0, "b": 1, "puntos": 1000000}}
+
+/api/v1/newtonint/sesion abre una interpolación de Newton incremental: cada
+POST a /api/v1/newtonint/sesion/<id> agrega puntos {"x": ..., "y": ...} en O(n)
+cada uno y devuelve los coeficientes de la forma de Newton actualizados (y los
+valores en t si se envía).
+
+METODOS también lo usa la cola de trabajos (/trabajos/<método>).
+"""
+import json
+import math
+
+import numpy as np
+from flask import Blueprint, Response, request
+from werkzeug.exceptions import HTTPException
+
+from app import backend, descargas, sesiones, tablas
+from app.numerico import interpolacion, sistemas
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa json de la biblioteca estándar
+    orjson = None
+
+blueprint = Blueprint('api', __name__, url_prefix='/api/v1')
+
+# Puntos máximos por evaluación de un interpolante
+MAX_EVALUACION = 10000000
+
+
+def _numero(valor):
+    return float(valor.replace(',', '.')) if isinstance(valor, str) else float(valor)
+
+
+def _entero(valor):
+    return int(valor) if isinstance(valor, str) else int(_numero(valor))
+
+
+def _texto(valor):
+    # Listas de la API a la sintaxis de MATLAB que reciben los .m ('[1 2; 3 4]')
+    if isinstance(valor, str):
+        return valor
+    arreglo = np.asarray(valor, dtype=float)
+    if arreglo.ndim == 2:
+        return '[' + ';'.join(' '.join(repr(v) for v in fila) for fila in arreglo.tolist()) + ']'
+    return '[' + ' '.join(repr(v) for v in arreglo.ravel().tolist()) + ']'
+
+
+def _datos(valor):
+    # Vectores largos como arreglo: la caché los identifica por su hash, sin pasarlos a texto
+    return valor if isinstance(valor, str) else np.asarray(valor, dtype=float).ravel()
+
+
+def _matriz(valor):
+    # A escrita como JSON COO/CSR se convierte en matriz dispersa, como en /jacobi
+    if isinstance(valor, str) and valor.strip().startswith('{'):
+        valor = json.loads(valor)
+    return sistemas.dispersa(valor) if isinstance(valor, dict) else _texto(valor)
+
+
+def _lista(valor):
+    return json.loads(valor) if isinstance(valor, str) else list(valor)
+
+
+def _valores(valor):
+    # Un valor para todos los problemas del lote o una lista con uno por problema
+    if isinstance(valor, list) or isinstance(valor, str) and valor.lstrip().startswith('['):
+        return [_numero(v) for v in _lista(valor)]
+    return _numero(valor)
+
+
+def _lote(metodo, a, b, tipo):
+    return lambda d: (metodo, d['f'], _valores(d[a]), _valores(d[b]), _valores(d.get('p', 0)),
+                      _valores(d['tol']), _valores(d['niter']), d[tipo])
+
+
+def _puntos(valor):
+    # Lista de puntos, '[0 0.5 1]' o {"a": 0, "b": 1, "puntos": 1000000} para una rejilla uniforme
+    if isinstance(valor, dict):
+        puntos = _entero(valor['puntos'])
+        if not 1 <= puntos <= MAX_EVALUACION:
+            raise ValueError('se pueden evaluar entre 1 y %d puntos' % MAX_EVALUACION)
+        return np.linspace(_numero(valor['a']), _numero(valor['b']), puntos)
+    if isinstance(valor, str):
+        return np.array(valor.strip().strip('[]').replace(',', ' ').split(), dtype=float)
+    return np.asarray(valor, dtype=float).ravel()
+
+
+def _radio(datos):
+    return 'omitir_radio' not in datos or datos['omitir_radio'] in (False, 'false', '0')
+
+
+# Interpolantes que se pueden evaluar: (función del backend, posición del interpolante en su resultado)
+INTERPOLANTES = {'lagrange': (backend.lagrange, 2), 'newtonint': (backend.newtonint, 3),
+                 'vandermonde': (backend.vandermonde, 2), 'spline': (backend.spline, 1)}
+
+
+# Método: (función del backend, lectura de sus argumentos, nombre de cada salida
+# antes de la tabla; None omite las que ya están en la tabla)
+METODOS = {
+    'biseccion': (backend.biseccion, lambda d: (
+        d['f'], _numero(d['xi']), _numero(d['xs']), _numero(d['tol']), _entero(d['niter']), d['tipe']),
+        ('resultado', None, None, None, None)),
+    'brent': (backend.brent, lambda d: (
+        d['f'], _numero(d['xi']), _numero(d['xs']), _numero(d['tol']), _entero(d['niter']), d['tipe']),
+        ('resultado', None, None, None, None)),
+    'illinois': (backend.illinois, lambda d: (
+        d['f'], _numero(d['xi']), _numero(d['xs']), _numero(d['tol']), _entero(d['niter']), d['tipe']),
+        ('resultado', None, None, None, None)),
+    'reglaFalsa': (backend.regla_falsa, lambda d: (
+        d['f'], _numero(d['x0']), _numero(d['x1']), _numero(d['tol']), _entero(d['niter']), d['Terror']),
+        ('resultado',)),
+    'secante': (backend.secante, lambda d: (
+        d['f'], _numero(d['x0']), _numero(d['x1']), _numero(d['tol']), _entero(d['niter']), d['Terror']),
+        ('resultado', None, None, None, None)),
+    'newton': (backend.newton, lambda d: (
+        d['f'], _numero(d['x']), _numero(d['tol']), _entero(d['niter']), d['et']),
+        ('resultado', None, None, None, None, None, 'iteraciones')),
+    'todasRaices': (backend.todas_las_raices, lambda d: (
+        d['f'], _numero(d['xi']), _numero(d['xs']), _entero(d.get('puntos') or 1000), _numero(d['tol']),
+        _entero(d['niter']), d['tipe'], d.get('metodo', 'biseccion')),
+        ('resultado', 'raices', 'iteraciones')),
+    'cuencas': (backend.cuencas_newton, lambda d: (
+        d['f'], d.get('metodo', 'newton'), _numero(d['re_min']), _numero(d['re_max']), _entero(d['n_re']),
+        _numero(d.get('im_min', 0)), _numero(d.get('im_max', 0)), _entero(d.get('n_im', 1)),
+        _numero(d['tol']), _entero(d['niter']), d['et']),
+        ('resultado', 'raices', 'cuencas', 'iteraciones')),
+    'raicesPolinomio': (backend.raices_polinomio, lambda d: (d['f'],),
+                        ('resultado', 'coeficientes', 'raices', 'multiplicidades')),
+    'puntoFijo': (backend.punto_fijo, lambda d: (
+        d['f'], d['g'], _numero(d['x']), _numero(d['tol']), _entero(d['niter']), d['tipe'],
+        d.get('aceleracion') or ''),
+        ('resultado', None, None, None, None)),
+    'raicesMultiples': (backend.raices_multiples, lambda d: (
+        d['fn'], _numero(d['xi']), _numero(d['tol']), _entero(d['k']), d['et']),
+        ('raiz', None, 'resultado')),
+    'loteBiseccion': (backend.lote, _lote('biseccion', 'xi', 'xs', 'tipe'), ('resultado', 'estados')),
+    'loteReglaFalsa': (backend.lote, _lote('reglaFalsa', 'x0', 'x1', 'Terror'), ('resultado', 'estados')),
+    'loteSecante': (backend.lote, _lote('secante', 'x0', 'x1', 'Terror'), ('resultado', 'estados')),
+    'jacobi': (backend.jacobi, lambda d: (
+        _texto(d['x']), _matriz(d['A']), _texto(d['b']), _numero(d['tol']), _entero(d['niter']),
+        d['error_type'], _radio(d)),
+        ('resultado', None, None, None, 'radio')),
+    'gaussSeidel': (backend.gauss_seidel, lambda d: (
+        _texto(d['x']), _matriz(d['A']), _texto(d['b']), d['et'], _numero(d['tol']), _entero(d['niter']),
+        _radio(d)),
+        ('resultado', None, None, None, 'radio', 'iteraciones')),
+    'sor': (backend.sor, lambda d: (
+        _texto(d['x']), _matriz(d['A']), _texto(d['b']), _numero(d['tol']), _entero(d['niter']),
+        _numero(d['w']), d['et'], _radio(d)),
+        ('resultado', None, None, None, 'radio')),
+    'sorOptimo': (backend.barrido_sor, lambda d: (
+        _texto(d['x']), _matriz(d['A']), _texto(d['b']), _numero(d['tol']), _entero(d['niter']), d['et'],
+        _entero(d.get('puntos') or 19)),
+        ('w', 'resultado', None, None, None, 'radio', 'tabla_sor')),
+    'lagrange': (backend.lagrange, lambda d: (_lista(d['vectorx']), _lista(d['vectory'])),
+                 ('polinomio', 'coeficientes', 'interpolante')),
+    'newtonint': (backend.newtonint, lambda d: (_lista(d['vectorx']), _lista(d['vectory'])),
+                  ('polinomio', 'coeficientes', None, 'interpolante')),
+    'vandermonde': (backend.vandermonde, lambda d: (
+        _lista(d['vectorx']), _lista(d['vectory']), d.get('base') or 'potencias'),
+                    ('polinomio', 'coeficientes', 'interpolante', 'condicion')),
+    'spline': (backend.spline, lambda d: (_datos(d['x']), _datos(d['y']), _entero(d['d'])),
+               ('coeficientes', 'interpolante')),
+}
+
+
+def _columnas(valor):
+    # orjson serializa directamente los arreglos numéricos contiguos; el resto pasa por aquí
+    if isinstance(valor, np.ndarray):
+        return np.ascontiguousarray(valor) if valor.dtype.kind in 'fiub' and not valor.flags.c_contiguous \
+            else valor.tolist()
+    raise TypeError
+
+
+def respuesta(datos, estado=200):
+    """Respuesta JSON de la API y de /trabajos/<id>: NaN e Inf como null."""
+    if orjson is not None:
+        # orjson escribe NaN e Inf como null
+        cuerpo = orjson.dumps(datos, default=_columnas,
+                              option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    else:
+        cuerpo = json.dumps(_nulos(datos))
+    return Response(cuerpo, status=estado, mimetype='application/json')
+
+
+def _nulos(valor):
+    # Igual que orjson: los valores que no son finitos como null
+    if isinstance(valor, dict):
+        return {str(k): _nulos(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple, np.ndarray)):
+        return [_nulos(v) for v in valor]
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+
+@blueprint.errorhandler(Exception)
+def _error(e):
+    # La API siempre responde JSON: también los errores HTTP y los inesperados
+    if isinstance(e, HTTPException):
+        return respuesta({'error': e.description}, e.code)
+    return respuesta({'error': f'Error interno: {e}'}, 500)
+
+
+@blueprint.route('/')
+def metodos():
+    return respuesta({'metodos': sorted(METODOS)})
+
+
+@blueprint.route('/<metodo>', methods=['POST'])
+def resolver(metodo):
+    if metodo not in METODOS:
+        return respuesta({'error': f"Método no reconocido: '{metodo}'"}, 404)
+    funcion, leer, nombres = METODOS[metodo]
+    datos = request.get_json(silent=True)
+    if not isinstance(datos, dict):
+        return respuesta({'error': 'El cuerpo debe ser un objeto JSON'}, 400)
+    try:
+        args = leer(datos)
+    except (KeyError, ValueError, TypeError, backend.ErrorMetodo) as e:
+        return respuesta({'error': f'Faltan datos o no son válidos: {e}'}, 400)
+    try:
+        resultado = funcion(*args)
+    except backend.ERRORES as e:
+        return respuesta({'error': f'Error en {backend.NOMBRE}: {e}'}, 422)
+    return respuesta({
+        'metodo': metodo,
+        'clave': backend.clave_actual(),
+        'salidas': {nombre: valor for nombre, valor in zip(nombres, resultado[:-1]) if nombre},
+        'tabla': resultado[-1],
+    })
+
+
+@blueprint.route('/lote/descargar', methods=['POST'])
+def descargar_lote():
+    return descargas.respuesta('lote')
+
+
+@blueprint.route('/polinomio/descargar', methods=['POST'])
+def descargar_polinomio():
+    return descargas.respuesta('raices_polinomio')
+
+
+@blueprint.route('/interpolacion/evaluar', methods=['POST'])
+def evaluar_interpolante():
+    datos = request.get_json(silent=True)
+    if not isinstance(datos, dict):
+        return respuesta({'error': 'El cuerpo debe ser un objeto JSON'}, 400)
+    if datos.get('metodo') not in INTERPOLANTES:
+        return respuesta({'error': f"Interpolación no reconocida: '{datos.get('metodo')}'"}, 404)
+    funcion, posicion = INTERPOLANTES[datos['metodo']]
+    try:
+        t = _puntos(datos['t'])
+        # Los mismos campos que /api/v1/<método>
+        args = None if 'clave' in datos else METODOS[datos['metodo']][1](datos)
+    except (KeyError, ValueError, TypeError, backend.ErrorMetodo) as e:
+        return respuesta({'error': f'Faltan datos o no son válidos: {e}'}, 400)
+    if len(t) > MAX_EVALUACION:
+        return respuesta({'error': 'Se pueden evaluar hasta %d puntos' % MAX_EVALUACION}, 400)
+
+    try:
+        if args is None:
+            # Un resultado ya calculado (en la página o en la API) por su clave
+            clave, resultado = datos['clave'], backend.guardado(funcion.__name__, datos['clave'])
+            if resultado is None:
+                return respuesta({'error': 'El resultado ya no está en la caché: envíe vectorx y vectory'}, 404)
+        else:
+            resultado = funcion(*args)
+            clave = backend.clave_actual()
+        valores = interpolacion.evaluar(resultado[posicion], t)
+    except backend.ERRORES as e:
+        return respuesta({'error': f'Error en {backend.NOMBRE}: {e}'}, 422)
+    return respuesta({'metodo': datos['metodo'], 'clave': clave, 'valores': valores})
+
+
+# Interpolación de Newton incremental (ver app/sesiones.py)
+
+def _sesion_json(sesion, t=None, tabla=False):
+    newton = sesion.newton
+    datos = {'sesion': sesion.id, 'puntos': len(newton), 'x': newton.nodos(), 'coeficientes': newton.coeficientes()}
+    if t is not None:
+        datos['valores'] = interpolacion.evaluar(newton.interpolante(), t) if len(newton) else None
+    if tabla:
+        Tabla = newton.tabla()
+        columnas = {'x': Tabla[:, 0], 'y': Tabla[:, 1]}
+        for j in range(2, Tabla.shape[1]):
+            columnas[f'D{j - 1}'] = Tabla[:, j]
+        datos['tabla'] = tablas.tabla(**columnas)
+    return datos
+
+
+def _agregar(sesion, datos):
+    # Agrega los puntos del cuerpo (si hay) y devuelve la sesión como JSON
+    try:
+        t = _puntos(datos['t']) if 't' in datos else None
+        x, y = (_valores(datos['x']), _valores(datos['y'])) if 'x' in datos or 'y' in datos else ([], [])
+    except (KeyError, ValueError, TypeError) as e:
+        return respuesta({'error': f'Faltan datos o no son válidos: {e}'}, 400)
+    if t is not None and len(t) > MAX_EVALUACION:
+        return respuesta({'error': 'Se pueden evaluar hasta %d puntos' % MAX_EVALUACION}, 400)
+    with sesion.candado:
+        try:
+            sesion.newton.agregar_puntos(x, y)
+        except backend.ErrorMetodo as e:
+            return respuesta({'error': str(e), **_sesion_json(sesion)}, 422)
+        return respuesta(_sesion_json(sesion, t))
+
+
+@blueprint.route('/newtonint/sesion', methods=['POST'])
+def abrir_sesion():
+    datos = request.get_json(silent=True)
+    datos = datos if isinstance(datos, dict) else {}
+    try:
+        sesion = sesiones.sesiones.abrir()
+    except sesiones.DemasiadasSesiones as e:
+        return respuesta({'error': str(e)}, 503)
+    return _agregar(sesion, datos)
+
+
+@blueprint.route('/newtonint/sesion/<id_sesion>', methods=['GET', 'POST', 'DELETE'])
+def sesion_newton(id_sesion):
+    if request.method == 'DELETE':
+        return respuesta({'cerrada': sesiones.sesiones.cerrar(id_sesion)})
+    sesion = sesiones.sesiones.obtener(id_sesion)
+    if sesion is None:
+        return respuesta({'error': 'La sesión no existe o se cerró por inactividad'}, 404)
+    if request.method == 'GET':
+        with sesion.candado:
+            return respuesta(_sesion_json(sesion, tabla=True))
+    datos = request.get_json(silent=True)
+    if not isinstance(datos, dict):
+        return respuesta({'error': 'El cuerpo debe ser un objeto JSON'}, 400)
+    return _agregar(sesion, datos)
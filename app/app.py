@@ -1,6 +1,10 @@
-from flask import Flask, render_template, request
-import matlab.engine
+import math
+import re
 
+from flask import Flask, jsonify, render_template, request
+
+from app import api, artefactos, backend, cache, flujo, tablas, trabajos
+from app.numerico import derivadas
 import app.seccion_1 as seccion_1
 import app.seccion_2 as seccion_2
 import app.seccion_3 as seccion_3
@@ -12,6 +16,17 @@ app = Flask(__name__)
 app.register_blueprint(seccion_1.blueprint)
 app.register_blueprint(seccion_2.blueprint)
 app.register_blueprint(seccion_3.blueprint)
+app.register_blueprint(api.blueprint)
+
+@app.before_request
+def _nueva_peticion():
+    # La clave de descarga de una petición anterior del mismo hilo no aplica a esta
+    backend.olvidar_clave()
+
+@app.context_processor
+def _descarga():
+    # Campos del formulario de descarga (templates/descarga.html)
+    return {'clave_resultado': backend.clave_actual(), 'parquet_disponible': tablas.PARQUET}
 
 @app.route('/')
 def home():
@@ -21,21 +36,96 @@ def home():
 def ayuda():
     return render_template('ayuda.html')
 
+@app.route('/cache/estado')
+def estado_cache():
+    # Aciertos y fallos de la caché de resultados por método
+    return jsonify(cache.resultados.estadisticas())
+
+@app.route('/artefactos/<nombre>')
+def artefacto(nombre):
+    # Gráficas y archivos de descarga guardados por su hash (ver app/artefactos.py)
+    descarga = request.args.get('descarga')
+    if descarga is not None and not re.fullmatch(r'[\w.-]+', descarga):
+        descarga = None
+    return artefactos.almacen.respuesta(nombre, descarga)
+
+@app.route('/artefactos/estado')
+def estado_artefactos():
+    return jsonify(artefactos.almacen.estadisticas())
+
+# Métodos que pueden mostrar sus iteraciones en vivo (ver app/flujo.py)
+METODOS_FLUJO = {'jacobi': 'Jacobi', 'gaussSeidel': 'Gauss-Seidel', 'sor': 'SOR', 'newton': 'Newton'}
+
+@app.route('/vivo/<metodo>')
+def vivo(metodo):
+    if metodo not in METODOS_FLUJO:
+        return 'Método no disponible en vivo', 404
+    fuente = f'/{metodo}/flujo?' + request.query_string.decode()
+    return render_template('vivo.html', metodo=METODOS_FLUJO[metodo], fuente=fuente)
+
+@app.route('/flujo/<id_flujo>/cancelar', methods=['POST'])
+def cancelar_flujo(id_flujo):
+    return jsonify({'cancelado': flujo.cancelar(id_flujo)})
+
+
+# Cola de trabajos (ver app/trabajos.py)
+
+def _trabajo_json(trabajo):
+    datos = trabajo.resumen()
+    if trabajo.estado == trabajos.TERMINADO:
+        # La última salida de cada método es su tabla de iteraciones
+        datos['resultado'] = {'salidas': trabajo.resultado[:-1], 'tabla': trabajo.resultado[-1]}
+    return datos
+
+
+@app.route('/trabajos/<metodo>', methods=['POST'])
+def enviar_trabajo(metodo):
+    if metodo not in api.METODOS:
+        return jsonify({'error': f"Método no reconocido: '{metodo}'"}), 404
+    funcion, leer, _ = api.METODOS[metodo]
+    try:
+        args = leer(request.form)
+        tiempo_limite = float(request.form['tiempo_limite']) if request.form.get('tiempo_limite') else None
+        if tiempo_limite is not None and not (math.isfinite(tiempo_limite) and tiempo_limite > 0):
+            raise ValueError("'tiempo_limite' debe ser un número de segundos mayor que 0")
+    except (KeyError, ValueError, backend.ErrorMetodo) as e:
+        return jsonify({'error': f'Faltan datos o no son válidos: {e}'}), 400
+    try:
+        trabajo = trabajos.cola.enviar(metodo, funcion, args, tiempo_limite)
+    except trabajos.ColaLlena as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify(trabajo.resumen()), 202
+
+@app.route('/trabajos/<id_trabajo>')
+def consultar_trabajo(id_trabajo):
+    # ?esperar=segundos mantiene la petición abierta hasta que el trabajo termine
+    try:
+        esperar = float(request.args.get('esperar') or 0)
+    except ValueError:
+        esperar = math.nan
+    if not math.isfinite(esperar):
+        return jsonify({'error': "'esperar' debe ser un número de segundos"}), 400
+    trabajo = trabajos.cola.esperar(id_trabajo, min(max(esperar, 0), 60))
+    if trabajo is None:
+        return jsonify({'error': 'El trabajo no existe o ya fue descartado'}), 404
+    # Mismo codificador que /api/v1: NaN e Inf como null
+    return api.respuesta(_trabajo_json(trabajo))
+
+@app.route('/trabajos/<id_trabajo>/cancelar', methods=['POST'])
+def cancelar_trabajo(id_trabajo):
+    return jsonify({'cancelado': trabajos.cola.cancelar(id_trabajo)})
+
+@app.route('/trabajos/estado')
+def estado_trabajos():
+    # Profundidad de la cola y trabajos por estado
+    return jsonify(trabajos.cola.estadisticas())
+
 
 @app.route('/derivar', methods=['POST'])
 def derivar():
     function_str = request.form['function']
     try:
-        function_str = function_str.replace("'", "''")
-        eng = matlab.engine.start_matlab()
-        cmd = f"syms x; fn = str2sym('{function_str}'); df = diff(fn, x); df_str = char(df);"
-        eng.eval(cmd, nargout=0)
-
-        derivative = eng.workspace['df_str']
-        
-        eng.quit()
-        
-        result = str(derivative)
+        result = derivadas.derivada_texto(function_str)
     except Exception as e:
         result = f"Error: {e}"
     return render_template('ayuda.html', result=result)
@@ -0,0 +1,190 @@
+"""Almacén de los archivos generados: gráficas, figuras de MATLAB y tablas de descarga.
+
+Cada archivo se guarda con el hash de su contenido como nombre
+(<hash>.<extensión>), así dos usuarios con funciones parecidas nunca se pisan
+y el mismo contenido se guarda una sola vez. Los SVG, JSON y CSV se guardan
+además comprimidos (.gz y, si está instalado brotli, .br) para no comprimirlos
+en cada petición.
+
+/artefactos/<nombre> responde con un ETag fuerte (el hash) y Cache-Control
+immutable: el contenido de un nombre nunca cambia, así que una descarga
+repetida con If-None-Match recibe 304 sin leer el disco.
+
+La carpeta se recorta por edad y por tamaño (config.ARTEFACTOS_*). Un índice
+en memoria relaciona la clave de los datos que produjeron un archivo con su
+nombre, para no volver a generarlo mientras siga en disco.
+"""
+import gzip
+import hashlib
+import os
+import re
+import threading
+import time
+
+from flask import Response, request, send_file
+
+from app import cache, config, tablas
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TIPOS = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+    'json': 'application/json',
+    **{formato: tipo for formato, (_, tipo) in tablas.FORMATOS.items()},
+}
+# Formatos de texto que vale la pena guardar comprimidos
+COMPRIMIBLES = ('svg', 'json', 'csv')
+
+NOMBRE = re.compile(r'([0-9a-f]{32})\.(' + '|'.join(TIPOS) + r')')
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Segundos mínimos entre dos recortes de la carpeta
+INTERVALO_RECORTE = 60
+
+
+class Almacen:
+    """Archivos direccionados por contenido con recorte por edad y tamaño."""
+
+    def __init__(self, directorio, max_bytes=200 * 1024 * 1024, max_edad=7 * 24 * 3600):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.max_edad = max_edad
+        self._indice = cache.CacheResultados(maximo=4096)
+        self._candado = threading.Lock()
+        self._ultimo_recorte = 0.0
+        os.makedirs(directorio, exist_ok=True)
+
+    def guardar(self, contenido, extension, clave=None):
+        """Guarda el contenido (bytes) y devuelve su nombre. clave lo registra en el índice."""
+        nombre = f'{hashlib.sha256(contenido).hexdigest()[:32]}.{extension}'
+        ruta = os.path.join(self.directorio, nombre)
+        if os.path.exists(ruta):
+            os.utime(ruta)  # Marcar como usado recientemente
+        else:
+            if extension in COMPRIMIBLES:
+                _escribir(ruta + '.gz', gzip.compress(contenido, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    _escribir(ruta + '.br', brotli.compress(contenido))
+            # El original al final: si existe, sus variantes comprimidas también
+            _escribir(ruta, contenido)
+        if clave is not None:
+            self._indice.guardar(extension, clave, nombre)
+        self._recortar()
+        return nombre
+
+    def buscar(self, clave, extension):
+        """Nombre del archivo registrado con clave, o None si no existe o ya se borró."""
+        nombre = self._indice.obtener(extension, clave)
+        return nombre if nombre is not None and self.ruta(nombre) else None
+
+    def ruta(self, nombre):
+        """Ruta del archivo con ese nombre, o None si el nombre no es válido o no existe."""
+        if not NOMBRE.fullmatch(nombre or ''):
+            return None
+        ruta = os.path.join(self.directorio, nombre)
+        return ruta if os.path.exists(ruta) else None
+
+    def respuesta(self, nombre, descarga=None):
+        """Respuesta HTTP del archivo, comprimida si el cliente lo acepta."""
+        partes = NOMBRE.fullmatch(nombre or '')
+        if partes is None:
+            return 'Archivo no encontrado', 404
+        resumen, extension = partes.groups()
+
+        codificacion = None
+        if extension in COMPRIMIBLES:
+            if brotli is not None and 'br' in request.accept_encodings:
+                codificacion = 'br'
+            elif 'gzip' in request.accept_encodings:
+                codificacion = 'gzip'
+        # Cada codificación es otra representación: su ETag fuerte también es otro
+        etag = resumen + {'br': '-br', 'gzip': '-gz'}.get(codificacion, '')
+
+        if request.if_none_match.contains(etag):
+            # El nombre es el hash del contenido: si el cliente ya lo tiene, no hay que leerlo
+            respuesta = Response(status=304)
+        else:
+            ruta = self.ruta(nombre)
+            if ruta is None:
+                return 'El archivo ya no está disponible, vuelva a ejecutar el método', 404
+            variante = ruta + {'br': '.br', 'gzip': '.gz'}.get(codificacion, '')
+            if not os.path.exists(variante):
+                variante, codificacion, etag = ruta, None, resumen
+            respuesta = send_file(variante, mimetype=TIPOS[extension], as_attachment=descarga is not None,
+                                  download_name=descarga or nombre, etag=False, conditional=False)
+            if codificacion:
+                respuesta.headers['Content-Encoding'] = codificacion
+        respuesta.set_etag(etag)
+        respuesta.headers['Cache-Control'] = CACHE_CONTROL
+        if extension in COMPRIMIBLES:
+            respuesta.headers['Vary'] = 'Accept-Encoding'
+        return respuesta
+
+    def estadisticas(self):
+        archivos = self._archivos()
+        return {
+            'archivos': len({os.path.basename(ruta).split('.')[0] for _, _, ruta in archivos}),
+            'bytes': sum(tamano for _, tamano, _ in archivos),
+            'max_bytes': self.max_bytes,
+            'max_edad': self.max_edad,
+            'brotli': brotli is not None,
+        }
+
+    # Recorte
+
+    def _archivos(self):
+        archivos = []
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith('.tmp'):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                info = os.stat(ruta)
+            except OSError:
+                continue
+            archivos.append((info.st_mtime, info.st_size, ruta))
+        return archivos
+
+    def _recortar(self, forzar=False):
+        # Borrar lo que no se usa hace más de max_edad y luego lo más viejo hasta quedar bajo max_bytes
+        with self._candado:
+            ahora = time.time()
+            if not forzar and ahora - self._ultimo_recorte < INTERVALO_RECORTE:
+                return
+            self._ultimo_recorte = ahora
+        total = 0
+        grupos = {}
+        for modificado, tamano, ruta in self._archivos():
+            # Un archivo y sus variantes .gz/.br se borran juntos
+            base = os.path.join(self.directorio, os.path.basename(ruta).split('.')[0])
+            grupo = grupos.setdefault(base, [0, 0, []])
+            grupo[0] = max(grupo[0], modificado)
+            grupo[1] += tamano
+            grupo[2].append(ruta)
+            total += tamano
+        for modificado, tamano, rutas in sorted(grupos.values()):
+            if ahora - modificado < self.max_edad and total <= self.max_bytes:
+                break
+            for ruta in rutas:
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+            total -= tamano
+
+
+def _escribir(ruta, contenido):
+    temporal = f'{ruta}.{threading.get_ident()}.tmp'
+    with open(temporal, 'wb') as archivo:
+        archivo.write(contenido)
+    os.replace(temporal, ruta)
+
+
+almacen = Almacen(
+    config.ARTEFACTOS_DIRECTORIO,
+    max_bytes=config.ARTEFACTOS_MAX_BYTES,
+    max_edad=config.ARTEFACTOS_EDAD,
+)
@@ -0,0 +1,396 @@
+"""Selección del motor de cálculo de los métodos numéricos.
+
+Las rutas llaman a estas funciones en lugar de usar directamente el motor de
+MATLAB. Con config.BACKEND = 'numpy' los métodos de las Secciones 1 y 2 y la
+interpolación de Lagrange y de Newton se resuelven en Python y no se inicia
+ningún proceso de MATLAB. Los sistemas con
+A dispersa, Brent e Illinois, los lotes de problemas (lote), las cuencas de
+Newton (cuencas_newton), la búsqueda de todas las raíces (todas_las_raices),
+las raíces de un polinomio (raices_polinomio), Vandermonde y los trazadores
+(spline) siempre se resuelven en Python.
+
+Cada función devuelve, además de las salidas del método, su tabla de
+iteraciones en memoria (ver app/tablas.py): ni MATLAB ni Python escriben
+archivos en app/tables para resolver una petición.
+
+Los resultados pasan por la caché de app/cache.py: una petición repetida
+devuelve la tabla guardada sin llamar al motor. Las gráficas de las Secciones
+1 y 3 se dibujan en Python (app/graficas.py); MATLAB solo genera la figura de
+los sistemas de la Sección 2.
+Los archivos de descarga (.xlsx, .csv, .parquet) solo se generan cuando se
+piden, con exportacion().
+"""
+import copy
+import functools
+import os
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from app import cache, config, motor_matlab, tablas
+from app.artefactos import almacen
+from app.motor_matlab import pool
+from app.numerico import ErrorMetodo, barrido, cuencas, interpolacion, lotes, polinomios, raices, sistemas
+
+# Nombre del motor para los mensajes de error y errores que pueden producir los métodos
+NOMBRE = 'MATLAB' if config.BACKEND == 'matlab' else 'NumPy'
+ERRORES = motor_matlab.ERRORES + (ErrorMetodo,)
+
+
+# Nombre de descarga de la tabla de cada método y clave del último resultado de cada hilo
+_EXPORTACIONES = {}
+_local = threading.local()
+
+
+def _cacheado(exportacion):
+    """Guarda en caché el resultado del método junto con sus gráficas.
+
+    exportacion es el nombre (sin extensión) del archivo que descargan las
+    rutas. Las figuras que dibuja MATLAB (solo la Sección 2) se leen con
+    _figura() y pasan al almacén de artefactos: ver imagenes_actuales(). La
+    tabla no se exporta aquí: ver exportacion().
+    """
+    def decorador(metodo):
+        _EXPORTACIONES[metodo.__name__] = exportacion
+
+        @functools.wraps(metodo)
+        def envoltura(*args):
+            llave = cache.clave(metodo.__name__, config.BACKEND, *args)
+            entrada = cache.resultados.obtener(metodo.__name__, llave)
+            if entrada is None:
+                _local.figuras = []
+                resultado = metodo(*args)
+                entrada = (resultado, _local.figuras)
+                cache.resultados.guardar(metodo.__name__, llave, entrada)
+            # Las figuras se sirven por su hash: dos peticiones no se pisan el archivo
+            _local.imagenes = [almacen.guardar(contenido, extension) if contenido else None
+                               for extension, contenido in entrada[1]]
+            _local.clave = llave
+            # Copia para que una ruta no pueda modificar el resultado guardado
+            return copy.deepcopy(entrada[0])
+        return envoltura
+    return decorador
+
+
+@contextmanager
+def _figura(extension='png'):
+    """Ruta propia de la petición para la figura que dibuja MATLAB.
+
+    Dos motores que resuelven a la vez no escriben el mismo archivo. Al salir
+    del bloque se leen los bytes para el resultado en caché y se borra el archivo.
+    """
+    ruta = os.path.join(tempfile.gettempdir(), f'figura-{uuid.uuid4().hex}.{extension}')
+    try:
+        yield ruta
+    finally:
+        contenido = None
+        try:
+            with open(ruta, 'rb') as archivo:
+                contenido = archivo.read()
+            os.remove(ruta)
+        except OSError:
+            pass
+        _local.figuras.append((extension, contenido))
+
+
+def clave_actual():
+    """Clave del último resultado calculado en este hilo, para el botón de descarga."""
+    return getattr(_local, 'clave', None)
+
+
+def imagenes_actuales():
+    """Nombres en el almacén de artefactos de las figuras del último resultado de este hilo."""
+    return getattr(_local, 'imagenes', [])
+
+
+def olvidar_clave():
+    _local.clave = None
+    _local.imagenes = []
+
+
+def exportacion(metodo, llave, formato='xlsx'):
+    """Archivo con la tabla de un resultado guardado, en formato xlsx, csv o parquet.
+
+    Se genera la primera vez que se pide y queda en el almacén de artefactos.
+    Devuelve (nombre en el almacén, nombre de descarga) o None si el resultado
+    ya no está en la caché.
+    """
+    if metodo not in _EXPORTACIONES or formato not in tablas.FORMATOS or not llave:
+        return None
+    id_exportacion = cache.clave('exportacion', llave, formato)
+    nombre = almacen.buscar(id_exportacion, formato)
+    if nombre is None:
+        entrada = cache.resultados.consultar(metodo, llave)
+        if entrada is None:
+            return None
+        nombre = almacen.guardar(tablas.exportar(entrada[0][-1], formato), formato, id_exportacion)
+    return nombre, f'{_EXPORTACIONES[metodo]}.{formato}'
+
+
+def guardado(metodo, llave):
+    """Resultado guardado en la caché con esa clave, o None si ya no está."""
+    if metodo not in _EXPORTACIONES or not llave:
+        return None
+    entrada = cache.resultados.consultar(metodo, llave)
+    return None if entrada is None else copy.deepcopy(entrada[0])
+
+
+def _vector(valor):
+    # Convertir un vector de MATLAB (matlab.double 1xN o escalar) en un arreglo 1D
+    return np.asarray(valor, dtype=float).ravel()
+
+
+def _lista(valor):
+    return _vector(valor).tolist()
+
+
+def _filas(valor):
+    # Convertir una matriz de MATLAB en una lista de filas
+    return np.atleast_2d(np.asarray(valor, dtype=float)).tolist()
+
+
+# Sección 1
+
+@_cacheado('tabla_biseccion')
+def biseccion(f, xi, xs, tol, niter, tipe):
+    if config.BACKEND == 'numpy':
+        return raices.biseccion(f, xi, xs, tol, niter, tipe)
+
+    with pool.motor() as eng:
+        r, N, xn, fm, E = eng.biseccion(f, xi, xs, tol, niter, tipe, nargout=5)
+    if len(N) != 0:
+        N, xn, fm, E = _lista(N), _lista(xn), _lista(fm), _lista(E)
+    else:
+        N, xn, fm, E = [], [], [], []
+    return r, N, xn, fm, E, tablas.tabla(Iteration=np.asarray(N, dtype=int), xn=xn, fxn=fm, E=E)
+
+
+@_cacheado('tabla_brent')
+def brent(f, xi, xs, tol, niter, tipe):
+    # Brent e Illinois no tienen archivo .m: siempre se resuelven con NumPy
+    return raices.brent(f, xi, xs, tol, niter, tipe)
+
+
+@_cacheado('tabla_illinois')
+def illinois(f, xi, xs, tol, niter, tipe):
+    return raices.illinois(f, xi, xs, tol, niter, tipe)
+
+
+@_cacheado('tabla_reglaFalsa')
+def regla_falsa(f, x0, x1, tol, niter, Terror):
+    if config.BACKEND == 'numpy':
+        return raices.regla_falsa(f, x0, x1, tol, niter, Terror)
+
+    with pool.motor() as eng:
+        respuesta, n, xm, xi, xs, fm, fi, fs, E = eng.rf(f, x0, x1, tol, niter, Terror, nargout=9)
+    tabla = tablas.tabla(n=_vector(n).astype(int), x_m=_vector(xm), x_i=_vector(xi), x_s=_vector(xs),
+                         f_m=_vector(fm), f_i=_vector(fi), f_s=_vector(fs), E=_vector(E))
+    return respuesta, tabla
+
+
+@_cacheado('tabla_secante')
+def secante(f, x0, x1, tol, niter, Terror):
+    if config.BACKEND == 'numpy':
+        return raices.secante(f, x0, x1, tol, niter, Terror)
+
+    with pool.motor() as eng:
+        respuesta, N, xn, fm, E = eng.secante(f, x0, x1, tol, niter, Terror, nargout=5)
+    N, xn, fm, E = _lista(N), _lista(xn), _lista(fm), _lista(E)
+    return respuesta, N, xn, fm, E, tablas.tabla(Iteration=np.asarray(N, dtype=int), xn=xn, fxn=fm, Error=E)
+
+
+@_cacheado('tabla_newton')
+def newton(f, x, tol, niter, et):
+    if config.BACKEND == 'numpy':
+        return raices.newton(f, x, tol, niter, et)
+
+    with pool.motor() as eng:
+        r, N, xn, fm, dfm, E, c = eng.newton(f, x, tol, niter, et, nargout=7)
+    N, xn, fm, dfm, E = _lista(N), _lista(xn), _lista(fm), _lista(dfm), _lista(E)
+    tabla = tablas.tabla(Iteration=np.asarray(N, dtype=int), xn=xn, fxn=fm, dfxn=dfm, Error=E)
+    return r, N, xn, fm, dfm, E, int(c), tabla
+
+
+@_cacheado('tabla_pf')
+def punto_fijo(f, g, x, tol, niter, tipe, aceleracion=''):
+    # pf.m no tiene aceleración: Aitken y Steffensen siempre se resuelven con NumPy
+    if config.BACKEND == 'numpy' or aceleracion:
+        return raices.punto_fijo(f, g, x, tol, niter, tipe, aceleracion or None)
+
+    with pool.motor() as eng:
+        r, N, xn, fm, E = eng.pf(f, g, x, tol, niter, tipe, nargout=5)
+    N, xn, fm, E = _lista(N), _lista(xn), _lista(fm), _lista(E)
+    return r, N, xn, fm, E, tablas.tabla(Iteration=np.asarray(N, dtype=int), xn=xn, fxn=fm, E=E)
+
+
+@_cacheado('multiple_roots_results')
+def raices_multiples(fn, xi, tol, k, et):
+    if config.BACKEND == 'numpy':
+        return raices.raices_multiples(fn, xi, tol, k, et)
+
+    with pool.motor() as eng:
+        xi, errores, resultado, xis, fxis = eng.raices_multiples(fn, xi, tol, k, et, nargout=5)
+    xis = _vector(xis)
+    tabla = tablas.tabla(**{
+        'Iteración': np.arange(1, len(xis) + 1),
+        'xi': xis,
+        'f(xi)': _vector(fxis),
+        'Error': _vector(errores),
+    })
+    return xi, _lista(errores), resultado, tabla
+
+
+@_cacheado('tabla_lote')
+def lote(metodo, funciones, a, b, p, tol, niter, tipo):
+    # Los lotes siempre se resuelven con NumPy: MATLAB resolvería un problema por llamada
+    return lotes.resolver(metodo, funciones, a, b, p, tol, niter, tipo)
+
+
+@_cacheado('tabla_cuencas')
+def cuencas_newton(f, metodo, re_min, re_max, n_re, im_min, im_max, n_im, tol, niter, et):
+    # Siempre con NumPy: la rejilla completa avanza como un solo arreglo
+    return cuencas.cuencas(f, metodo, re_min, re_max, n_re, im_min, im_max, n_im, tol, niter, et)
+
+
+@_cacheado('tabla_raices')
+def todas_las_raices(f, a, b, puntos, tol, niter, tipe, metodo):
+    # Siempre con NumPy: todos los intervalos se refinan a la vez
+    return barrido.todas_las_raices(f, a, b, puntos, tol, niter, tipe, metodo)
+
+
+@_cacheado('tabla_raices_polinomio')
+def raices_polinomio(f):
+    # Siempre con NumPy: valores propios de la matriz compañera
+    return polinomios.raices_polinomio(f)
+
+
+# Sección 2
+
+def _radio_matlab(metodo, A, w, radio, llamada, posicion=4):
+    # Pedir a MATLAB el radio espectral solo si no está guardado para (A, w)
+    llave = cache.clave('radio_matlab', metodo, A, w)
+    guardado = cache.radios.obtener(metodo, llave) if radio else None
+    salidas = list(llamada(bool(radio and guardado is None)))
+    if guardado is not None:
+        salidas[posicion] = guardado
+    elif radio:
+        cache.radios.guardar(metodo, llave, salidas[posicion])
+    return salidas
+
+
+@_cacheado('tabla_jacobi')
+def jacobi(x, A, b, tol, niter, error_type, radio=True):
+    if config.BACKEND == 'numpy' or sistemas.es_dispersa(A):
+        return sistemas.jacobi(x, A, b, tol, niter, error_type, radio)
+
+    with pool.motor() as eng, _figura() as figura:
+        r, N, xn, E, Re = _radio_matlab('jacobi', A, None, radio, lambda calcular: eng.jacobi(
+            x, A, b, tol, niter, error_type, calcular, figura, nargout=5))
+    N, E, xn = _lista(N), _lista(E), _filas(xn)
+    columnas = {'Iteration': np.asarray(N, dtype=int), 'E': E}
+    for i, valores in enumerate(zip(*xn)):
+        columnas[f'x{i + 1}'] = valores
+    return r, N, xn, E, Re, tablas.tabla(**columnas)
+
+
+@_cacheado('tabla_gaussSeidel')
+def gauss_seidel(x, A, b, et, tol, niter, radio=True):
+    if config.BACKEND == 'numpy' or sistemas.es_dispersa(A):
+        return sistemas.gauss_seidel(x, A, b, et, tol, niter, radio)
+
+    with pool.motor() as eng, _figura() as figura:
+        r, N, xn, E, re, c = _radio_matlab('gauss_seidel', A, None, radio, lambda calcular: eng.gaussSeidel(
+            x, A, b, et, tol, niter, calcular, figura, nargout=6))
+    N, E, xn = _lista(N), _lista(E), list(xn)
+    return r, N, xn, E, re, int(c), tablas.tabla(Iteration=np.asarray(N, dtype=int), xn=xn, E=E)
+
+
+@_cacheado('tabla_sor')
+def sor(x0, A, b, tol, niter, w, tipe, radio=True):
+    if config.BACKEND == 'numpy' or sistemas.es_dispersa(A):
+        return sistemas.sor(x0, A, b, tol, niter, w, tipe, radio)
+
+    with pool.motor() as eng, _figura() as figura:
+        r, n, xi, E, radio = _radio_matlab('sor', A, w, radio, lambda calcular: eng.SOR(
+            x0, A, b, tol, niter, w, tipe, calcular, figura, nargout=5))
+    # SOR.m guarda cada iteración como una columna de xi
+    n, E, xi = _lista(n), _lista(E), np.atleast_2d(np.asarray(xi, dtype=float)).T.tolist()
+    columnas = {'N': np.asarray(n, dtype=int)}
+    for i, valores in enumerate(zip(*xi)):
+        columnas[f'xi_{i + 1}'] = valores
+    columnas['E'] = E
+    return r, n, xi, E, radio, tablas.tabla(**columnas)
+
+
+@_cacheado('tabla_barrido_sor')
+def barrido_sor(x0, A, b, tol, niter, tipe, puntos=19):
+    # El barrido corre siempre en Python: abrir un motor de MATLAB por cada w costaría
+    # más que resolver el sistema
+    w, resultado, tabla = sistemas.barrido_sor(x0, A, b, tol, niter, tipe, puntos, procesos=config.PROCESOS_SOR)
+    return (w,) + resultado[:-1] + (resultado[-1], tabla)
+
+
+# Sección 3
+
+def _polinomio(coef):
+    # Misma cadena que arma vander.m: '1.0000*x^2 +2.0000*x^1 +1.0000'
+    grado = len(coef)
+    poly_str = ''
+    for i, c in enumerate(coef):
+        if c != 0:
+            term = '%.4f' % c
+            if grado - 1 - i > 0:
+                term += '*x^%d' % (grado - 1 - i)
+            poly_str += (' +' if poly_str and c > 0 else '') + term
+    return poly_str
+
+
+@_cacheado('tabla_lagrange')
+def lagrange(x, y):
+    # Los pesos baricéntricos siempre se calculan con NumPy, para evaluar el polinomio
+    if config.BACKEND == 'numpy':
+        coef, interpolante = interpolacion.lagrange(x, y)
+    else:
+        with pool.motor() as eng:
+            pol = eng.lagrange(motor_matlab.double(x), motor_matlab.double(y))
+        coef, interpolante = _vector(pol), interpolacion.baricentrica(x, y)
+    polinomio = ''.join('%f ' % c for c in coef)
+    return polinomio, coef, interpolante, tablas.tabla(Polinomio=[polinomio])
+
+
+@_cacheado('tabla_newtonInt')
+def newtonint(x, y):
+    if config.BACKEND == 'numpy':
+        Tabla, coef, interpolante = interpolacion.newtonint(x, y)
+        Tabla = Tabla.tolist()
+    else:
+        with pool.motor() as eng:
+            Tabla, pol = eng.Newtonint(motor_matlab.double(x), motor_matlab.double(y), nargout=2)
+        Tabla, coef = _filas(Tabla), _vector(pol)
+        interpolante = interpolacion.forma_newton(Tabla)
+    columnas = {'x': [fila[0] for fila in Tabla], 'y': [fila[1] for fila in Tabla]}
+    for j in range(2, len(Tabla[0])):
+        columnas[f'D{j - 1}'] = [fila[j] for fila in Tabla]
+    return _polinomio(coef), coef, Tabla, interpolante, tablas.tabla(**columnas)
+
+
+@_cacheado('pol_vandermonde')
+def vandermonde(x, y, base='potencias'):
+    # Siempre con NumPy: Björck-Pereyra resuelve en O(n^2) el sistema que vander.m
+    # arma completo y resuelve con A\y
+    coef, interpolante, condicion = interpolacion.vandermonde(x, y, base)
+    polinomio = _polinomio(coef)
+    return polinomio, coef, interpolante, condicion, tablas.tabla(
+        Polinomio=[polinomio], Base=[interpolacion.BASES[base]], Condicion=[condicion])
+
+
+@_cacheado('tabla_spline')
+def spline(x, y, d):
+    # Siempre con NumPy: los trazadores se calculan en O(n) en lugar del sistema
+    # denso de (d+1)(n-1) incógnitas de spline.m
+    Tabla, interpolante = interpolacion.spline(x, y, d)
+    columnas = {f'X{d - j}': Tabla[:, j] for j in range(d + 1)}
+    return Tabla, interpolante, tablas.tabla(**columnas)
@@ -0,0 +1,205 @@
+"""Caché de resultados de los métodos numéricos.
+
+Las entradas se identifican por un hash del nombre del método y de sus datos
+normalizados, así dos peticiones con el mismo problema comparten el resultado.
+Hay un nivel en memoria (LRU acotado) y un nivel opcional en disco que se
+recorta por tamaño. Cada método puede tener su propio tiempo de vida (TTL).
+"""
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from app import config
+from app.numerico import expresiones
+
+
+def _normalizar(valor):
+    if isinstance(valor, str):
+        # Las funciones se identifican por su árbol ('x^2-2', 'x^2 - 2' y 'x.^2-2'
+        # dan la misma clave); en las matrices solo sobran los espacios repetidos
+        arbol = expresiones.canonica(valor)
+        return ' '.join(valor.split()) if arbol is None else {'funcion': repr(arbol)}
+    if isinstance(valor, bool) or valor is None:
+        return valor
+    if isinstance(valor, (int, float)):
+        return repr(float(valor))
+    if isinstance(valor, dict):
+        return {str(k): _normalizar(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if hasattr(valor, 'tocsr'):
+        # Matrices dispersas: hash de su estructura y valores
+        m = valor.tocsr()
+        contenido = hashlib.sha256()
+        for parte in (m.indptr, m.indices, m.data):
+            contenido.update(parte.tobytes())
+        return {'dispersa': list(m.shape), 'hash': contenido.hexdigest()}
+    if hasattr(valor, 'tobytes') and getattr(valor, 'size', 0) > 64:
+        # Arreglos grandes: hash de los valores en lugar de la lista completa
+        arreglo = np.ascontiguousarray(valor, dtype=float)
+        return {'arreglo': list(arreglo.shape), 'hash': hashlib.sha256(arreglo.tobytes()).hexdigest()}
+    if hasattr(valor, 'tolist'):
+        return _normalizar(valor.tolist())
+    return repr(valor)
+
+
+def clave(metodo, *args):
+    """Hash del método y sus datos normalizados."""
+    contenido = json.dumps([metodo, _normalizar(args)], sort_keys=True)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+class CacheResultados:
+    """LRU en memoria con un nivel opcional en disco."""
+
+    def __init__(self, maximo=256, directorio=None, max_bytes=100 * 1024 * 1024, ttl=None):
+        self.maximo = maximo
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.ttl = dict(ttl or {})
+        self._memoria = OrderedDict()
+        self._aciertos = {}
+        self._fallos = {}
+        self._candado = threading.Lock()
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+    def obtener(self, metodo, llave):
+        """Devuelve el valor guardado o None si no existe o ya venció."""
+        return self._buscar(metodo, llave, True)
+
+    def consultar(self, metodo, llave):
+        """Como obtener, sin contar aciertos ni fallos (descargas de un resultado ya mostrado)."""
+        return self._buscar(metodo, llave, False)
+
+    def _buscar(self, metodo, llave, contar):
+        with self._candado:
+            entrada = self._memoria.get(llave)
+            if entrada is not None:
+                if self._vigente(metodo, entrada):
+                    self._memoria.move_to_end(llave)
+                    if contar:
+                        self._contar(self._aciertos, metodo)
+                    return entrada[1]
+                del self._memoria[llave]
+
+        entrada = self._leer_disco(llave)
+        with self._candado:
+            if entrada is not None and self._vigente(metodo, entrada):
+                self._guardar_memoria(llave, entrada)
+                if contar:
+                    self._contar(self._aciertos, metodo)
+                return entrada[1]
+            if contar:
+                self._contar(self._fallos, metodo)
+        return None
+
+    def guardar(self, metodo, llave, valor):
+        entrada = (time.time(), valor)
+        with self._candado:
+            self._guardar_memoria(llave, entrada)
+        self._escribir_disco(llave, entrada)
+
+    def estadisticas(self):
+        with self._candado:
+            metodos = set(self._aciertos) | set(self._fallos)
+            return {
+                'entradas': len(self._memoria),
+                'maximo': self.maximo,
+                'metodos': {m: {'aciertos': self._aciertos.get(m, 0), 'fallos': self._fallos.get(m, 0)}
+                            for m in sorted(metodos)},
+            }
+
+    def limpiar(self):
+        with self._candado:
+            self._memoria.clear()
+        for nombre in self._archivos_disco():
+            self._borrar(nombre)
+
+    def _vigente(self, metodo, entrada):
+        ttl = self.ttl.get(metodo)
+        return ttl is None or time.time() - entrada[0] < ttl
+
+    @staticmethod
+    def _contar(contador, metodo):
+        contador[metodo] = contador.get(metodo, 0) + 1
+
+    def _guardar_memoria(self, llave, entrada):
+        self._memoria[llave] = entrada
+        self._memoria.move_to_end(llave)
+        while len(self._memoria) > self.maximo:
+            self._memoria.popitem(last=False)
+
+    # Nivel en disco
+
+    def _ruta(self, llave):
+        return os.path.join(self.directorio, llave + '.pkl')
+
+    def _leer_disco(self, llave):
+        if not self.directorio:
+            return None
+        ruta = self._ruta(llave)
+        try:
+            with open(ruta, 'rb') as archivo:
+                entrada = pickle.load(archivo)
+            os.utime(ruta)  # Marcar como usado recientemente
+            return entrada
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _escribir_disco(self, llave, entrada):
+        if not self.directorio:
+            return
+        temporal = self._ruta(llave) + f'.{threading.get_ident()}.tmp'
+        try:
+            with open(temporal, 'wb') as archivo:
+                pickle.dump(entrada, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, self._ruta(llave))
+        except OSError:
+            return
+        self._recortar_disco()
+
+    def _archivos_disco(self):
+        if not self.directorio:
+            return []
+        return [os.path.join(self.directorio, n) for n in os.listdir(self.directorio) if n.endswith('.pkl')]
+
+    def _recortar_disco(self):
+        # Borrar las entradas usadas hace más tiempo hasta quedar bajo max_bytes
+        archivos = []
+        for ruta in self._archivos_disco():
+            try:
+                info = os.stat(ruta)
+            except OSError:
+                continue
+            archivos.append((info.st_mtime, info.st_size, ruta))
+        total = sum(tamano for _, tamano, _ in archivos)
+        for _, tamano, ruta in sorted(archivos):
+            if total <= self.max_bytes:
+                break
+            self._borrar(ruta)
+            total -= tamano
+
+    @staticmethod
+    def _borrar(ruta):
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+
+
+resultados = CacheResultados(
+    maximo=config.CACHE_ENTRADAS,
+    directorio=config.CACHE_DIRECTORIO,
+    max_bytes=config.CACHE_MAX_BYTES,
+    ttl=config.CACHE_TTL,
+)
+
+# Radios espectrales de las matrices de iteración de la Sección 2, por (A, w)
+radios = CacheResultados(maximo=128)
@@ -0,0 +1,52 @@
+import os
+
+# Motor de cálculo de los métodos numéricos: 'matlab' (archivos .m) o 'numpy'
+# (implementación en Python). Se elige por despliegue con la variable de entorno
+# ANALISIS_BACKEND, por ejemplo: ANALISIS_BACKEND=numpy flask --app app.app run
+BACKEND = os.environ.get('ANALISIS_BACKEND', 'matlab').strip().lower()
+
+if BACKEND not in ('matlab', 'numpy'):
+    raise ValueError(f"ANALISIS_BACKEND debe ser 'matlab' o 'numpy', no '{BACKEND}'")
+
+# Número máximo de motores de MATLAB que pueden estar abiertos a la vez y
+# segundos que espera una petición por un motor libre antes de fallar
+MOTORES = int(os.environ.get('ANALISIS_MOTORES', '2'))
+ESPERA_MOTOR = float(os.environ.get('ANALISIS_ESPERA_MOTOR', '120'))
+
+# Caché de resultados: entradas en memoria, carpeta opcional para el nivel en
+# disco (vacía = desactivado), tamaño máximo de esa carpeta en MB y tiempo de
+# vida por método en segundos, por ejemplo ANALISIS_CACHE_TTL="sor=600,newton=3600"
+CACHE_ENTRADAS = int(os.environ.get('ANALISIS_CACHE_ENTRADAS', '256'))
+CACHE_DIRECTORIO = os.environ.get('ANALISIS_CACHE_DIR') or None
+CACHE_MAX_BYTES = int(float(os.environ.get('ANALISIS_CACHE_MB', '100')) * 1024 * 1024)
+CACHE_TTL = {
+    metodo.strip(): float(segundos)
+    for metodo, segundos in (
+        par.split('=') for par in os.environ.get('ANALISIS_CACHE_TTL', '').split(',') if par.strip()
+    )
+}
+
+# Procesos para el barrido del factor de relajación de SOR (vacío = núcleos de la máquina)
+PROCESOS_SOR = int(os.environ.get('ANALISIS_PROCESOS_SOR') or os.cpu_count() or 1)
+
+# Cola de trabajos en segundo plano (/trabajos): hilos que resuelven, trabajos
+# pendientes que acepta la cola y segundos que puede durar cada trabajo
+TRABAJADORES = int(os.environ.get('ANALISIS_TRABAJADORES', '2'))
+if BACKEND == 'matlab':
+    # Cada trabajador abre su propio motor, descontado de MOTORES: al menos uno
+    # queda siempre para las páginas
+    TRABAJADORES = max(0, min(TRABAJADORES, MOTORES - 1))
+COLA_MAXIMA = int(os.environ.get('ANALISIS_COLA_MAXIMA', '100'))
+TIEMPO_TRABAJO = float(os.environ.get('ANALISIS_TIEMPO_TRABAJO', '300'))
+
+# Almacén de gráficas y archivos de descarga (app/artefactos.py): carpeta,
+# tamaño máximo en MB y días sin usarse antes de borrar un archivo
+ARTEFACTOS_DIRECTORIO = os.environ.get('ANALISIS_ARTEFACTOS_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'artefactos')
+ARTEFACTOS_MAX_BYTES = int(float(os.environ.get('ANALISIS_ARTEFACTOS_MB', '200')) * 1024 * 1024)
+ARTEFACTOS_EDAD = float(os.environ.get('ANALISIS_ARTEFACTOS_DIAS', '7')) * 24 * 3600
+
+# Sesiones de interpolación incremental (/api/v1/newtonint/sesion): sesiones
+# abiertas a la vez y minutos sin usarse antes de cerrar una
+SESIONES_MAXIMAS = int(os.environ.get('ANALISIS_SESIONES_MAXIMAS', '1000'))
+SESION_EDAD = float(os.environ.get('ANALISIS_SESION_MINUTOS', '60')) * 60
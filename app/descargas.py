@@ -0,0 +1,36 @@
+"""Respuesta de las rutas /…/descargar y /…/descargar_grafica.
+
+El formulario de descarga envía la clave del resultado (ver
+backend.clave_actual) y el formato elegido; el archivo se genera la primera
+vez a partir del resultado guardado en la caché. Las rutas de gráficas reciben
+el nombre de la gráfica generada (ver app/graficas.py).
+
+Ambas redirigen (303) a /artefactos/<nombre>, que es un GET con ETag y
+Cache-Control: una descarga repetida la resuelve el navegador o un 304.
+"""
+from flask import redirect, request, url_for
+
+from app import backend
+from app.artefactos import almacen
+
+
+def _redirigir(nombre, descarga):
+    return redirect(url_for('artefacto', nombre=nombre, descarga=descarga), code=303)
+
+
+def respuesta(metodo):
+    formato = request.form.get('formato', 'xlsx')
+    try:
+        archivo = backend.exportacion(metodo, request.form.get('clave'), formato)
+    except ValueError as e:
+        return str(e), 400
+    if archivo is None:
+        return "El resultado ya no está disponible, vuelva a ejecutar el método para descargarlo", 404
+    return _redirigir(*archivo)
+
+
+def grafica():
+    nombre = request.form.get('grafica', '')
+    if not nombre.endswith('.svg') or almacen.ruta(nombre) is None:
+        return "Gráfica SVG no encontrada", 404
+    return _redirigir(nombre, 'grafica.svg')
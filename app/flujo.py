@@ -0,0 +1,89 @@
+"""Transmisión de las iteraciones con Server-Sent Events.
+
+Las rutas /<método>/flujo reciben los mismos datos que el formulario por la
+query string (EventSource solo hace GET) y envían:
+
+    event: inicio      {'id': identificador del flujo}
+    event: iteracion   una fila de la tabla por cada iteración
+    event: fin         {'iteraciones': N, 'converge': true/false}
+    event: cancelado   si el cliente pidió detener el método
+    event: error       {'mensaje': ...} si el método falla
+
+El método corre como generador: cerrar la conexión o hacer POST a
+/flujo/<id>/cancelar lo detiene antes de la siguiente iteración y deja libre
+el hilo del servidor.
+"""
+import json
+import math
+import threading
+import uuid
+
+from flask import Response, stream_with_context
+
+from app.numerico import ErrorMetodo
+
+# Flujos en curso: id -> evento de cancelación
+_activos = {}
+_candado = threading.Lock()
+
+
+def _limpiar(valor):
+    # JSON no admite NaN ni Inf: se envían como texto, igual que en las tablas
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return str(valor)
+    if isinstance(valor, list):
+        return [_limpiar(v) for v in valor]
+    if isinstance(valor, dict):
+        return {k: _limpiar(v) for k, v in valor.items()}
+    return valor
+
+
+def _evento(tipo, datos):
+    return f'event: {tipo}\ndata: {json.dumps(_limpiar(datos))}\n\n'
+
+
+def respuesta(filas, Tol):
+    """Respuesta text/event-stream con las filas que produce el generador `filas`."""
+    # El id lo genera siempre el servidor: uno elegido por el cliente podría pisar
+    # el evento de cancelación de otro flujo o permitir cancelarlo
+    id_flujo = uuid.uuid4().hex
+    cancelado = threading.Event()
+    with _candado:
+        _activos[id_flujo] = cancelado
+
+    def eventos():
+        try:
+            yield _evento('inicio', {'id': id_flujo})
+            ultima = None
+            for fila in filas:
+                ultima = fila
+                yield _evento('iteracion', fila)
+                if cancelado.is_set():
+                    yield _evento('cancelado', {'iteraciones': fila['N']})
+                    return
+            yield _evento('fin', {
+                'iteraciones': ultima['N'] if ultima else 0,
+                'converge': ultima is not None and ultima['E'] < Tol,
+            })
+        except ErrorMetodo as error:
+            yield _evento('error', {'mensaje': str(error)})
+        except Exception:
+            yield _evento('error', {'mensaje': 'Error de sintaxis, para más información ir al apartado de ayuda.'})
+        finally:
+            # También se ejecuta si el cliente cierra la conexión
+            filas.close()
+            with _candado:
+                _activos.pop(id_flujo, None)
+
+    return Response(stream_with_context(eventos()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def cancelar(id_flujo):
+    """Pide detener un flujo en curso. Devuelve False si ya terminó o no existe."""
+    with _candado:
+        cancelado = _activos.get(id_flujo)
+    if cancelado is None:
+        return False
+    cancelado.set()
+    return True
@@ -0,0 +1,347 @@
+"""Gráficas de los métodos generadas en Python.
+
+Reemplazan las figuras ocultas que abrían los archivos .m. Las funciones se
+muestrean de forma vectorizada y adaptativa (más puntos donde la curva se
+dobla), las trazas largas de iteraciones se reducen con LTTB y el resultado se
+escribe directamente como un SVG compacto, junto con un .json con los mismos
+puntos para dibujarlos en el navegador. Los mapas (las cuencas de Newton) van
+dentro del SVG como una imagen PNG de fondo.
+
+El SVG y el JSON se guardan en el almacén de artefactos (app/artefactos.py)
+registrados con un hash de los datos de la gráfica: mientras sigan ahí, la
+misma gráfica no se vuelve a muestrear.
+"""
+import base64
+import html
+import json
+import struct
+import zlib
+
+import numpy as np
+
+from app import cache
+from app.artefactos import almacen
+from app.numerico import ErrorMetodo
+from app.numerico.expresiones import compilar
+
+ANCHO, ALTO = 640, 400
+MARGEN_IZQ, MARGEN_DER, MARGEN_SUP, MARGEN_INF = 60, 20, 36, 40
+# Puntos máximos por traza de iteraciones después de LTTB
+MAX_PUNTOS = 500
+# Tramos de un spline que se muestrean uno por uno y puntos de la curva cuando hay más
+MAX_TRAMOS, MAX_PUNTOS_TRAMOS = 200, 4000
+
+COLORES = {'curva': '#1f5fbf', 'puntos': '#d62728', 'final': '#2ca02c', 'datos': '#d62728'}
+# Colores de las cuencas, uno por raíz (se repiten si hay más raíces)
+PALETA = np.array([
+    (31, 119, 180), (255, 127, 14), (44, 160, 44), (214, 39, 40), (148, 103, 189),
+    (140, 86, 75), (227, 119, 194), (188, 189, 34), (23, 190, 207), (127, 127, 127),
+], dtype=float)
+
+
+# Muestreo y reducción de puntos
+
+@np.errstate(all='ignore')
+def muestrear(f, a, b, inicial=65, maximo=3000, tol=1e-3):
+    """Puntos (x, f(x)) en [a, b], refinando los tramos donde la recta entre dos
+    puntos se aleja de f en el punto medio más de tol veces la altura de la curva.
+    """
+    x = np.linspace(a, b, inicial)
+    y = np.asarray(f(x), dtype=float)
+    for _ in range(20):
+        finitos = y[np.isfinite(y)]
+        alto = np.ptp(np.percentile(finitos, [2, 98])) if finitos.size else 1.0
+        alto = alto or 1.0
+
+        xm = (x[:-1] + x[1:]) / 2
+        ym = np.asarray(f(xm), dtype=float)
+        error = np.abs(ym - (y[:-1] + y[1:]) / 2) / alto
+        # También se refinan los bordes del dominio (donde f pasa a ser NaN o Inf)
+        borde = (np.isfinite(ym) != np.isfinite(y[:-1])) | (np.isfinite(ym) != np.isfinite(y[1:]))
+        refinar = np.nonzero((error > tol) | borde)[0]
+        presupuesto = maximo - len(x)
+        if not refinar.size or presupuesto <= 0:
+            break
+        if refinar.size > presupuesto:
+            # Solo los tramos con mayor error
+            prioridad = np.where(borde[refinar], np.inf, np.nan_to_num(error[refinar], nan=np.inf))
+            refinar = np.sort(refinar[np.argsort(-prioridad)[:presupuesto]])
+        x = np.insert(x, refinar + 1, xm[refinar])
+        y = np.insert(y, refinar + 1, ym[refinar])
+    return x, y
+
+
+def lttb(x, y, n):
+    """Largest-Triangle-Three-Buckets: reduce la traza a n puntos conservando su forma.
+
+    Los puntos se agrupan por su orden (el número de iteración), así también
+    sirve para trazas donde x no es creciente.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if len(x) <= n or n < 3:
+        return x, y
+    limites = np.linspace(1, len(x) - 1, n - 1).astype(int)
+    elegidos = [0]
+    for k in range(n - 2):
+        inicio, fin = limites[k], limites[k + 1]
+        siguiente = slice(fin, limites[k + 2] if k + 2 < len(limites) else len(x))
+        cx, cy = x[siguiente].mean(), y[siguiente].mean()
+        ax, ay = x[elegidos[-1]], y[elegidos[-1]]
+        area = np.abs((ax - cx) * (y[inicio:fin] - ay) - (ax - x[inicio:fin]) * (cy - ay))
+        elegidos.append(inicio + int(np.nanargmax(area)) if np.isfinite(area).any() else inicio)
+    elegidos.append(len(x) - 1)
+    return x[elegidos], y[elegidos]
+
+
+# Escritura del SVG
+
+def _limites(valores, robusto=False):
+    valores = np.asarray(valores, dtype=float)
+    valores = valores[np.isfinite(valores)]
+    if not valores.size:
+        return -1.0, 1.0
+    minimo, maximo = np.percentile(valores, [1, 99]) if robusto else (valores.min(), valores.max())
+    if minimo == maximo:
+        minimo, maximo = minimo - 1, maximo + 1
+    holgura = (maximo - minimo) * 0.05
+    return float(minimo - holgura), float(maximo + holgura)
+
+
+def _marcas(minimo, maximo, cantidad=6):
+    # Marcas "redondas" (1, 2 o 5 por una potencia de 10) dentro de [minimo, maximo]
+    paso = (maximo - minimo) / cantidad
+    base = 10 ** np.floor(np.log10(paso))
+    paso = min((m * base for m in (1, 2, 5, 10) if m * base >= paso), default=10 * base)
+    marcas = np.arange(np.ceil(minimo / paso) * paso, maximo + paso / 2, paso)
+    return marcas[(marcas >= minimo) & (marcas <= maximo)]
+
+
+def _numero(v):
+    return '%g' % (0 if abs(v) < 1e-12 else v)
+
+
+def _png(rgb):
+    # PNG RGB de 8 bits sin compresión con pérdida: filtro 0 por fila y zlib
+    alto, ancho, _ = rgb.shape
+    filas = np.hstack([np.zeros((alto, 1), dtype=np.uint8), rgb.reshape(alto, -1)])
+    bloque = lambda tipo, datos: (struct.pack('>I', len(datos)) + tipo + datos
+                                  + struct.pack('>I', zlib.crc32(tipo + datos)))
+    return (b'\x89PNG\r\n\x1a\n' + bloque(b'IHDR', struct.pack('>IIBBBBB', ancho, alto, 8, 2, 0, 0, 0))
+            + bloque(b'IDAT', zlib.compress(filas.tobytes(), 9)) + bloque(b'IEND', b''))
+
+
+def _svg(series, titulo, etiqueta_x, etiqueta_y, fondo=None):
+    # fondo: {'png': bytes, 'x': (x0, x1), 'y': (y0, y1) o None para toda la altura}
+    x0, x1 = _limites(np.concatenate([s['x'] for s in series]))
+    curvas = [s['y'] for s in series if s['tipo'] == 'linea']
+    puntos = [s['y'] for s in series if s['tipo'] != 'linea']
+    y0, y1 = _limites(np.concatenate(curvas), robusto=True) if curvas else (np.inf, -np.inf)
+    if puntos:
+        p0, p1 = _limites(np.concatenate(puntos))
+        y0, y1 = min(y0, p0), max(y1, p1)
+    if fondo is not None:
+        x0, x1 = fondo['x']
+        y0, y1 = fondo['y'] or (y0, y1)
+
+    ancho, alto = ANCHO - MARGEN_IZQ - MARGEN_DER, ALTO - MARGEN_SUP - MARGEN_INF
+    px = lambda v: MARGEN_IZQ + (v - x0) / (x1 - x0) * ancho
+    py = lambda v: MARGEN_SUP + (y1 - v) / (y1 - y0) * alto
+
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {ANCHO} {ALTO}" '
+        f'font-family="sans-serif" font-size="11">',
+        f'<clipPath id="c"><rect x="{MARGEN_IZQ}" y="{MARGEN_SUP}" width="{ancho}" height="{alto}"/></clipPath>',
+        f'<rect width="{ANCHO}" height="{ALTO}" fill="#fff"/>',
+    ]
+    if fondo is not None:
+        partes.append(f'<image x="{MARGEN_IZQ}" y="{MARGEN_SUP}" width="{ancho}" height="{alto}" '
+                      f'preserveAspectRatio="none" style="image-rendering:pixelated" '
+                      f'href="data:image/png;base64,{base64.b64encode(fondo["png"]).decode("ascii")}"/>')
+    for v in _marcas(x0, x1):
+        partes.append(f'<line x1="{px(v):.1f}" y1="{MARGEN_SUP}" x2="{px(v):.1f}" y2="{MARGEN_SUP + alto}" stroke="#e5e5e5"/>'
+                      f'<text x="{px(v):.1f}" y="{MARGEN_SUP + alto + 14}" text-anchor="middle">{_numero(v)}</text>')
+    for v in _marcas(y0, y1):
+        partes.append(f'<line x1="{MARGEN_IZQ}" y1="{py(v):.1f}" x2="{MARGEN_IZQ + ancho}" y2="{py(v):.1f}" stroke="#e5e5e5"/>'
+                      f'<text x="{MARGEN_IZQ - 4}" y="{py(v) + 4:.1f}" text-anchor="end">{_numero(v)}</text>')
+    if y0 < 0 < y1:
+        partes.append(f'<line x1="{MARGEN_IZQ}" y1="{py(0):.1f}" x2="{MARGEN_IZQ + ancho}" y2="{py(0):.1f}" '
+                      f'stroke="#000" stroke-dasharray="4 3"/>')
+    partes.append(f'<rect x="{MARGEN_IZQ}" y="{MARGEN_SUP}" width="{ancho}" height="{alto}" fill="none" stroke="#000"/>')
+
+    partes.append('<g clip-path="url(#c)">')
+    for s in series:
+        x, y = np.asarray(s['x'], dtype=float), np.asarray(s['y'], dtype=float)
+        if s['tipo'] == 'linea':
+            # Un subtrayecto por cada tramo finito; los valores fuera del área se recortan
+            y = np.clip(y, y0 - 10 * (y1 - y0), y1 + 10 * (y1 - y0))
+            trazo, nuevo = [], True
+            for a, b in zip(x, y):
+                if not np.isfinite(b):
+                    nuevo = True
+                    continue
+                trazo.append(f'{"M" if nuevo else "L"}{px(a):.1f} {py(b):.1f}')
+                nuevo = False
+            partes.append(f'<path d="{"".join(trazo)}" fill="none" stroke="{s["color"]}" stroke-width="1.5"/>')
+        else:
+            partes.extend(f'<circle cx="{px(a):.1f}" cy="{py(b):.1f}" r="3" fill="{s["color"]}"/>'
+                          for a, b in zip(x, y) if np.isfinite(a) and np.isfinite(b))
+    partes.append('</g>')
+
+    for i, s in enumerate(series):
+        y = MARGEN_SUP + 14 + 14 * i
+        x = MARGEN_IZQ + ancho - 8
+        partes.append(f'<text x="{x - 14}" y="{y + 4}" text-anchor="end">{html.escape(s["nombre"])}</text>')
+        if s['tipo'] == 'linea':
+            partes.append(f'<line x1="{x - 10}" y1="{y}" x2="{x}" y2="{y}" stroke="{s["color"]}" stroke-width="2"/>')
+        else:
+            partes.append(f'<circle cx="{x - 5}" cy="{y}" r="3" fill="{s["color"]}"/>')
+
+    partes.append(f'<text x="{ANCHO / 2}" y="22" text-anchor="middle" font-size="14">{html.escape(titulo)}</text>')
+    partes.append(f'<text x="{MARGEN_IZQ + ancho / 2}" y="{ALTO - 6}" text-anchor="middle">{html.escape(etiqueta_x)}</text>')
+    partes.append(f'<text x="14" y="{MARGEN_SUP + alto / 2}" text-anchor="middle" '
+                  f'transform="rotate(-90 14 {MARGEN_SUP + alto / 2})">{html.escape(etiqueta_y)}</text>')
+    partes.append('</svg>')
+    return '\n'.join(partes)
+
+
+def _json(series, titulo, etiqueta_x, etiqueta_y):
+    limpiar = lambda valores: [float(v) if np.isfinite(v) else None for v in np.asarray(valores, dtype=float)]
+    return json.dumps({
+        'titulo': titulo, 'x': etiqueta_x, 'y': etiqueta_y,
+        'series': [{'nombre': s['nombre'], 'tipo': s['tipo'], 'x': limpiar(s['x']), 'y': limpiar(s['y'])}
+                   for s in series],
+    }, separators=(',', ':'))
+
+
+def _grafica(datos, construir, titulo, etiqueta_x='x', etiqueta_y='y', fondo=None):
+    # Devuelve el nombre del SVG en el almacén de artefactos o None si no se puede dibujar
+    clave = cache.clave('grafica', titulo, *datos)
+    nombre = almacen.buscar(clave, 'svg')
+    if nombre is None:
+        try:
+            series = construir()
+            imagen = fondo() if fondo is not None else None
+        except (ErrorMetodo, ValueError, TypeError, FloatingPointError):
+            return None
+        nombre = almacen.guardar(_svg(series, titulo, etiqueta_x, etiqueta_y, imagen).encode('utf-8'), 'svg', clave)
+        almacen.guardar(_json(series, titulo, etiqueta_x, etiqueta_y).encode('utf-8'), 'json', nombre)
+    return nombre
+
+
+def puntos(nombre):
+    """Nombre del .json con los puntos de la gráfica nombre, para dibujarla en el navegador."""
+    return almacen.buscar(nombre, 'json')
+
+
+def _rango(valores, minimo=1.0):
+    valores = np.asarray(valores, dtype=float)
+    valores = valores[np.isfinite(valores)]
+    if not valores.size:
+        return -minimo, minimo
+    holgura = max(minimo, 0.1 * np.ptp(valores))
+    return valores.min() - holgura, valores.max() + holgura
+
+
+# Gráficas de cada sección
+
+def funcion(f_str, xn):
+    """f(x) alrededor de las iteraciones xn, con los puntos (xn, f(xn)) y la última marcada."""
+    def construir():
+        f = compilar(f_str)
+        x, y = muestrear(f, *_rango(xn))
+        with np.errstate(all='ignore'):
+            px = np.asarray(xn, dtype=float)
+            py = np.asarray(f(px), dtype=float)
+        px, py = lttb(px, py, MAX_PUNTOS)
+        return [
+            {'nombre': 'Función', 'tipo': 'linea', 'x': x, 'y': y, 'color': COLORES['curva']},
+            {'nombre': 'Iteraciones', 'tipo': 'puntos', 'x': px, 'y': py, 'color': COLORES['puntos']},
+            {'nombre': 'Última aproximación', 'tipo': 'puntos', 'x': px[-1:], 'y': py[-1:], 'color': COLORES['final']},
+        ]
+    return _grafica((f_str, np.asarray(xn, dtype=float)), construir, f'f(x) = {f_str}', 'x', 'f(x)')
+
+
+def raices(f_str, a, b, encontradas):
+    """f(x) en [a, b] con las raíces encontradas marcadas."""
+    def construir():
+        x, y = muestrear(compilar(f_str), a, b)
+        return [
+            {'nombre': 'Función', 'tipo': 'linea', 'x': x, 'y': y, 'color': COLORES['curva']},
+            {'nombre': 'Raíces', 'tipo': 'puntos', 'x': np.asarray(encontradas, dtype=float),
+             'y': np.zeros(len(encontradas)), 'color': COLORES['final']},
+        ]
+    return _grafica((f_str, a, b, np.asarray(encontradas, dtype=float)), construir, f'f(x) = {f_str}', 'x', 'f(x)')
+
+
+def polinomio(coef, x, y, titulo):
+    """Polinomio de interpolación (coeficientes de mayor a menor grado) y los datos."""
+    def construir():
+        p = np.asarray(coef, dtype=float)
+        a, b = _limites(x)
+        cx, cy = muestrear(lambda t: np.polyval(p, t), a, b)
+        return [
+            {'nombre': titulo, 'tipo': 'linea', 'x': cx, 'y': cy, 'color': COLORES['curva']},
+            {'nombre': 'Datos', 'tipo': 'puntos', 'x': x, 'y': y, 'color': COLORES['datos']},
+        ]
+    return _grafica((np.asarray(coef, dtype=float), np.asarray(x, dtype=float), np.asarray(y, dtype=float)),
+                    construir, titulo)
+
+
+def tramos(coeficientes, x, y, titulo):
+    """Spline: un polinomio por tramo [x(i), x(i+1)], con coeficientes de mayor a menor grado."""
+    def construir():
+        p = np.asarray(coeficientes, dtype=float)
+        if len(p) > MAX_TRAMOS:
+            # Muchos tramos: una rejilla fija, cada punto evaluado en su tramo
+            cx = np.linspace(x[0], x[-1], MAX_PUNTOS_TRAMOS)
+            i = np.clip(np.searchsorted(x, cx, side='right') - 1, 0, len(p) - 1)
+            cy = p[i, 0].copy()
+            for k in range(1, p.shape[1]):
+                cy = cy * cx + p[i, k]
+            dx, dy = lttb(x, y, MAX_PUNTOS)
+        else:
+            cx, cy = [], []
+            for (a, b), q in zip(zip(x[:-1], x[1:]), p):
+                tx, ty = muestrear(lambda t: np.polyval(q, t), a, b, inicial=17, maximo=400)
+                cx.append(tx)
+                cy.append(ty)
+            cx, cy, dx, dy = np.concatenate(cx), np.concatenate(cy), x, y
+        return [
+            {'nombre': titulo, 'tipo': 'linea', 'x': cx, 'y': cy, 'color': COLORES['curva']},
+            {'nombre': 'Datos', 'tipo': 'puntos', 'x': dx, 'y': dy, 'color': COLORES['datos']},
+        ]
+    return _grafica((np.asarray(coeficientes, dtype=float), np.asarray(x, dtype=float), np.asarray(y, dtype=float)),
+                    construir, titulo)
+
+
+def cuencas(f_str, limites, indice, iteraciones, raices):
+    """Mapa de cuencas: cada punto inicial con el color de la raíz a la que llegó
+    (más oscuro cuantas más iteraciones tomó, negro si no convergió).
+
+    limites es (re_min, re_max, im_min, im_max) y raices la lista [re, im]. Con
+    una rejilla real (una fila) se dibuja f(x) sobre una franja con las cuencas.
+    """
+    indice, iteraciones = np.atleast_2d(indice), np.atleast_2d(iteraciones)
+    raices = np.asarray(raices, dtype=float).reshape(-1, 2)
+    re_min, re_max, im_min, im_max = limites
+    real = indice.shape[0] == 1
+
+    def fondo():
+        maximo = max(int(iteraciones.max()), 1)
+        brillo = 1 - 0.6 * np.log1p(iteraciones) / np.log1p(maximo)
+        rgb = PALETA[np.maximum(indice, 0) % len(PALETA)] * brillo[..., np.newaxis]
+        rgb[indice < 0] = 0
+        # La primera fila de la imagen es la de mayor parte imaginaria
+        return {'png': _png(np.flipud(rgb).round().astype(np.uint8)), 'x': (re_min, re_max),
+                'y': None if real else (im_min, im_max)}
+
+    def construir():
+        marcas = {'nombre': 'Raíces', 'tipo': 'puntos', 'x': raices[:, 0],
+                  'y': np.zeros(len(raices)) if real else raices[:, 1], 'color': '#000'}
+        if not real:
+            return [marcas]
+        x, y = muestrear(compilar(f_str), re_min, re_max)
+        return [{'nombre': 'Función', 'tipo': 'linea', 'x': x, 'y': y, 'color': '#fff'}, marcas]
+
+    return _grafica((f_str, limites, indice, iteraciones), construir, f'Cuencas de f(x) = {f_str}',
+                    'x' if real else 'Re(x)', 'f(x)' if real else 'Im(x)', fondo)
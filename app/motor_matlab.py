@@ -0,0 +1,267 @@
+"""Pool de motores de MATLAB compartido por todas las secciones.
+
+Los motores se inician solo cuando una petición los necesita, hasta un máximo
+de config.MOTORES procesos. Cada hilo de Flask toma un motor libre, lo usa y lo
+devuelve:
+
+    with motor_matlab.pool.motor() as eng:
+        r = eng.biseccion(f, xi, xs, tol, niter, tipe, nargout=5)
+
+Si un motor deja de responder (por ejemplo porque el proceso de MATLAB se
+cerró) se descarta y la siguiente petición inicia uno nuevo.
+"""
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from app import config
+
+try:
+    import matlab.engine
+    ErrorMatlab = matlab.engine.MatlabExecutionError
+    ErrorMotor = matlab.engine.EngineError
+except ImportError:
+    matlab = None
+
+    class ErrorMatlab(Exception):
+        """Sustituto de MatlabExecutionError cuando MATLAB no está instalado."""
+
+    class ErrorMotor(Exception):
+        """Sustituto de EngineError cuando MATLAB no está instalado."""
+
+# Errores que se muestran al usuario como "Error en MATLAB"
+ERRORES = (ErrorMatlab, ErrorMotor)
+
+dir_actual = os.path.dirname(os.path.abspath(__file__))
+dir_matlab = os.path.join(os.path.dirname(dir_actual), 'matlab')
+
+
+def double(valores):
+    """Equivalente a matlab.double que también funciona con el motor falso."""
+    if matlab is None:
+        return valores
+    return matlab.double(valores)
+
+
+def iniciar_matlab():
+    """Inicia un proceso de MATLAB con la carpeta matlab/ en el path."""
+    if matlab is None:
+        raise ErrorMotor('El paquete matlab.engine no está instalado')
+    eng = matlab.engine.start_matlab()
+    eng.addpath(dir_matlab, nargout=0)
+    return eng
+
+
+class PoolMotores:
+    """Conjunto acotado de motores de MATLAB que se inician bajo demanda."""
+
+    def __init__(self, maximo, iniciar=iniciar_matlab, espera=None):
+        self.maximo = maximo
+        self.espera = espera
+        self._iniciar = iniciar
+        self._libres = []
+        self._creados = 0
+        self._condicion = threading.Condition()
+
+    @contextmanager
+    def motor(self):
+        """Presta un motor al hilo actual durante el bloque with."""
+        eng = self._tomar()
+        try:
+            yield eng
+        except ErrorMatlab:
+            # Error en el código del usuario: el motor sigue funcionando
+            self._devolver(eng)
+            raise
+        except BaseException:
+            if self._sano(eng):
+                self._devolver(eng)
+            else:
+                self._descartar(eng)
+            raise
+        else:
+            self._devolver(eng)
+
+    def estado(self):
+        with self._condicion:
+            return {'maximo': self.maximo, 'creados': self._creados, 'libres': len(self._libres)}
+
+    def cerrar(self):
+        """Cierra los motores libres. Los motores prestados se cierran al devolverse."""
+        with self._condicion:
+            libres, self._libres = self._libres, []
+            self._creados -= len(libres)
+            self.maximo = 0
+        for eng in libres:
+            self._salir(eng)
+
+    def _tomar(self):
+        # La espera total no pasa de self.espera aunque otro hilo gane el motor
+        # liberado: cada wait usa solo el tiempo que queda
+        limite = None if self.espera is None else time.monotonic() + self.espera
+        with self._condicion:
+            while not self._libres and self._creados >= self.maximo:
+                if self.maximo == 0:
+                    raise ErrorMotor('El pool de motores está cerrado')
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0 or not self._condicion.wait(restante):
+                    raise ErrorMotor('No hay motores de MATLAB disponibles')
+            if self._libres:
+                eng = self._libres.pop()
+            else:
+                eng = None
+                self._creados += 1
+
+        if eng is not None:
+            if self._sano(eng):
+                return eng
+            self._salir(eng)
+
+        # Iniciar un motor nuevo fuera del candado, ya tiene su cupo reservado
+        try:
+            return self._iniciar()
+        except BaseException:
+            with self._condicion:
+                self._creados -= 1
+                self._condicion.notify()
+            raise
+
+    def _devolver(self, eng):
+        with self._condicion:
+            if self._creados <= self.maximo:
+                self._libres.append(eng)
+                self._condicion.notify()
+                return
+        self._descartar(eng)
+
+    def _descartar(self, eng):
+        self._salir(eng)
+        with self._condicion:
+            self._creados -= 1
+            self._condicion.notify()
+
+    @staticmethod
+    def _sano(eng):
+        try:
+            eng.eval('1;', nargout=0)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _salir(eng):
+        try:
+            eng.quit()
+        except Exception:
+            pass
+
+
+def _fila(valores):
+    # Vector fila 1xN como lo devuelve matlab.engine
+    return [list(valores)]
+
+
+def _metodos_falsos():
+    from app.numerico import interpolacion, raices, sistemas
+
+    def biseccion(*args):
+        r, N, xn, fm, E, tabla = raices.biseccion(*args)
+        return r, _fila(N), _fila(xn), _fila(fm), _fila(E)
+
+    def rf(*args):
+        respuesta, tabla = raices.regla_falsa(*args)
+        return (respuesta,) + tuple(_fila(tabla[c]) for c in ('n', 'x_m', 'x_i', 'x_s', 'f_m', 'f_i', 'f_s', 'E'))
+
+    def secante(*args):
+        respuesta, N, xn, fm, E, tabla = raices.secante(*args)
+        return respuesta, _fila(N), _fila(xn), _fila(fm), _fila(E)
+
+    def newton(*args):
+        r, N, xn, fm, dfm, E, c, tabla = raices.newton(*args)
+        return r, _fila(N), _fila(xn), _fila(fm), _fila(dfm), _fila(E), float(c)
+
+    def pf(*args):
+        r, N, xn, fm, E, tabla = raices.punto_fijo(*args)
+        return r, _fila(N), _fila(xn), _fila(fm), _fila(E)
+
+    def raices_multiples(*args):
+        xi, errores, resultado, tabla = raices.raices_multiples(*args)
+        return xi, _fila(errores), resultado, _fila(tabla['xi']), _fila(tabla['f(xi)'])
+
+    # Las figuras de la Sección 2 no se dibujan: ruta_grafica se ignora
+    def jacobi(x0, A, b, tol, niter, et, radio, ruta_grafica=None):
+        r, N, xn, E, Re, tabla = sistemas.jacobi(x0, A, b, tol, niter, et, radio)
+        return r, _fila(N), xn, _fila(E), Re
+
+    def gauss_seidel(x0, A, b, et, tol, niter, radio, ruta_grafica=None):
+        r, N, xn, E, re, c, tabla = sistemas.gauss_seidel(x0, A, b, et, tol, niter, radio)
+        return r, _fila(N), xn, _fila(E), re, float(c)
+
+    def sor(x0, A, b, tol, niter, w, tipe, radio, ruta_grafica=None):
+        r, n, xi, E, radio, tabla = sistemas.sor(x0, A, b, tol, niter, w, tipe, radio)
+        # SOR.m devuelve cada iteración como una columna
+        return r, _fila(n), [list(columna) for columna in zip(*xi)], _fila(E), radio
+
+    def lagrange(x, y):
+        return _fila(interpolacion.lagrange(x, y)[0])
+
+    def newtonint(x, y):
+        Tabla, coef, _ = interpolacion.newtonint(x, y)
+        return Tabla.tolist(), _fila(coef)
+
+    return {'biseccion': biseccion, 'rf': rf, 'secante': secante, 'newton': newton,
+            'pf': pf, 'raices_multiples': raices_multiples, 'jacobi': jacobi,
+            'gaussSeidel': gauss_seidel, 'SOR': sor, 'lagrange': lagrange, 'Newtonint': newtonint}
+
+
+class MotorFalso:
+    """Motor en el mismo proceso con la interfaz de matlab.engine.
+
+    Resuelve con app.numerico los métodos de la Sección 1, jacobi, gaussSeidel,
+    SOR, lagrange y Newtonint, así el pool y las rutas se pueden probar sin
+    MATLAB (las figuras de la Sección 2 no se generan):
+
+        pool = PoolMotores(2, iniciar=MotorFalso)
+    """
+
+    def __init__(self):
+        self.workspace = {}
+        self.rutas = [dir_matlab]
+        self.activo = True
+        self._metodos = _metodos_falsos()
+
+    def addpath(self, ruta, nargout=0):
+        self._verificar()
+        self.rutas.append(ruta)
+
+    def eval(self, cmd, nargout=0):
+        self._verificar()
+
+    def quit(self):
+        self.activo = False
+
+    def _verificar(self):
+        if not self.activo:
+            raise ErrorMotor('MATLAB has terminated')
+
+    def __getattr__(self, nombre):
+        if nombre.startswith('_') or nombre not in self._metodos:
+            raise AttributeError(nombre)
+        metodo = self._metodos[nombre]
+
+        def llamar(*args, nargout=1):
+            self._verificar()
+            salidas = metodo(*args)
+            if nargout == 1:
+                return salidas[0]
+            return salidas[:nargout]
+
+        return llamar
+
+
+# Los motores de los trabajadores de app/trabajos.py no salen de este pool
+pool = PoolMotores(config.MOTORES - config.TRABAJADORES if config.BACKEND == 'matlab' else config.MOTORES,
+                   espera=config.ESPERA_MOTOR)
+atexit.register(pool.cerrar)
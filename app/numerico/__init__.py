@@ -0,0 +1,9 @@
+"""Implementación en Python/NumPy de los métodos numéricos de la carpeta matlab/.
+
+Cada función devuelve las mismas salidas que su archivo .m equivalente y la
+tabla de iteraciones del método.
+"""
+
+
+class ErrorMetodo(Exception):
+    """Error durante la ejecución de un método (equivalente a error() en MATLAB)."""
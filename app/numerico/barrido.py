@@ -0,0 +1,107 @@
+"""Búsqueda de todas las raíces de f en un intervalo.
+
+f se evalúa de forma vectorizada en una rejilla de [a, b] y cada cambio de
+signo entre dos puntos vecinos se vuelve un intervalo para bisección o regla
+falsa. Las raíces de multiplicidad par no cambian el signo de f: aparecen como
+mínimos de |f| cerca de cero, y se buscan como cambios de signo de f' con el
+mismo método. Todos los intervalos se refinan a la vez con
+app/numerico/lotes.py y cada raíz conserva su tabla de iteraciones.
+"""
+import numpy as np
+
+from app import tablas
+from app.numerico import ErrorMetodo, lotes
+from app.numerico.derivadas import derivada_texto, derivar
+from app.numerico.expresiones import compilar
+
+# Puntos de la rejilla permitidos
+MIN_PUNTOS, MAX_PUNTOS = 10, 1000000
+
+CAMBIO, MINIMO, EXACTA = 'cambio de signo', 'mínimo de |f|', 'exacta en la rejilla'
+
+
+@np.errstate(all='ignore')
+def intervalos(f_str, a, b, puntos):
+    """Intervalos [x(k), x(k+1)] donde cambia el signo de f, intervalos
+    [x(k-1), x(k+1)] alrededor de los mínimos de |f| sin cambio de signo donde
+    cambia el signo de f', y puntos de la rejilla donde f es exactamente 0.
+    """
+    if not MIN_PUNTOS <= puntos <= MAX_PUNTOS:
+        raise ErrorMetodo('La rejilla debe tener entre %d y %d puntos' % (MIN_PUNTOS, MAX_PUNTOS))
+    if not a < b:
+        raise ErrorMetodo('El intervalo es inadecuado')
+    x = np.linspace(a, b, puntos)
+    y = np.asarray(compilar(f_str)(x), dtype=float)
+    finito = np.isfinite(y)
+
+    exactas = x[y == 0]
+    signo = np.sign(y)
+    k = np.flatnonzero(finito[:-1] & finito[1:] & (signo[:-1] * signo[1:] < 0))
+    cambios = np.column_stack([x[k], x[k + 1]])
+
+    # Mínimos locales de |f| sin cambio de signo a los lados
+    m = np.arange(1, puntos - 1)
+    absoluto = np.where(finito, np.abs(y), np.inf)
+    es_minimo = ((absoluto[m] < absoluto[m - 1]) & (absoluto[m] <= absoluto[m + 1])
+                 & (signo[m - 1] == signo[m]) & (signo[m] == signo[m + 1]) & (y[m] != 0))
+    m = m[es_minimo]
+    df = derivar(f_str, 1)
+    izquierda, derecha = np.asarray(df(x[m - 1]), dtype=float), np.asarray(df(x[m + 1]), dtype=float)
+    m = m[izquierda * derecha < 0]
+    minimos = np.column_stack([x[m - 1], x[m + 1]])
+    return cambios, minimos, exactas
+
+
+def todas_las_raices(f_str, a, b, puntos, Tol, niter, tipe, metodo='biseccion'):
+    """Todas las raíces de f en [a, b] que encuentra la rejilla.
+
+    metodo es 'biseccion' o 'reglaFalsa' y tipe su tipo de error. Un cambio de
+    signo donde |f| crece al refinar es una discontinuidad (un polo), no una
+    raíz. Un mínimo de |f| es raíz si |f| queda por debajo de Tol en el punto
+    donde se anula f'.
+
+    Devuelve un resumen, las raíces, la tabla de iteraciones de cada una y la
+    tabla de raíces.
+    """
+    if metodo not in ('biseccion', 'reglaFalsa'):
+        raise ErrorMetodo(f"El barrido solo usa métodos de intervalo, no '{metodo}'")
+    cambios, minimos, exactas = intervalos(f_str, a, b, puntos)
+    f = compilar(f_str)
+
+    # Los intervalos de f y los de f' se refinan juntos
+    funciones = [f_str] * len(cambios) + [derivada_texto(f_str)] * len(minimos)
+    extremos = np.concatenate([cambios, minimos]) if len(funciones) else np.empty((0, 2))
+    refinados = lotes.refinar(metodo, funciones, extremos[:, 0], extremos[:, 1], Tol, niter, tipe) \
+        if len(funciones) else []
+
+    encontradas = [(float(x), 0.0, EXACTA, '%f es raíz de f(x)' % x, tablas.tabla(Iteration=[], xn=[], fxn=[], E=[]))
+                   for x in exactas]
+    descartadas = 0
+    with np.errstate(all='ignore'):
+        for k, (raiz, _, estado, mensaje, tabla) in enumerate(refinados):
+            fraiz = float(f(np.float64(raiz)))
+            if k < len(cambios):
+                # Cerca de un polo |f| crece en lugar de acercarse a 0
+                ok = estado != lotes.FRACASO and abs(fraiz) <= np.abs(f(extremos[k])).max()
+                tipo = CAMBIO
+            else:
+                ok = estado != lotes.FRACASO and abs(fraiz) <= Tol
+                tipo = MINIMO
+                tabla = dict(tabla, fxn=np.asarray(f(tabla['xn']), dtype=float))
+            if ok:
+                encontradas.append((raiz, fraiz, tipo, mensaje, tabla))
+            else:
+                descartadas += 1
+    encontradas.sort(key=lambda r: r[0])
+
+    resumen = '%d raíces en [%f, %f]' % (len(encontradas), a, b)
+    if descartadas:
+        resumen += '; %d intervalos descartados (discontinuidades o mínimos que no llegan a 0)' % descartadas
+    tabla = tablas.tabla(**{
+        'Raiz': [r[0] for r in encontradas],
+        'f(Raiz)': [r[1] for r in encontradas],
+        'Iteraciones': [int(r[4]['Iteration'][-1]) if len(r[4]['Iteration']) else 0 for r in encontradas],
+        'Tipo': [r[2] for r in encontradas],
+        'Mensaje': [r[3] for r in encontradas],
+    })
+    return resumen, [r[0] for r in encontradas], [r[4] for r in encontradas], tabla
@@ -0,0 +1,156 @@
+"""Newton y raíces múltiples desde una rejilla de puntos iniciales.
+
+Todos los puntos de la rejilla (reales, o complejos si la parte imaginaria
+tiene un rango) avanzan juntos como un solo arreglo de NumPy; los que
+convergen o fallan se retiran del arreglo en cada iteración. Los puntos finales
+se agrupan en raíces distintas y cada punto inicial queda marcado con la raíz
+a la que llegó: su cuenca de atracción.
+
+Cada punto sigue las reglas de parada y el tipo de error de newton() y
+raices_multiples() de app/numerico/raices.py. Un punto donde la derivada (o el
+denominador de raíces múltiples) se anula no converge, en lugar de detener
+todo el método.
+"""
+import numpy as np
+
+from app import tablas
+from app.numerico import ErrorMetodo
+from app.numerico.derivadas import derivar
+from app.numerico.expresiones import compilar
+
+# Puntos iniciales máximos por petición
+MAX_ARRANQUES = 250000
+
+
+def rejilla(re_min, re_max, n_re, im_min=0.0, im_max=0.0, n_im=1):
+    """Puntos iniciales (n_im filas, de menor a mayor parte imaginaria, por n_re columnas)."""
+    if n_re < 1 or n_im < 1 or n_re * n_im > MAX_ARRANQUES:
+        raise ErrorMetodo('La rejilla debe tener entre 1 y %d puntos' % MAX_ARRANQUES)
+    re = np.linspace(re_min, re_max, n_re)
+    if n_im == 1 and im_min == im_max == 0:
+        return re[np.newaxis, :]
+    im = np.linspace(im_min, im_max, n_im)
+    return re[np.newaxis, :] + 1j * im[:, np.newaxis]
+
+
+def _paso_newton(f_str):
+    df = derivar(f_str, 1)
+    return lambda x, fx: (x - fx / df(x), df(x) == 0)
+
+
+def _paso_multiples(f_str):
+    df, ddf = derivar(f_str, 1), derivar(f_str, 2)
+
+    def paso(x, fx):
+        d1 = df(x)
+        denominador = d1 ** 2 - fx * ddf(x)
+        # Con f' = 0 y f != 0 el paso es nulo en un punto crítico que no es raíz
+        return x - (fx * d1) / denominador, (denominador == 0) | ((d1 == 0) & (fx != 0))
+    return paso
+
+
+# Método: (paso de la iteración, si el tipo de error se mide en forma relativa)
+METODOS = {
+    'newton': (_paso_newton, lambda et: et != 'Error Absoluto'),
+    'raicesMultiples': (_paso_multiples, lambda et: et == 'Cifras Significativas'),
+}
+
+
+@np.errstate(all='ignore')
+def iterar(f_str, metodo, x0, Tol, niter, et):
+    """Itera todos los puntos de x0 a la vez.
+
+    Devuelve el punto final, f en ese punto, las iteraciones y si convergió,
+    cada uno con la forma de x0.
+    """
+    if metodo not in METODOS:
+        raise ErrorMetodo(f"Método no disponible con varios puntos iniciales: '{metodo}'")
+    if metodo == 'raicesMultiples' and et not in ('Decimales Correctos', 'Cifras Significativas'):
+        raise ErrorMetodo('El tipo de error no es valido')
+    construir, relativo = METODOS[metodo]
+    f, paso, relativo = compilar(f_str), construir(f_str), relativo(et)
+
+    forma = np.shape(x0)
+    x = np.ravel(x0).astype(complex if np.iscomplexobj(x0) else float)
+    final, ffinal = x.copy(), np.full(x.shape, np.nan, dtype=x.dtype)
+    iteraciones = np.zeros(x.size, dtype=int)
+    convergio = np.zeros(x.size, dtype=bool)
+
+    i = np.arange(x.size)
+    fx = f(x)
+    E = np.full(x.size, Tol + 1)
+    c = 0
+    while len(i):
+        sigue = (E > Tol) & (fx != 0) & np.isfinite(x) & (c < niter)
+        if not sigue.all():
+            fin = ~sigue
+            final[i[fin]], ffinal[i[fin]], iteraciones[i[fin]] = x[fin], fx[fin], c
+            convergio[i[fin]] = np.isfinite(x[fin]) & ((fx[fin] == 0) | (E[fin] < Tol))
+            i, x, fx = i[sigue], x[sigue], fx[sigue]
+            if not len(i):
+                break
+        x1, anulado = paso(x, fx)
+        E = np.abs(x1 - x)
+        if relativo:
+            E = E / np.abs(x1)
+        # Derivada nula: el punto se retira sin converger
+        E[anulado] = np.nan
+        x1[anulado] = np.nan
+        x, fx = x1, f(x1)
+        c += 1
+
+    return final.reshape(forma), ffinal.reshape(forma), iteraciones.reshape(forma), convergio.reshape(forma)
+
+
+def agrupar(x, convergio, Tol):
+    """Raíces distintas entre los puntos que convergieron y el índice de cada punto (-1 si no convergió)."""
+    x = np.ravel(x)
+    indice = np.full(x.size, -1)
+    radio = max(10 * Tol, 1e-10)
+    representantes = []
+    pendientes = np.flatnonzero(np.ravel(convergio))
+    while pendientes.size:
+        z = x[pendientes[0]]
+        cerca = np.abs(x[pendientes] - z) <= radio * max(1.0, abs(z))
+        indice[pendientes[cerca]] = len(representantes)
+        representantes.append(np.median(x[pendientes[cerca]].real) + 1j * np.median(x[pendientes[cerca]].imag))
+        pendientes = pendientes[~cerca]
+
+    # Numerar las raíces de izquierda a derecha (y de abajo hacia arriba)
+    raices = np.asarray(representantes, dtype=complex)
+    orden = np.lexsort((raices.imag, raices.real))
+    nuevo = np.empty(len(orden), dtype=int)
+    nuevo[orden] = np.arange(len(orden))
+    indice[indice >= 0] = nuevo[indice[indice >= 0]]
+    return raices[orden], indice
+
+
+@np.errstate(all='ignore')
+def cuencas(f_str, metodo, re_min, re_max, n_re, im_min, im_max, n_im, Tol, niter, et):
+    """Raíces distintas que alcanza el método desde cada punto de la rejilla.
+
+    Devuelve un resumen, las raíces ([parte real, parte imaginaria]), la cuenca
+    (índice de la raíz, -1 si no convergió) y las iteraciones de cada punto
+    inicial con la forma de la rejilla, y la tabla de raíces.
+    """
+    x0 = rejilla(re_min, re_max, n_re, im_min, im_max, n_im)
+    final, _, iteraciones, convergio = iterar(f_str, metodo, x0, Tol, niter, et)
+    raices, indice = agrupar(final, convergio, Tol)
+    indice = indice.reshape(x0.shape)
+
+    f = compilar(f_str)
+    llegaron = indice >= 0
+    arranques = np.bincount(indice[llegaron], minlength=len(raices))
+    promedio = np.bincount(indice[llegaron], weights=iteraciones[llegaron], minlength=len(raices)) / arranques
+    valores = f(raices if np.iscomplexobj(x0) else raices.real) if len(raices) else np.array([])
+    resumen = '%d raíces distintas desde %d puntos iniciales; %d puntos no convergieron' % (
+        len(raices), x0.size, np.count_nonzero(indice < 0))
+    tabla = tablas.tabla(**{
+        'Raiz': np.arange(1, len(raices) + 1),
+        'Re': raices.real,
+        'Im': raices.imag,
+        '|f(raiz)|': np.abs(valores),
+        'Arranques': arranques,
+        'Iteraciones promedio': promedio,
+    })
+    return resumen, np.column_stack([raices.real, raices.imag]), indice, iteraciones, tabla
@@ -0,0 +1,279 @@
+"""Derivadas exactas de las funciones del usuario.
+
+Se deriva simbólicamente el árbol que arma app/numerico/expresiones.py, así
+Newton y raíces múltiples usan f' y f'' exactas en lugar de diferencias finitas,
+y /derivar no necesita el diff de MATLAB.
+"""
+import functools
+
+import numpy as np
+
+from app.numerico import expresiones
+
+_CERO = ('num', 0.0)
+_UNO = ('num', 1.0)
+
+
+# Constructores que simplifican los casos triviales (0 + a, 1 * a, a ^ 1, ...)
+
+def _numero(nodo):
+    return nodo[1] if nodo[0] == 'num' else None
+
+
+def _sumar(a, b):
+    if a == b:
+        return _multiplicar(('num', 2.0), a)
+    if _numero(a) == 0:
+        return b
+    if _numero(b) == 0:
+        return a
+    if _numero(a) is not None and _numero(b) is not None:
+        return ('num', a[1] + b[1])
+    if b[0] == 'neg':
+        return _restar(a, b[1])
+    if _numero(b) is not None and b[1] < 0:
+        return _restar(a, ('num', -b[1]))
+    if b[0] == '*' and _numero(b[1]) is not None and b[1][1] < 0:
+        return _restar(a, _negar(b))
+    return ('+', a, b)
+
+
+def _restar(a, b):
+    if a == b:
+        return _CERO
+    if _numero(b) == 0:
+        return a
+    if _numero(a) == 0:
+        return _negar(b)
+    if _numero(a) is not None and _numero(b) is not None:
+        return ('num', a[1] - b[1])
+    if b[0] == 'neg':
+        return _sumar(a, b[1])
+    if _numero(b) is not None and b[1] < 0:
+        return _sumar(a, ('num', -b[1]))
+    if b[0] == '*' and _numero(b[1]) is not None and b[1][1] < 0:
+        return _sumar(a, _negar(b))
+    return ('-', a, b)
+
+
+def _negar(a):
+    if _numero(a) is not None:
+        return ('num', -a[1])
+    if a[0] == 'neg':
+        return a[1]
+    if a[0] == '*' and _numero(a[1]) is not None:
+        return _multiplicar(('num', -a[1][1]), a[2])
+    return ('neg', a)
+
+
+def _multiplicar(a, b):
+    if _numero(a) == 0 or _numero(b) == 0:
+        return _CERO
+    if _numero(a) == 1:
+        return b
+    if _numero(b) == 1:
+        return a
+    if _numero(a) == -1:
+        return _negar(b)
+    if _numero(b) == -1:
+        return _negar(a)
+    if _numero(a) is not None and _numero(b) is not None:
+        return ('num', a[1] * b[1])
+    if _numero(b) is not None:
+        # Constantes a la izquierda: 2*x en lugar de x*2
+        a, b = b, a
+    if _numero(a) is not None and b[0] == '*' and _numero(b[1]) is not None:
+        return _multiplicar(('num', a[1] * b[1][1]), b[2])
+    if a == b:
+        return _potencia(a, ('num', 2.0))
+    if a[0] == 'neg':
+        return _negar(_multiplicar(a[1], b))
+    if b[0] == 'neg':
+        return _negar(_multiplicar(a, b[1]))
+    return ('*', a, b)
+
+
+def _dividir(a, b):
+    if a == b:
+        return _UNO
+    if _numero(a) == 0:
+        return _CERO
+    if _numero(b) == 1:
+        return a
+    if _numero(a) is not None and _numero(b):
+        return ('num', a[1] / b[1])
+    if a[0] == 'neg':
+        return _negar(_dividir(a[1], b))
+    return ('/', a, b)
+
+
+def _potencia(a, b):
+    if _numero(b) == 0:
+        return _UNO
+    if _numero(b) == 1:
+        return a
+    if _numero(a) is not None and _numero(b) is not None:
+        # Igual que expresiones._plegar: con NumPy, sin excepciones. (-8)^(1/3), 0^-1
+        # o 10^400 quedan sin plegar y se evalúan como f
+        with np.errstate(all='ignore'):
+            valor = np.power(a[1], b[1])
+        if np.isfinite(valor):
+            return ('num', float(valor))
+    if a[0] == '^' and _numero(a[2]) is not None and _numero(b) is not None:
+        # (u^m)^n = u^(m*n) solo con n entero, y si m no es entero, m*n tampoco
+        # debe serlo: (x^2)^0.5 es |x| y (x^0.5)^2 no está definida para x < 0
+        m, n = a[2][1], b[1]
+        if _entero(n) and (_entero(m) or not _entero(m * n)):
+            return _potencia(a[1], ('num', m * n))
+    return ('^', a, b)
+
+
+def _entero(valor):
+    return np.isfinite(valor) and valor == int(valor)
+
+
+_CONSTRUCTORES = {'+': _sumar, '-': _restar, '*': _multiplicar, '/': _dividir, '^': _potencia}
+
+
+def simplificar(nodo):
+    """Vuelve a armar el árbol con los constructores anteriores (pliega -2, 2*3, ...)."""
+    tipo = nodo[0]
+    if tipo in ('num', 'x'):
+        return nodo
+    if tipo == 'neg':
+        return _negar(simplificar(nodo[1]))
+    if tipo == 'fun':
+        return _funcion(nodo[1], simplificar(nodo[2]))
+    return _CONSTRUCTORES[tipo](simplificar(nodo[1]), simplificar(nodo[2]))
+
+
+def _funcion(nombre, a):
+    return ('fun', nombre, a)
+
+
+# Derivada de cada función respecto a su argumento u
+_REGLAS = {
+    'sin': lambda u: _funcion('cos', u),
+    'cos': lambda u: _negar(_funcion('sin', u)),
+    'tan': lambda u: _dividir(_UNO, _potencia(_funcion('cos', u), ('num', 2.0))),
+    'asin': lambda u: _dividir(_UNO, _funcion('sqrt', _restar(_UNO, _potencia(u, ('num', 2.0))))),
+    'acos': lambda u: _negar(_dividir(_UNO, _funcion('sqrt', _restar(_UNO, _potencia(u, ('num', 2.0)))))),
+    'atan': lambda u: _dividir(_UNO, _sumar(_UNO, _potencia(u, ('num', 2.0)))),
+    'sinh': lambda u: _funcion('cosh', u),
+    'cosh': lambda u: _funcion('sinh', u),
+    'tanh': lambda u: _restar(_UNO, _potencia(_funcion('tanh', u), ('num', 2.0))),
+    'exp': lambda u: _funcion('exp', u),
+    'log': lambda u: _dividir(_UNO, u),
+    'log10': lambda u: _dividir(_UNO, _multiplicar(u, ('num', np.log(10.0)))),
+    'log2': lambda u: _dividir(_UNO, _multiplicar(u, ('num', np.log(2.0)))),
+    'sqrt': lambda u: _dividir(_UNO, _multiplicar(('num', 2.0), _funcion('sqrt', u))),
+    'abs': lambda u: _funcion('sign', u),
+    'sign': lambda u: _CERO,
+}
+
+
+def _depende(nodo):
+    return nodo[0] == 'x' or any(_depende(hijo) for hijo in nodo[1:] if isinstance(hijo, tuple))
+
+
+def derivada(nodo):
+    """Árbol de la derivada respecto a x de un árbol de expresiones.analizar."""
+    tipo = nodo[0]
+    if not _depende(nodo):
+        return _CERO
+    if tipo == 'x':
+        return _UNO
+    if tipo == 'neg':
+        return _negar(derivada(nodo[1]))
+    if tipo == 'fun':
+        u = nodo[2]
+        return _multiplicar(_REGLAS[nodo[1]](u), derivada(u))
+
+    a, b = nodo[1], nodo[2]
+    if tipo == '+':
+        return _sumar(derivada(a), derivada(b))
+    if tipo == '-':
+        return _restar(derivada(a), derivada(b))
+    if tipo == '*':
+        return _sumar(_multiplicar(derivada(a), b), _multiplicar(a, derivada(b)))
+    if tipo == '/':
+        if not _depende(b):
+            return _dividir(derivada(a), b)
+        return _dividir(_restar(_multiplicar(derivada(a), b), _multiplicar(a, derivada(b))),
+                        _potencia(b, ('num', 2.0)))
+    # tipo == '^'
+    if not _depende(b):
+        # (u^n)' = n*u^(n-1)*u'
+        exponente = _restar(b, _UNO)
+        return _multiplicar(_multiplicar(b, _potencia(a, exponente)), derivada(a))
+    if not _depende(a):
+        # (c^v)' = c^v*log(c)*v'
+        return _multiplicar(_multiplicar(nodo, _funcion('log', a)), derivada(b))
+    # (u^v)' = u^v*(v'*log(u) + v*u'/u)
+    return _multiplicar(nodo, _sumar(_multiplicar(derivada(b), _funcion('log', a)),
+                                     _dividir(_multiplicar(b, derivada(a)), a)))
+
+
+@functools.lru_cache(maxsize=512)
+def _arbol(fuente, orden):
+    nodo = simplificar(expresiones.analizar(fuente))
+    for _ in range(orden):
+        nodo = simplificar(derivada(nodo))
+    return nodo
+
+
+def derivar(f_str, orden=1):
+    """Devuelve la función f^(orden)(x), vectorizada como expresiones.compilar."""
+    return expresiones.compilar_arbol(_arbol(expresiones.normalizar(f_str), orden))
+
+
+# Conversión del árbol a texto con sintaxis de MATLAB
+
+_PRECEDENCIA = {'+': 1, '-': 1, '*': 2, '/': 2, 'neg': 3, '^': 4}
+
+
+def _numero_texto(valor):
+    if valor == np.pi:
+        return 'pi'
+    if np.isnan(valor):
+        return 'NaN'
+    if np.isinf(valor):
+        return 'Inf' if valor > 0 else '-Inf'
+    if valor == int(valor) and abs(valor) < 1e15:
+        return '%d' % valor
+    return repr(float(valor))
+
+
+def _texto(nodo, minima):
+    tipo = nodo[0]
+    if tipo == 'num':
+        resultado = _numero_texto(nodo[1])
+        precedencia = 3 if nodo[1] < 0 else 5
+    elif tipo == 'x':
+        return 'x'
+    elif tipo == 'fun':
+        return '%s(%s)' % (nodo[1], _texto(nodo[2], 0))
+    elif tipo == 'neg':
+        precedencia = _PRECEDENCIA['neg']
+        resultado = '-' + _texto(nodo[1], precedencia)
+    else:
+        precedencia = _PRECEDENCIA[tipo]
+        if tipo == '^':
+            # Paréntesis en la base y en el exponente compuestos: (x^2)^3, x^(n - 1)
+            izquierda, derecha = _texto(nodo[1], precedencia + 1), _texto(nodo[2], precedencia + 1)
+            resultado = '%s^%s' % (izquierda, derecha)
+        else:
+            izquierda, derecha = _texto(nodo[1], precedencia), _texto(nodo[2], precedencia + 1)
+            separador = ' %s ' % tipo if precedencia == 1 else tipo
+            resultado = izquierda + separador + derecha
+    return '(%s)' % resultado if precedencia < minima else resultado
+
+
+def texto(nodo):
+    """Escribe un árbol como función de MATLAB, por ejemplo 'cos(x) - 2*x'."""
+    return _texto(nodo, 0)
+
+
+def derivada_texto(f_str):
+    """Derivada de f como texto, equivalente a char(diff(str2sym(f), x))."""
+    return texto(_arbol(expresiones.normalizar(f_str), 1))
@@ -0,0 +1,265 @@
+"""Conversión de las funciones escritas con sintaxis de MATLAB a funciones de Python.
+
+La cadena se analiza con un parser propio (sin eval) y se convierte en un árbol
+de nodos:
+
+    ('num', valor)           constante numérica
+    ('x',)                   la variable
+    ('p',)                   el parámetro (solo con compilar_parametrica)
+    ('neg', a)               -a
+    ('+', a, b), ('-', a, b), ('*', a, b), ('/', a, b), ('^', a, b)
+    ('fun', nombre, a)       nombre(a), con nombre en FUNCIONES
+
+El árbol se compila a una función que solo combina ufuncs de NumPy, así el
+mismo f sirve para evaluar un escalar o un arreglo completo. Las funciones
+compiladas se guardan por su texto normalizado.
+"""
+import functools
+import re
+
+import numpy as np
+
+from app.numerico import ErrorMetodo
+
+# Funciones y constantes que el usuario puede utilizar dentro de la función
+FUNCIONES = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'log10': np.log10, 'log2': np.log2,
+    'sqrt': np.sqrt, 'abs': np.abs, 'sign': np.sign,
+}
+CONSTANTES = {'pi': np.pi, 'Inf': np.inf, 'inf': np.inf, 'NaN': np.nan, 'nan': np.nan}
+
+_BINARIAS = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide, '^': np.power}
+
+_TOKEN = re.compile(r'''
+    (?P<num>(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?)
+  | (?P<nombre>[A-Za-z_]\w*)
+  | (?P<op>\.\^|\.\*|\./|\*\*|[-+*/^()])
+''', re.VERBOSE)
+
+# Operadores elemento a elemento de MATLAB y ** de Python se tratan igual que ^, * y /
+_OPERADORES = {'.^': '^', '**': '^', '.*': '*', './': '/'}
+
+
+def _tokens(fuente):
+    tokens = []
+    pos = 0
+    while pos < len(fuente):
+        if fuente[pos].isspace():
+            pos += 1
+            continue
+        coincidencia = _TOKEN.match(fuente, pos)
+        if coincidencia is None:
+            raise ErrorMetodo(f"Carácter no válido en la función: '{fuente[pos]}'")
+        tipo = coincidencia.lastgroup
+        texto = coincidencia.group()
+        if tipo == 'op':
+            texto = _OPERADORES.get(texto, texto)
+        tokens.append((tipo, texto))
+        pos = coincidencia.end()
+    return tokens
+
+
+class _Parser:
+    """Descenso recursivo con la precedencia de MATLAB.
+
+    De menor a mayor: + y -, luego * y /, luego el signo unario y por último
+    ^ (asociativo por la izquierda, como en MATLAB: 2^3^2 = 64 y -2^2 = -4).
+    """
+
+    def __init__(self, fuente, variables=('x',)):
+        self.fuente = fuente
+        self.variables = variables
+        self.tokens = _tokens(fuente)
+        self.pos = 0
+
+    def analizar(self):
+        if not self.tokens:
+            raise ErrorMetodo('La función está vacía')
+        nodo = self._suma()
+        if self.pos != len(self.tokens):
+            self._error()
+        return nodo
+
+    def _actual(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _tomar(self, texto):
+        if self._actual() == ('op', texto):
+            self.pos += 1
+            return True
+        return False
+
+    def _error(self):
+        raise ErrorMetodo(f"La función '{self.fuente}' no tiene una sintaxis válida")
+
+    def _suma(self):
+        nodo = self._producto()
+        while True:
+            if self._tomar('+'):
+                nodo = ('+', nodo, self._producto())
+            elif self._tomar('-'):
+                nodo = ('-', nodo, self._producto())
+            else:
+                return nodo
+
+    def _producto(self):
+        nodo = self._unario()
+        while True:
+            if self._tomar('*'):
+                nodo = ('*', nodo, self._unario())
+            elif self._tomar('/'):
+                nodo = ('/', nodo, self._unario())
+            else:
+                return nodo
+
+    def _unario(self):
+        if self._tomar('-'):
+            return ('neg', self._unario())
+        if self._tomar('+'):
+            return self._unario()
+        return self._potencia()
+
+    def _potencia(self):
+        nodo = self._primario()
+        while self._tomar('^'):
+            # MATLAB permite el signo en el exponente: x^-1
+            signos = 0
+            while self._actual() in (('op', '-'), ('op', '+')):
+                signos += self._actual()[1] == '-'
+                self.pos += 1
+            exponente = self._primario()
+            if signos % 2:
+                exponente = ('neg', exponente)
+            nodo = ('^', nodo, exponente)
+        return nodo
+
+    def _primario(self):
+        tipo, texto = self._actual()
+        if tipo == 'num':
+            self.pos += 1
+            return ('num', float(texto))
+        if tipo == 'nombre':
+            self.pos += 1
+            if texto in self.variables:
+                return (texto,)
+            if texto in CONSTANTES:
+                return ('num', CONSTANTES[texto])
+            if texto in FUNCIONES:
+                if not self._tomar('('):
+                    self._error()
+                argumento = self._suma()
+                if not self._tomar(')'):
+                    self._error()
+                return ('fun', texto, argumento)
+            raise ErrorMetodo(f"Nombre no reconocido en la función: '{texto}'")
+        if self._tomar('('):
+            nodo = self._suma()
+            if not self._tomar(')'):
+                self._error()
+            return nodo
+        self._error()
+
+
+def normalizar(f_str):
+    """Texto de la función sin espacios alrededor de los operadores, usado como
+    clave de la memoización."""
+    return re.sub(r'\s*([-+*/^()])\s*', r'\1', ' '.join(f_str.split()))
+
+
+def canonica(texto):
+    """Árbol de texto (con x y p como variables) si es una función de x o de p,
+    o None. Dos textos con el mismo árbol, como 'x^2-2', 'x^2 - 2' y 'x.^2-2',
+    son la misma función."""
+    # Matrices, vectores y opciones no nombran la variable: no hace falta analizarlos
+    if not re.search(r'\b[xp]\b', texto):
+        return None
+    try:
+        return _arbol(normalizar(texto), ('x', 'p'))
+    except (ErrorMetodo, RecursionError):
+        return None
+
+
+@functools.lru_cache(maxsize=512)
+def _arbol(fuente, variables=('x',)):
+    return _Parser(fuente, variables).analizar()
+
+
+def analizar(f_str):
+    """Devuelve el árbol de la función (ver el docstring del módulo)."""
+    return _arbol(normalizar(f_str))
+
+
+def _constante(nodo):
+    return nodo[0] not in ('x', 'p') and all(_constante(hijo) for hijo in nodo[1:] if isinstance(hijo, tuple))
+
+
+@np.errstate(all='ignore')
+def _plegar(nodo):
+    # Calcular una sola vez las partes que no dependen de x (ni de p)
+    if nodo[0] not in ('num', 'x', 'p') and _constante(nodo):
+        return ('num', float(_construir(nodo)(0.0, None)))
+    return tuple(_plegar(hijo) if isinstance(hijo, tuple) else hijo for hijo in nodo)
+
+
+def _construir(nodo):
+    tipo = nodo[0]
+    if tipo == 'num':
+        valor = np.float64(nodo[1])
+        return lambda x, p: valor
+    if tipo == 'x':
+        return lambda x, p: x
+    if tipo == 'p':
+        return lambda x, p: p
+    if tipo == 'neg':
+        a = _construir(nodo[1])
+        return lambda x, p: np.negative(a(x, p))
+    if tipo == 'fun':
+        funcion, a = FUNCIONES[nodo[1]], _construir(nodo[2])
+        return lambda x, p: funcion(a(x, p))
+    operacion, a, b = _BINARIAS[tipo], _construir(nodo[1]), _construir(nodo[2])
+    return lambda x, p: operacion(a(x, p), b(x, p))
+
+
+@functools.lru_cache(maxsize=512)
+def compilar_arbol(nodo):
+    """Compila un árbol (de analizar o de app/numerico/derivadas.py) a f(x)."""
+    g = _construir(_plegar(nodo))
+
+    def f(x):
+        resultado = g(x, None)
+        if np.shape(resultado) != np.shape(x):
+            # Funciones constantes: devolver un valor por cada punto
+            resultado = np.full(np.shape(x), resultado)
+        return resultado
+
+    return f
+
+
+def compilar(f_str):
+    """Devuelve una función f(x) equivalente a str2func(['@(x)' f_str]).
+
+    f acepta un escalar o un arreglo de NumPy y se evalúa elemento a elemento.
+    """
+    return compilar_arbol(analizar(f_str))
+
+
+@functools.lru_cache(maxsize=128)
+def compilar_parametrica(f_str):
+    """Devuelve f(x, p) para funciones con un parámetro p, por ejemplo 'x^2 - p'.
+
+    x y p pueden ser arreglos: el resultado tiene la forma de su broadcast, así
+    un barrido del parámetro se evalúa en una sola llamada.
+    """
+    g = _construir(_plegar(_arbol(normalizar(f_str), ('x', 'p'))))
+
+    def f(x, p):
+        resultado = g(x, p)
+        forma = np.broadcast(x, p).shape
+        if np.shape(resultado) != forma:
+            resultado = np.broadcast_to(resultado, forma).copy()
+        return resultado
+
+    return f
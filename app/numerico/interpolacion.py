@@ -0,0 +1,400 @@
+"""Polinomio de interpolación en forma baricéntrica y en forma de Newton.
+
+lagrange() y newtonint() dan las mismas salidas que lagrange.m y Newtonint.m y
+además el interpolante listo para evaluar sin pasar por la cadena del
+polinomio ni por los coeficientes en la base de potencias:
+
+    {'forma': 'baricentrica', 'x': nodos, 'y': valores, 'pesos': w}
+    {'forma': 'newton', 'x': nodos, 'coeficientes': diferencias divididas}
+
+evaluar() calcula el interpolante en un arreglo de puntos en O(n) por punto:
+la fórmula baricéntrica p(t) = sum(w_i y_i / (t - x_i)) / sum(w_i / (t - x_i))
+o Horner sobre la forma de Newton. Los pesos están normalizados (el de mayor
+valor absoluto es ±1): la fórmula baricéntrica no cambia con un factor común
+y así no se desbordan con muchos nodos.
+
+vandermonde() resuelve el sistema de Vandermonde de vander.m con
+Björck-Pereyra en O(n^2), sin armar la matriz, y estima su número de
+condición; con base='chebyshev' resuelve en cambio en la base de Chebyshev
+(con QR), mucho mejor condicionada cuando hay muchos nodos.
+
+spline() calcula los trazadores de spline.m (grado 1, 2 o 3) en O(n) con su
+formulación por tramos (el sistema tridiagonal de los trazadores cúbicos) en
+lugar del sistema denso de (d+1)(n-1) incógnitas; se evalúan ubicando cada
+punto en su tramo con searchsorted.
+
+NewtonIncremental conserva la tabla de diferencias divididas cuando los datos
+llegan de a uno: cada punto nuevo agrega una fila calculada solo con la fila
+anterior, en O(n), sin rehacer la tabla completa.
+"""
+from math import comb
+
+import numpy as np
+
+from app.numerico import ErrorMetodo
+from app.numerico.sistemas import leer
+
+try:
+    import scipy.linalg
+except ImportError:  # SciPy es opcional: sin él el sistema tridiagonal se resuelve con Thomas
+    scipy = None
+
+# Elementos de la matriz puntos x nodos que se evalúan a la vez en la fórmula baricéntrica
+BLOQUE = 1 << 22
+
+# Bases para el método de Vandermonde
+BASES = {'potencias': 'Potencias (Björck-Pereyra)', 'chebyshev': 'Chebyshev (QR)'}
+# Número de condición a partir del cual el resultado de Vandermonde no es confiable
+CONDICION_MAXIMA = 1e12
+
+
+def _nodos(x, y):
+    x, y = np.asarray(x, dtype=float).ravel(), np.asarray(y, dtype=float).ravel()
+    if len(x) != len(y) or not len(x):
+        raise ErrorMetodo('Los vectores x e y deben tener la misma cantidad de datos')
+    if len(np.unique(x)) != len(x):
+        raise ErrorMetodo('Los valores de x deben ser distintos')
+    return x, y
+
+
+def pesos_baricentricos(x):
+    """w_i = 1 / prod(x_i - x_j), j != i, normalizados para que max |w_i| = 1."""
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    logaritmo, signo = np.empty(n), np.empty(n)
+    # Por bloques de filas para no armar la matriz n x n completa
+    filas = max(1, BLOQUE // max(n, 1))
+    for inicio in range(0, n, filas):
+        diferencias = x[inicio:inicio + filas, np.newaxis] - x[np.newaxis, :]
+        diferencias[np.arange(len(diferencias)), np.arange(inicio, inicio + len(diferencias))] = 1.0
+        logaritmo[inicio:inicio + filas] = -np.log(np.abs(diferencias)).sum(axis=1)
+        signo[inicio:inicio + filas] = np.prod(np.sign(diferencias), axis=1)
+    return signo * np.exp(logaritmo - logaritmo.max())
+
+
+def tabla_diferencias(x, y):
+    """Tabla de diferencias divididas de Newtonint.m: columnas x, y, D1, ..., D(n-1)."""
+    n = len(x)
+    Tabla = np.zeros((n, n + 1))
+    Tabla[:, 0], Tabla[:, 1] = x, y
+    for j in range(2, n + 1):
+        Tabla[j - 1:, j] = (Tabla[j - 1:, j - 1] - Tabla[j - 2:-1, j - 1]) / (x[j - 1:] - x[:n - j + 1])
+    return Tabla
+
+
+def newton_a_potencias(x, coeficientes):
+    """Coeficientes de mayor a menor grado del polinomio en forma de Newton (como Newtonint.m)."""
+    pol = np.array([coeficientes[0]])
+    acumulado = np.array([1.0])
+    for i in range(1, len(coeficientes)):
+        pol = np.concatenate([[0.0], pol])
+        acumulado = np.convolve(acumulado, [1.0, -x[i - 1]])
+        pol = pol + coeficientes[i] * acumulado
+    return pol
+
+
+def baricentrica(x, y):
+    """Interpolante en forma baricéntrica."""
+    x, y = _nodos(x, y)
+    return {'forma': 'baricentrica', 'x': x, 'y': y, 'pesos': pesos_baricentricos(x)}
+
+
+def forma_newton(Tabla):
+    """Interpolante en forma de Newton a partir de la tabla de diferencias divididas."""
+    Tabla = np.asarray(Tabla, dtype=float)
+    return {'forma': 'newton', 'x': Tabla[:, 0].copy(), 'coeficientes': np.diag(Tabla, 1).copy()}
+
+
+def lagrange(x, y):
+    """Coeficientes del polinomio de Lagrange (como lagrange.m) y su forma baricéntrica."""
+    x, y = _nodos(x, y)
+    pol = np.zeros(len(x))
+    for i in range(len(x)):
+        otros = np.delete(x, i)
+        pol += y[i] * np.poly(otros) / np.prod(x[i] - otros)
+    return pol, baricentrica(x, y)
+
+
+def newtonint(x, y):
+    """Tabla de diferencias divididas, coeficientes (como Newtonint.m) y forma de Newton."""
+    x, y = _nodos(x, y)
+    Tabla = tabla_diferencias(x, y)
+    forma = forma_newton(Tabla)
+    return Tabla, newton_a_potencias(x, forma['coeficientes']), forma
+
+
+def _bjorck_pereyra(x, y):
+    # Resuelve V a = y con V[i, j] = x_i^j: diferencias divididas y luego paso a potencias
+    a = np.array(y, dtype=float)
+    n = len(x)
+    for k in range(n - 1):
+        a[k + 1:] = (a[k + 1:] - a[k:-1]) / (x[k + 1:] - x[:n - k - 1])
+    for k in range(n - 2, -1, -1):
+        a[k:-1] -= x[k] * a[k + 1:]
+    return a
+
+
+def _bjorck_pereyra_transpuesta(x, b):
+    # Resuelve V^T z = b con la misma V: los pasos del algoritmo anterior transpuestos
+    z = np.array(b, dtype=float)
+    n = len(x)
+    for k in range(n - 1):
+        z[k + 1:] -= x[k] * z[k:-1]
+    for k in range(n - 2, -1, -1):
+        z[k + 1:] /= x[k + 1:] - x[:n - k - 1]
+        z[k:-1] -= z[k + 1:]
+    return z
+
+
+@np.errstate(all='ignore')
+def condicion_vandermonde(x):
+    """Estimación de cond_1(V) = ||V||_1 ||V^-1||_1 sin armar V ni su inversa.
+
+    ||V^-1||_1 se estima con el método de Hager (el de cond de LAPACK), que
+    solo necesita resolver con V y con V^T: O(n^2) por iteración.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    # ||V||_1: máxima suma de |x_i|^j sobre cada columna j
+    potencias = np.ones(n)
+    norma = float(n)
+    for _ in range(1, n):
+        potencias = potencias * np.abs(x)
+        norma = max(norma, potencias.sum())
+    v = np.full(n, 1.0 / n)
+    estimacion = 0.0
+    for _ in range(5):
+        w = _bjorck_pereyra(x, v)
+        estimacion = np.abs(w).sum()
+        z = _bjorck_pereyra_transpuesta(x, np.where(w >= 0, 1.0, -1.0))
+        j = int(np.argmax(np.abs(z)))
+        if np.abs(z[j]) <= z @ v:
+            break
+        v = np.zeros(n)
+        v[j] = 1.0
+    # Vector alternativo de Higham para los casos donde el método se engaña
+    alternativo = (-1.0) ** np.arange(n) * (1 + np.arange(n) / max(n - 1, 1))
+    estimacion = max(estimacion, 2 * np.abs(_bjorck_pereyra(x, alternativo)).sum() / (3 * n))
+    return norma * estimacion if np.isfinite(norma * estimacion) else np.inf
+
+
+def _dominio(x):
+    a, b = float(x.min()), float(x.max())
+    return (a - 1.0, a + 1.0) if a == b else (a, b)
+
+
+def vandermonde(x, y, base='potencias'):
+    """Coeficientes de mayor a menor grado (como vander.m), el interpolante y
+    el número de condición del sistema que se resolvió.
+
+    En la base de potencias el número de condición es la estimación de
+    cond_1 de la matriz de Vandermonde; en la de Chebyshev, cond_2 de la
+    matriz de Chebyshev-Vandermonde.
+    """
+    if base not in BASES:
+        raise ErrorMetodo(f"Base no reconocida: '{base}'")
+    x, y = _nodos(x, y)
+    if base == 'potencias':
+        with np.errstate(all='ignore'):
+            pol = _bjorck_pereyra(x, y)[::-1]
+        return pol, {'forma': 'potencias', 'coeficientes': pol}, condicion_vandermonde(x)
+
+    dominio = _dominio(x)
+    t = (2 * x - (dominio[0] + dominio[1])) / (dominio[1] - dominio[0])
+    Q, R = np.linalg.qr(np.polynomial.chebyshev.chebvander(t, len(x) - 1))
+    c = np.linalg.solve(R, Q.T @ y)
+    potencias = np.polynomial.Chebyshev(c, domain=dominio).convert(kind=np.polynomial.Polynomial).coef
+    pol = np.zeros(len(x))
+    pol[:len(potencias)] = potencias
+    return pol[::-1], {'forma': 'chebyshev', 'dominio': dominio, 'coeficientes': c}, float(np.linalg.cond(R))
+
+
+def _tridiagonal(inferior, diagonal, superior, b):
+    # inferior[i] multiplica a la incógnita i-1 y superior[i] a la i+1 en la fila i
+    n = len(diagonal)
+    if scipy is not None:
+        banda = np.zeros((3, n))
+        banda[0, 1:], banda[1], banda[2, :-1] = superior[:-1], diagonal, inferior[1:]
+        return scipy.linalg.solve_banded((1, 1), banda, b)
+    # Algoritmo de Thomas (el sistema de los trazadores es de diagonal dominante)
+    c, d = np.empty(n), np.empty(n)
+    c[0], d[0] = superior[0] / diagonal[0], b[0] / diagonal[0]
+    for i in range(1, n):
+        pivote = diagonal[i] - inferior[i] * c[i - 1]
+        c[i] = superior[i] / pivote
+        d[i] = (b[i] - inferior[i] * d[i - 1]) / pivote
+    for i in range(n - 2, -1, -1):
+        d[i] -= c[i] * d[i + 1]
+    return d
+
+
+def _globales(locales, x0):
+    # Coeficientes en potencias de (x - x0) a potencias de x, de mayor a menor grado
+    grado = locales.shape[1] - 1
+    globales = np.zeros_like(locales)
+    for k in range(grado + 1):
+        for j in range(k + 1):
+            # c_k (x - x0)^k aporta C(k, j) (-x0)^(k-j) c_k a x^j
+            globales[:, grado - j] += comb(k, j) * (-x0) ** (k - j) * locales[:, grado - k]
+    return globales
+
+
+def spline(x, y, d):
+    """Trazadores de grado d = 1, 2 o 3 con las condiciones de spline.m.
+
+    Grado 1: recta entre cada par de datos. Grado 2: S' continua y el primer
+    tramo recto (S'' = 0 en él). Grado 3: S' y S'' continuas y S'' = 0 en los
+    extremos (trazador natural).
+
+    Devuelve la tabla de spline.m (una fila por tramo con los coeficientes en
+    potencias de x, de mayor a menor grado) y el interpolante por tramos, con
+    los coeficientes en potencias de (x - x_i) para evaluarlo sin cancelación.
+    """
+    x, y = leer(x).ravel(), leer(y).ravel()
+    if d not in (1, 2, 3):
+        raise ErrorMetodo('El grado del trazador debe ser 1, 2 o 3')
+    if len(x) != len(y) or len(x) < 2:
+        raise ErrorMetodo('Los vectores x e y deben tener la misma cantidad de datos (al menos 2)')
+    h = np.diff(x)
+    if not (h > 0).all():
+        raise ErrorMetodo('Los valores de x deben ser distintos y estar en orden creciente')
+    m = np.diff(y) / h
+
+    if d == 1:
+        locales = np.column_stack([m, y[:-1]])
+    elif d == 2:
+        # z_i = S'(x_i): z_0 = m_0 (primer tramo recto) y z_(i+1) = 2 m_i - z_i,
+        # que con w_i = (-1)^i z_i es una suma acumulada
+        signo = np.where(np.arange(len(m)) % 2, -1.0, 1.0)
+        w = np.concatenate([[m[0]], m[0] - 2 * np.cumsum(signo[:-1] * m[:-1])])
+        z = signo * w
+        locales = np.column_stack([(m - z) / h, z, y[:-1]])
+    else:
+        # Segundas derivadas M_i en los nodos, con M = 0 en los extremos
+        M = np.zeros(len(x))
+        if len(x) > 2:
+            M[1:-1] = _tridiagonal(np.concatenate([[0.0], h[1:-1]]), 2 * (h[:-1] + h[1:]),
+                                   np.concatenate([h[1:-1], [0.0]]), 6 * np.diff(m))
+        b = m - h * (2 * M[:-1] + M[1:]) / 6
+        locales = np.column_stack([np.diff(M) / (6 * h), M[:-1] / 2, b, y[:-1]])
+
+    return _globales(locales, x[:-1]), {'forma': 'tramos', 'x': x, 'coeficientes': locales}
+
+
+class NewtonIncremental:
+    """Tabla de diferencias divididas que crece de a un punto.
+
+    La fila i tiene x_i, y_i y las diferencias f[x_(i-1), x_i], ...,
+    f[x_0, ..., x_i], como las filas de Newtonint.m; los coeficientes de la
+    forma de Newton son el último valor de cada fila.
+    """
+
+    def __init__(self):
+        self.filas = []
+
+    def __len__(self):
+        return len(self.filas)
+
+    @np.errstate(all='ignore')
+    def agregar(self, x, y):
+        """Agrega el punto (x, y) con una fila nueva de la tabla, en O(n)."""
+        x, y = float(x), float(y)
+        if not (np.isfinite(x) and np.isfinite(y)):
+            raise ErrorMetodo('Los datos deben ser números finitos')
+        if any(fila[0] == x for fila in self.filas):
+            raise ErrorMetodo('Los valores de x deben ser distintos')
+        n = len(self.filas)
+        fila = np.empty(n + 2)
+        fila[0], fila[1] = x, y
+        if n:
+            anterior = self.filas[-1]
+            nodos = np.array([f[0] for f in self.filas[::-1]])
+            # D_j = (D_(j-1) de esta fila - D_(j-1) de la anterior) / (x - x_(n-j+1))
+            for j in range(2, n + 2):
+                fila[j] = (fila[j - 1] - anterior[j - 1]) / (x - nodos[j - 2])
+        self.filas.append(fila)
+        return fila[-1]
+
+    def agregar_puntos(self, x, y):
+        """Agrega varios puntos en orden; si uno no es válido no se agrega ninguno."""
+        x, y = np.atleast_1d(np.asarray(x, dtype=float)), np.atleast_1d(np.asarray(y, dtype=float))
+        if x.shape != y.shape or x.ndim != 1:
+            raise ErrorMetodo('Los vectores x e y deben tener la misma cantidad de datos')
+        antes = len(self.filas)
+        try:
+            for xi, yi in zip(x, y):
+                self.agregar(xi, yi)
+        except ErrorMetodo:
+            del self.filas[antes:]
+            raise
+
+    def coeficientes(self):
+        return np.array([fila[-1] for fila in self.filas])
+
+    def nodos(self):
+        return np.array([fila[0] for fila in self.filas])
+
+    def interpolante(self):
+        """Forma de Newton para evaluar() (la misma de newtonint())."""
+        return {'forma': 'newton', 'x': self.nodos(), 'coeficientes': self.coeficientes()}
+
+    def tabla(self):
+        """Tabla completa con ceros arriba de la diagonal, como Newtonint.m."""
+        n = len(self.filas)
+        Tabla = np.zeros((n, n + 1))
+        for i, fila in enumerate(self.filas):
+            Tabla[i, :len(fila)] = fila
+        return Tabla
+
+
+def _baricentrica(x, y, pesos, t):
+    resultado = np.empty(len(t))
+    filas = max(1, BLOQUE // len(x))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for inicio in range(0, len(t), filas):
+            bloque = t[inicio:inicio + filas]
+            cocientes = pesos / (bloque[:, np.newaxis] - x)
+            valores = (cocientes @ y) / cocientes.sum(axis=1)
+            # En un nodo la fórmula da inf/inf: el valor es el dato
+            fila, columna = np.nonzero(bloque[:, np.newaxis] == x)
+            valores[fila] = y[columna]
+            resultado[inicio:inicio + filas] = valores
+    return resultado
+
+
+def _horner(x, coeficientes, t):
+    resultado = np.full(len(t), coeficientes[-1])
+    for k in range(len(coeficientes) - 2, -1, -1):
+        resultado *= t - x[k]
+        resultado += coeficientes[k]
+    return resultado
+
+
+def evaluar(interpolante, t):
+    """Valores del interpolante en los puntos t (escalar o arreglo de cualquier forma)."""
+    forma = np.shape(t)
+    t = np.asarray(t, dtype=float).ravel()
+    x = np.asarray(interpolante.get('x', ()), dtype=float)
+    if interpolante['forma'] == 'baricentrica':
+        valores = _baricentrica(x, np.asarray(interpolante['y'], dtype=float),
+                                np.asarray(interpolante['pesos'], dtype=float), t)
+    elif interpolante['forma'] == 'newton':
+        valores = _horner(x, np.asarray(interpolante['coeficientes'], dtype=float), t)
+    elif interpolante['forma'] == 'potencias':
+        valores = np.polyval(np.asarray(interpolante['coeficientes'], dtype=float), t)
+    elif interpolante['forma'] == 'tramos':
+        locales = np.asarray(interpolante['coeficientes'], dtype=float)
+        # Tramo de cada punto; fuera de [x_0, x_n] se extiende el primero o el último
+        i = np.clip(np.searchsorted(x, t, side='right') - 1, 0, len(locales) - 1)
+        desde = t - x[i]
+        valores = locales[i, 0].copy()
+        for k in range(1, locales.shape[1]):
+            valores *= desde
+            valores += locales[i, k]
+    elif interpolante['forma'] == 'chebyshev':
+        a, b = interpolante['dominio']
+        valores = np.polynomial.chebyshev.chebval((2 * t - (a + b)) / (b - a),
+                                                  np.asarray(interpolante['coeficientes'], dtype=float))
+    else:
+        raise ErrorMetodo(f"Forma de interpolante no reconocida: '{interpolante['forma']}'")
+    return valores.reshape(forma)
@@ -0,0 +1,259 @@
+"""Bisección, regla falsa y secante para muchos problemas a la vez.
+
+Cada problema (un carril) tiene su función, sus extremos o puntos iniciales,
+un parámetro p opcional (ver expresiones.compilar_parametrica), su tolerancia,
+su número de iteraciones y su tipo de error. Los carriles con la misma función
+avanzan juntos como arreglos de NumPy: cada iteración evalúa f una sola vez
+sobre todos los carriles que siguen activos y los que terminan se retiran del
+arreglo, así el costo por iteración es el de los problemas que faltan.
+
+Las reglas de parada, los errores y los mensajes son los de
+app/numerico/raices.py para cada carril. resolver() solo devuelve el resultado
+final de cada problema; refinar() también arma la tabla de iteraciones de cada
+carril (la usa la búsqueda de todas las raíces de app/numerico/barrido.py).
+"""
+import numpy as np
+
+from app import tablas
+from app.numerico import ErrorMetodo
+from app.numerico.expresiones import compilar_parametrica
+
+# Estado final de cada carril
+EXACTA, APROXIMACION, FRACASO, INADECUADO = 'exacta', 'aproximacion', 'fracaso', 'inadecuado'
+
+
+class _Salida:
+    """Resultado de cada carril, escrito a medida que los carriles terminan."""
+
+    def __init__(self, n, historial=False):
+        self.n = n
+        self.historial = [] if historial else None
+        self.raiz = np.full(n, np.nan)
+        self.fraiz = np.full(n, np.nan)
+        self.iteraciones = np.zeros(n, dtype=int)
+        self.error = np.full(n, np.nan)
+        self.estado = np.full(n, INADECUADO, dtype=object)
+        self.mensaje = np.full(n, '', dtype=object)
+
+    def retirar(self, indices, x, fx, iteraciones, error, estado, mensajes):
+        self.raiz[indices] = x
+        self.fraiz[indices] = fx
+        self.iteraciones[indices] = iteraciones
+        self.error[indices] = error
+        self.estado[indices] = estado
+        self.mensaje[indices] = mensajes
+
+    def anotar(self, indices, N, x, fx, E):
+        # Una fila de la tabla de iteraciones de cada carril activo
+        if self.historial is not None:
+            self.historial.append((indices, np.broadcast_to(N, indices.shape), x, fx, E))
+
+    def tablas(self):
+        """Tabla de iteraciones de cada carril (Iteration, xn, fxn, E)."""
+        if not self.historial:
+            return [tablas.tabla(Iteration=[], xn=[], fxn=[], E=[]) for _ in range(self.n)]
+        i, N, x, fx, E = (np.concatenate(columna) for columna in zip(*self.historial))
+        # Las filas se anotaron por iteración: un orden estable por carril las deja en orden
+        orden = np.argsort(i, kind='stable')
+        i, N, x, fx, E = i[orden], N[orden], x[orden], fx[orden], E[orden]
+        limites = np.searchsorted(i, np.arange(self.n + 1))
+        return [tablas.tabla(Iteration=N[a:b], xn=x[a:b], fxn=fx[a:b], E=E[a:b])
+                for a, b in zip(limites[:-1], limites[1:])]
+
+
+def _cierre(salida, i, x, fx, N, E, T, L, exacta, aproximacion):
+    # Clasificar los carriles que salen del ciclo como en raices.py
+    es_exacta = fx == 0
+    es_aproximacion = ~es_exacta & (E < T)
+    estado = np.where(es_exacta, EXACTA, np.where(es_aproximacion, APROXIMACION, FRACASO)).astype(object)
+    mensajes = [exacta(*v) if e == EXACTA else aproximacion(*v) if e == APROXIMACION else 'Fracasó en %d iteraciones' % l
+                for e, v, l in zip(estado, zip(x.tolist(), T.tolist(), N.tolist()), L.tolist())]
+    salida.retirar(i, x, fx, N, E, estado, mensajes)
+
+
+def _error(nuevo, anterior, relativo):
+    diferencia = np.abs(nuevo - anterior)
+    return np.where(relativo, diferencia / np.abs(nuevo), diferencia)
+
+
+@np.errstate(all='ignore')
+def _biseccion(f, salida, i, a, b, p, T, L, relativo):
+    fi, fs = f(a, p), f(b, p)
+
+    en_a = fi == 0
+    en_b = ~en_a & (fs == 0)
+    for extremo, x in ((en_a, a), (en_b, b)):
+        salida.retirar(i[extremo], x[extremo], 0.0, 0, np.nan, EXACTA,
+                       ['%f es raíz de f(x)' % v for v in x[extremo].tolist()])
+    inadecuado = ~en_a & ~en_b & ~(fs * fi < 0)
+    salida.mensaje[i[inadecuado]] = 'El intervalo es inadecuado'
+
+    activo = ~en_a & ~en_b & ~inadecuado
+    i, a, b, fi, p, T, L, relativo = (v[activo] for v in (i, a, b, fi, p, T, L, relativo))
+    xm = (a + b) / 2
+    fe = f(xm, p)
+    N = np.zeros(len(i), dtype=int)
+    E = T + 1
+    salida.anotar(i, N, xm, fe, E)
+
+    while len(i):
+        sigue = (E > T) & (fe != 0) & (N < L)
+        fin = ~sigue
+        if fin.any():
+            _cierre(salida, i[fin], xm[fin], fe[fin], N[fin], E[fin], T[fin], L[fin],
+                    lambda x, t, n: '%f es raíz de f(x)' % x,
+                    lambda x, t, n: '%f es una aproximación de una raíz de f(x) con una tolerancia = %f' % (x, t))
+            i, a, b, fi, fe, xm, p, T, L, N, relativo = (
+                v[sigue] for v in (i, a, b, fi, fe, xm, p, T, L, N, relativo))
+            if not len(i):
+                break
+        izquierda = fi * fe < 0
+        b = np.where(izquierda, xm, b)
+        a = np.where(izquierda, a, xm)
+        fi = np.where(izquierda, fi, fe)
+        xa = xm
+        xm = (a + b) / 2
+        N = N + 1
+        fe = f(xm, p)
+        E = _error(xm, xa, relativo)
+        salida.anotar(i, N, xm, fe, E)
+
+
+@np.errstate(all='ignore')
+def _regla_falsa(f, salida, i, a, b, p, T, L, relativo):
+    fi, fs = f(a, p), f(b, p)
+
+    en_a = fi == 0
+    en_b = ~en_a & (fs == 0)
+    for extremo, x, texto in ((en_a, a, 'inferior'), (en_b, b, 'superior')):
+        salida.retirar(i[extremo], x[extremo], 0.0, 0, np.nan, EXACTA,
+                       ['El límite %s %f es raíz de f(x)' % (texto, v) for v in x[extremo].tolist()])
+    inadecuado = ~en_a & ~en_b & (fi * fs > 0)
+    salida.mensaje[i[inadecuado]] = 'El intervalo proporcionado no es adecuado.'
+
+    activo = ~en_a & ~en_b & ~inadecuado
+    i, a, b, fi, fs, p, T, L, relativo = (v[activo] for v in (i, a, b, fi, fs, p, T, L, relativo))
+    xm = a - (fi * (b - a)) / (fs - fi)
+    fm = f(xm, p)
+    # Con una raíz exacta el error queda en 0, como en raices.py
+    E = np.where(fm == 0, 0.0, T + 1)
+    c = np.ones(len(i), dtype=int)
+    salida.anotar(i, c, xm, fm, E)
+
+    while len(i):
+        sigue = (E > T) & (c < L) & (fm != 0)
+        fin = ~sigue
+        if fin.any():
+            _cierre(salida, i[fin], xm[fin], fm[fin], c[fin], E[fin], T[fin], L[fin],
+                    lambda x, t, n: '%f es raíz exacta de f(x) en %d iteraciones' % (x, n),
+                    lambda x, t, n: '%f es una aproximación con tolerancia = %f en %d iteraciones' % (x, t, n))
+            i, a, b, fi, fs, fm, xm, p, T, L, c, relativo = (
+                v[sigue] for v in (i, a, b, fi, fs, fm, xm, p, T, L, c, relativo))
+            if not len(i):
+                break
+        izquierda = fm * fi < 0
+        b, fs = np.where(izquierda, xm, b), np.where(izquierda, fm, fs)
+        a, fi = np.where(izquierda, a, xm), np.where(izquierda, fi, fm)
+        anterior = xm
+        xm = a - (fi * (b - a)) / (fs - fi)
+        fm = f(xm, p)
+        E = np.where(fm == 0, 0.0, _error(xm, anterior, relativo))
+        c = c + 1
+        salida.anotar(i, c, xm, fm, E)
+
+
+@np.errstate(all='ignore')
+def _secante(f, salida, i, x0, xn, p, T, L, relativo):
+    f0, fe = f(x0, p), f(xn, p)
+    E = np.where(fe == 0, 0.0, T + 1)
+    c = np.zeros(len(i), dtype=int)
+    salida.anotar(i, 0, x0, f0, T + 1)
+    salida.anotar(i, 1, xn, fe, E)
+
+    while len(i):
+        sigue = (E > T) & (fe != 0) & (c < L)
+        fin = ~sigue
+        if fin.any():
+            _cierre(salida, i[fin], xn[fin], fe[fin], c[fin], E[fin], T[fin], L[fin],
+                    lambda x, t, n: '%f es raíz exacta de f(x)' % x,
+                    lambda x, t, n: '%f es una aproximación con tolerancia = %f' % (x, t))
+            i, x0, xn, f0, fe, p, T, L, c, relativo = (
+                v[sigue] for v in (i, x0, xn, f0, fe, p, T, L, c, relativo))
+            if not len(i):
+                break
+        xm = xn - ((fe * (xn - x0)) / (fe - f0))
+        f0 = fe
+        fe = f(xm, p)
+        E = np.where(fe == 0, 0.0, _error(xm, xn, relativo))
+        x0, xn = xn, xm
+        c = c + 1
+        salida.anotar(i, c + 1, xn, fe, E)
+
+
+# Método: (función por carriles, si el tipo de error se mide en forma relativa)
+METODOS = {
+    'biseccion': (_biseccion, lambda tipo: tipo == 'Cifras Significativas'),
+    'reglaFalsa': (_regla_falsa, lambda tipo: tipo != 'Decimales Correctos'),
+    'secante': (_secante, lambda tipo: tipo != 'Decimales Correctos'),
+}
+
+
+def _carriles(metodo, funciones, a, b, p, Tol, niter, tipo, historial=False):
+    if metodo not in METODOS:
+        raise ErrorMetodo(f"Método no disponible por lotes: '{metodo}'")
+    por_carril, relativo = METODOS[metodo]
+
+    try:
+        funciones, a, b, p, Tol, niter, tipo = np.broadcast_arrays(
+            np.asarray(funciones, dtype=object), np.asarray(a, dtype=float), np.asarray(b, dtype=float),
+            np.asarray(p, dtype=float), np.asarray(Tol, dtype=float), np.asarray(niter, dtype=int),
+            np.asarray(tipo, dtype=object))
+    except ValueError:
+        raise ErrorMetodo('Las listas de los problemas deben tener la misma longitud')
+    if funciones.ndim > 1:
+        raise ErrorMetodo('Cada dato debe ser un valor o una lista de valores')
+    funciones, a, b, p, Tol, niter, tipo = (np.atleast_1d(v).copy() for v in (funciones, a, b, p, Tol, niter, tipo))
+    relativo = np.array([relativo(t) for t in tipo.tolist()], dtype=bool)
+
+    salida = _Salida(len(funciones), historial)
+    # Los carriles con la misma función se evalúan en una sola llamada por iteración
+    for f_str in dict.fromkeys(funciones.tolist()):
+        i = np.flatnonzero(funciones == f_str)
+        por_carril(compilar_parametrica(f_str), salida, i, a[i], b[i], p[i], Tol[i], niter[i], relativo[i])
+    return salida, funciones, a, b, p
+
+
+def resolver(metodo, funciones, a, b, p, Tol, niter, tipo):
+    """Resuelve N problemas con el mismo método.
+
+    Cada argumento es un valor para todos los problemas o una lista con uno por
+    problema (a y b son los extremos, o x0 y x1 en la secante). Devuelve un
+    resumen, el número de problemas en cada estado y la tabla con una fila por
+    problema.
+    """
+    salida, funciones, a, b, p = _carriles(metodo, funciones, a, b, p, Tol, niter, tipo)
+
+    estados = {e: int(np.count_nonzero(salida.estado == e)) for e in (EXACTA, APROXIMACION, FRACASO, INADECUADO)}
+    resumen = '%d problemas: %d raíces exactas, %d aproximaciones, %d fracasos, %d intervalos inadecuados' % (
+        len(funciones), *estados.values())
+    tabla = tablas.tabla(**{
+        'Problema': np.arange(1, len(funciones) + 1),
+        'f': funciones.astype(str),
+        'a': a, 'b': b, 'p': p,
+        'Raiz': salida.raiz,
+        'f(Raiz)': salida.fraiz,
+        'Iteraciones': salida.iteraciones,
+        'Error': salida.error,
+        'Estado': salida.estado.astype(str),
+        'Mensaje': salida.mensaje.astype(str),
+    })
+    return resumen, estados, tabla
+
+
+def refinar(metodo, funciones, a, b, Tol, niter, tipo):
+    """Como resolver(), pero devuelve para cada problema (raíz, f(raíz), estado,
+    mensaje, tabla de iteraciones) en lugar del resumen.
+    """
+    salida, *_ = _carriles(metodo, funciones, a, b, 0.0, Tol, niter, tipo, historial=True)
+    return list(zip(salida.raiz.tolist(), salida.fraiz.tolist(), salida.estado.tolist(),
+                    salida.mensaje.tolist(), salida.tablas()))
@@ -0,0 +1,157 @@
+"""Todas las raíces de una función polinómica a la vez.
+
+Si el árbol de la función (app/numerico/expresiones.py) solo usa +, -, *, la
+división entre constantes y potencias enteras no negativas de x, sus
+coeficientes se obtienen recorriendo el árbol. Las raíces son los valores
+propios de la matriz compañera (np.roots): una sola descomposición de una
+matriz de n x n en lugar de una llamada iterativa por raíz.
+
+Una raíz de multiplicidad m aparece como m valores propios cercanos, separados
+del orden de eps^(1/m). Se agrupan y el grupo se acepta si las derivadas
+p, p', ..., p^(m-1) se anulan en su centro; el centro se pule con Newton sobre
+p^(m-1), donde la raíz es simple.
+"""
+import numpy as np
+from numpy.polynomial import polynomial as P
+
+from app import tablas
+from app.numerico import ErrorMetodo
+from app.numerico.expresiones import analizar, compilar_arbol
+
+# Grado máximo que se reconoce como polinomio
+MAX_GRADO = 200
+# Distancia relativa máxima entre los valores propios de una raíz múltiple
+RADIO_GRUPO = 1e-2
+# Distancia relativa del centro de un grupo a la raíz múltiple por debajo de la cual
+# p^(j) se anula (p^(j) cerca de una raíz de multiplicidad m va como distancia^(m-j))
+TOL_DERIVADAS = 1e-6
+
+
+def _coeficientes(nodo):
+    # Coeficientes de menor a mayor grado, o None si el nodo no es polinómico
+    tipo = nodo[0]
+    if tipo == 'num':
+        return np.array([nodo[1]])
+    if tipo == 'x':
+        return np.array([0.0, 1.0])
+    if tipo == 'p':
+        return None
+    if tipo == 'fun':
+        # sqrt(2), cos(pi), ...: solo si el argumento no depende de x
+        a = _coeficientes(nodo[2])
+        if a is None or len(P.polytrim(a)) > 1:
+            return None
+        return np.array([float(compilar_arbol(nodo)(0.0))])
+    if tipo == 'neg':
+        a = _coeficientes(nodo[1])
+        return None if a is None else -a
+    a, b = _coeficientes(nodo[1]), _coeficientes(nodo[2])
+    if a is None or b is None:
+        return None
+    if tipo == '+':
+        return P.polyadd(a, b)
+    if tipo == '-':
+        return P.polysub(a, b)
+    if tipo == '*':
+        return P.polymul(a, b)
+    b = P.polytrim(b)
+    if len(b) > 1:
+        return None
+    if tipo == '/':
+        return a / b[0] if b[0] != 0 else None
+    # Potencia: el exponente debe ser un entero no negativo
+    n = b[0]
+    if not (0 <= n <= MAX_GRADO and n == int(n)) or (len(P.polytrim(a)) - 1) * n > MAX_GRADO:
+        return None
+    return P.polypow(a, int(n))
+
+
+def coeficientes(f_str):
+    """Coeficientes de f de mayor a menor grado (como np.roots y polyval), o
+    None si f no es un polinomio en x."""
+    c = _coeficientes(analizar(f_str))
+    if c is None or not np.isfinite(c).all():
+        return None
+    return P.polytrim(c)[::-1]
+
+
+def _escala(c, z):
+    # Valor de p con los coeficientes y z en valor absoluto, para medir p(z) en forma relativa
+    return np.polyval(np.abs(c), abs(z))
+
+
+def _anula(derivadas, z, m):
+    # El redondeo de polyval no deja ver valores por debajo de ~grado * eps
+    redondeo = 10 * len(derivadas) * np.finfo(float).eps
+    return all(abs(np.polyval(derivadas[j], z))
+               <= max(TOL_DERIVADAS ** (m - j), redondeo) * _escala(derivadas[j], z) for j in range(m))
+
+
+def raices_con_multiplicidad(c):
+    """Raíces distintas del polinomio de coeficientes c (de mayor a menor grado)
+    y la multiplicidad de cada una."""
+    c = np.asarray(c, dtype=float)
+    grado = len(c) - 1
+    derivadas = [c]
+    for _ in range(grado):
+        derivadas.append(np.polyder(derivadas[-1]))
+
+    pendientes = list(np.roots(c).astype(complex))
+    raices, multiplicidades = [], []
+    while pendientes:
+        z = pendientes[0]
+        distancia = np.abs(np.asarray(pendientes) - z)
+        cercanos = np.argsort(distancia, kind='stable')
+        cercanos = cercanos[distancia[cercanos] <= RADIO_GRUPO * max(1.0, abs(z))]
+        # El grupo más grande cuyo centro anula las derivadas
+        for m in range(len(cercanos), 0, -1):
+            centro = np.mean([pendientes[k] for k in cercanos[:m]])
+            if m == 1 or _anula(derivadas, centro, m):
+                break
+        # Newton sobre p^(m-1), que tiene una raíz simple en el centro
+        for _ in range(3):
+            denominador = np.polyval(derivadas[m], centro)
+            if denominador == 0:
+                break
+            siguiente = centro - np.polyval(derivadas[m - 1], centro) / denominador
+            if not np.isfinite(siguiente) or abs(np.polyval(c, siguiente)) > abs(np.polyval(c, centro)):
+                break
+            centro = siguiente
+        # Partes real o imaginaria que solo son ruido del redondeo
+        cero = 1e-12 * max(1.0, abs(centro))
+        centro = complex(0.0 if abs(centro.real) <= cero else centro.real,
+                         0.0 if abs(centro.imag) <= cero else centro.imag)
+        raices.append(centro)
+        multiplicidades.append(m)
+        pendientes = [z for k, z in enumerate(pendientes) if k not in set(cercanos[:m].tolist())]
+
+    raices = np.asarray(raices, dtype=complex)
+    multiplicidades = np.asarray(multiplicidades, dtype=int)
+    orden = np.lexsort((raices.imag, raices.real))
+    return raices[orden], multiplicidades[orden]
+
+
+def raices_polinomio(f_str):
+    """Todas las raíces (reales y complejas) de f si es un polinomio.
+
+    Devuelve un resumen, los coeficientes de mayor a menor grado, las raíces
+    ([parte real, parte imaginaria]), sus multiplicidades y la tabla de raíces.
+    """
+    c = coeficientes(f_str)
+    if c is None:
+        raise ErrorMetodo(f"La función '{f_str}' no es un polinomio en x")
+    if len(c) == 1:
+        raise ErrorMetodo('La función es constante' + ('' if c[0] else ' (idénticamente 0)'))
+    raices, multiplicidades = raices_con_multiplicidad(c)
+    with np.errstate(all='ignore'):
+        valores = np.abs(np.polyval(c, raices))
+    resumen = 'Polinomio de grado %d: %d raíces distintas (%d reales)' % (
+        len(c) - 1, len(raices), np.count_nonzero(raices.imag == 0))
+    tabla = tablas.tabla(**{
+        'Raiz': np.arange(1, len(raices) + 1),
+        'Re': raices.real,
+        'Im': raices.imag,
+        'Multiplicidad': multiplicidades,
+        '|f(raiz)|': valores,
+    })
+    return resumen, c, np.column_stack([raices.real, raices.imag]), multiplicidades, tabla
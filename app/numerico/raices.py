@@ -0,0 +1,527 @@
+"""Métodos de la Sección 1: búsqueda de raíces de f(x) = 0.
+
+Traducción directa de biseccion.m, rf.m, secante.m, newton.m, pf.m y
+raices_multiples.m. Las tablas de iteraciones se devuelven en memoria (ver
+app/tablas.py). Newton y raíces múltiples usan las derivadas exactas de
+app/numerico/derivadas.py en lugar de diferencias finitas.
+
+brent() e illinois() no tienen archivo .m: son métodos de intervalo con
+convergencia superlineal que devuelven lo mismo que biseccion().
+"""
+import numpy as np
+
+from app import tablas
+from app.numerico import ErrorMetodo
+from app.numerico.derivadas import derivar
+from app.numerico.expresiones import compilar
+
+
+def _funcion(f_str, orden=0):
+    # Evaluar siempre en float64 para que las divisiones por cero den Inf/NaN como en MATLAB
+    f = derivar(f_str, orden) if orden else compilar(f_str)
+    return lambda x: np.float64(f(np.float64(x)))
+
+
+@np.errstate(all='ignore')
+def biseccion(f_str, xi, xs, Tol, niter, tipe):
+    f = _funcion(f_str)
+
+    # Evaluar la función en los extremos del intervalo
+    fi = f(xi)
+    fs = f(xs)
+
+    N_list, xn_list, fm, E = [], [], [], []
+
+    if fi == 0:
+        r = '%f es raíz de f(x)' % xi
+    elif fs == 0:
+        r = '%f es raíz de f(x)' % xs
+    elif fs * fi < 0:
+        N = 0
+        xm = (xi + xs) / 2
+        fm.append(f(xm))
+        fe = fm[0]
+        N_list.append(N)
+        xn_list.append(xm)
+        E.append(Tol + 1)
+        error = E[0]
+        while error > Tol and fe != 0 and N < niter:
+            if fi * fe < 0:
+                xs = xm
+                fs = f(xs)
+            else:
+                xi = xm
+                fi = f(xi)
+            xa = xm
+            xm = (xi + xs) / 2
+            N = N + 1
+            fm.append(f(xm))
+            fe = fm[-1]
+            N_list.append(N)
+            xn_list.append(xm)
+            if tipe == 'Cifras Significativas':
+                E.append(abs(xm - xa) / abs(xm))
+            else:
+                E.append(abs(xm - xa))
+            error = E[-1]
+        if fe == 0:
+            r = '%f es raíz de f(x)' % xm
+        elif error < Tol:
+            r = '%f es una aproximación de una raíz de f(x) con una tolerancia = %f' % (xm, Tol)
+        else:
+            r = 'Fracasó en %d iteraciones' % niter
+    else:
+        r = 'El intervalo es inadecuado'
+
+    tabla = tablas.tabla(Iteration=N_list, xn=xn_list, fxn=fm, E=E)
+    return r, N_list, xn_list, fm, E, tabla
+
+
+def _pasos_brent(f, a, b, fa, fb, Tol, relativo):
+    # Método de Brent (como zbrent de Numerical Recipes): interpolación cuadrática
+    # inversa o secante mientras reduzcan el intervalo lo suficiente, si no bisección
+    c, fc = b, fb
+    d = e = b - a
+    while True:
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol1 = 2 * np.finfo(float).eps * abs(b) + 0.5 * Tol * (abs(b) if relativo else 1)
+        xm = 0.5 * (c - b)
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2 * xm * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * xm * q - abs(tol1 * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = xm
+        else:
+            d = e = xm
+        a, fa = b, fb
+        b = b + d if abs(d) > tol1 else b + np.copysign(tol1, xm)
+        fb = f(b)
+        # La raíz queda entre b y el extremo con el signo contrario
+        yield b, fb, abs((a if fb * fc > 0 else c) - b)
+
+
+def _pasos_illinois(f, a, b, fa, fb, Tol, relativo):
+    # Regla falsa de Illinois: si el mismo extremo se conserva dos veces seguidas,
+    # su valor de f se divide a la mitad para que la regla falsa no se estanque
+    lado = 0
+    while True:
+        c = (a * fb - b * fa) / (fb - fa)
+        fc = f(c)
+        if fc * fb > 0:
+            b, fb = c, fc
+            if lado == -1:
+                fa = fa / 2
+            lado = -1
+        elif fa * fc > 0:
+            a, fa = c, fc
+            if lado == 1:
+                fb = fb / 2
+            lado = 1
+        yield c, fc, abs(b - a)
+
+
+def _intervalo(pasos, f_str, xi, xs, Tol, niter, tipe):
+    # Mismas comprobaciones, reglas de parada, mensajes y tabla que biseccion().
+    # Como en bisección, el error es el ancho del intervalo que encierra la raíz
+    f = _funcion(f_str)
+    fi = f(xi)
+    fs = f(xs)
+    relativo = tipe == 'Cifras Significativas'
+
+    N_list, xn_list, fm, E = [], [], [], []
+
+    if fi == 0:
+        r = '%f es raíz de f(x)' % xi
+    elif fs == 0:
+        r = '%f es raíz de f(x)' % xs
+    elif fs * fi < 0:
+        estimaciones = pasos(f, xi, xs, fi, fs, Tol, relativo)
+        N = 0
+        xm, fe, _ = next(estimaciones)
+        N_list.append(N)
+        xn_list.append(xm)
+        fm.append(fe)
+        E.append(Tol + 1)
+        error = E[0]
+        while error > Tol and fe != 0 and N < niter:
+            xm, fe, ancho = next(estimaciones)
+            N = N + 1
+            N_list.append(N)
+            xn_list.append(xm)
+            fm.append(fe)
+            if relativo:
+                E.append(ancho / abs(xm))
+            else:
+                E.append(ancho)
+            error = E[-1]
+        if fe == 0:
+            r = '%f es raíz de f(x)' % xm
+        elif error < Tol:
+            r = '%f es una aproximación de una raíz de f(x) con una tolerancia = %f' % (xm, Tol)
+        else:
+            r = 'Fracasó en %d iteraciones' % niter
+    else:
+        r = 'El intervalo es inadecuado'
+
+    tabla = tablas.tabla(Iteration=N_list, xn=xn_list, fxn=fm, E=E)
+    return r, N_list, xn_list, fm, E, tabla
+
+
+@np.errstate(all='ignore')
+def brent(f_str, xi, xs, Tol, niter, tipe):
+    """Método de Brent en [xi, xs]; devuelve lo mismo que biseccion()."""
+    return _intervalo(_pasos_brent, f_str, xi, xs, Tol, niter, tipe)
+
+
+@np.errstate(all='ignore')
+def illinois(f_str, xi, xs, Tol, niter, tipe):
+    """Regla falsa de Illinois en [xi, xs]; devuelve lo mismo que biseccion()."""
+    return _intervalo(_pasos_illinois, f_str, xi, xs, Tol, niter, tipe)
+
+
+@np.errstate(all='ignore')
+def regla_falsa(func, x0, x1, Tol, niter, Terror):
+    f = _funcion(func)
+    vacia = tablas.tabla(n=[], x_m=[], x_i=[], x_s=[], f_m=[], f_i=[], f_s=[], E=[])
+
+    xi, xs = [x0], [x1]
+    fi, fs = [f(x0)], [f(x1)]
+
+    # Verificar raíces inmediatas
+    if fi[0] == 0:
+        return 'El límite inferior %f es raíz de f(x)' % x0, vacia
+    elif fs[0] == 0:
+        return 'El límite superior %f es raíz de f(x)' % x1, vacia
+    elif fi[0] * fs[0] > 0:
+        return 'El intervalo proporcionado no es adecuado.', vacia
+
+    # Iteración inicial
+    xm = [xi[0] - (fi[0] * (xs[0] - xi[0])) / (fs[0] - fi[0])]
+    fm = [f(xm[0])]
+    E = [Tol + 1]
+    c = 1
+
+    while E[-1] > Tol and c < niter:
+        if fm[-1] == 0:
+            break
+        elif fm[-1] * fi[-1] < 0:
+            xs.append(xm[-1])
+            fs.append(fm[-1])
+            xi.append(xi[-1])
+            fi.append(fi[-1])
+        else:
+            xi.append(xm[-1])
+            fi.append(fm[-1])
+            xs.append(xs[-1])
+            fs.append(fs[-1])
+
+        xm.append(xi[-1] - (fi[-1] * (xs[-1] - xi[-1])) / (fs[-1] - fi[-1]))
+        fm.append(f(xm[-1]))
+        if Terror == 'Decimales Correctos':
+            E.append(abs(xm[-1] - xm[-2]))
+        else:
+            E.append(abs((xm[-1] - xm[-2]) / xm[-1]))
+        c = c + 1
+
+    if fm[-1] == 0:
+        respuesta = '%f es raíz exacta de f(x) en %d iteraciones' % (xm[-1], c)
+        E[-1] = 0
+    elif E[-1] < Tol:
+        respuesta = '%f es una aproximación con tolerancia = %f en %d iteraciones' % (xm[-1], Tol, c)
+    else:
+        respuesta = 'Fracasó en %d iteraciones' % niter
+
+    tabla = tablas.tabla(n=range(1, c + 1), x_m=xm, x_i=xi, x_s=xs, f_m=fm, f_i=fi, f_s=fs, E=E)
+    return respuesta, tabla
+
+
+@np.errstate(all='ignore')
+def secante(func, x0, x1, Tol, niter, Terror):
+    f = _funcion(func)
+    c = 0
+
+    # Evaluar la función en los puntos iniciales
+    fm = [f(x0), f(x1)]
+    f0 = fm[0]
+    fe = fm[1]
+    E = [Tol + 1, Tol + 1]
+    xn = x1
+    N = [0, 1]
+    XN = [x0, xn]
+
+    while E[-1] > Tol and fe != 0 and c < niter:
+        xm = xn - ((fe * (xn - x0)) / (fe - f0))
+        XN.append(xm)
+
+        f0 = fe
+        fm.append(f(xm))
+        fe = fm[-1]
+
+        if Terror == 'Decimales Correctos':
+            E.append(abs(xm - xn))
+        else:
+            E.append(abs((xm - xn) / xm))
+
+        x0 = xn
+        xn = xm
+        N.append(c + 2)
+        c = c + 1
+
+    if fe == 0:
+        respuesta = '%f es raíz exacta de f(x)' % xn
+        E[-1] = 0
+    elif E[-1] < Tol:
+        respuesta = '%f es una aproximación con tolerancia = %f' % (xn, Tol)
+    else:
+        respuesta = 'Fracasó en %d iteraciones' % niter
+
+    tabla = tablas.tabla(Iteration=N, xn=XN, fxn=fm, Error=E)
+    return respuesta, N, XN, fm, E, tabla
+
+
+def _pasos_newton(f, df, x0, Tol, niter, et):
+    # Genera (iteración, xn, f(xn), f'(xn), error) a medida que se calculan
+    c = 0
+    fe, dfe = f(x0), df(x0)
+    error = Tol + 1
+    while error > Tol and c < niter:
+        with np.errstate(all='ignore'):
+            x1 = x0 - fe / dfe
+            fe = f(x1)
+            dfe = df(x1)
+
+            if dfe == 0:
+                raise ErrorMetodo('La derivada se anuló, posible raíz múltiple o estancamiento.')
+
+            if et == 'Error Absoluto':
+                error = abs(x1 - x0)
+            else:
+                error = abs(x1 - x0) / abs(x1)
+
+        x0 = x1
+        c = c + 1
+        yield c, x1, fe, dfe, error
+
+
+@np.errstate(all='ignore')
+def newton(f_str, x0, Tol, niter, et):
+    f = _funcion(f_str)
+    df = _funcion(f_str, 1)  # Derivada exacta
+
+    c = 0
+    fm = [f(x0)]
+    fe = fm[0]
+    dfm = [df(x0)]
+    E = [Tol + 1]
+    error = E[0]
+    xn = [x0]
+    N = [c]
+
+    for c, x0, fe, dfe, error in _pasos_newton(f, df, x0, Tol, niter, et):
+        xn.append(x0)
+        fm.append(fe)
+        dfm.append(dfe)
+        E.append(error)
+        N.append(c)
+
+    if fe == 0:
+        r = '%f es raíz de f(x)' % x0
+    elif error < Tol:
+        r = '%f es una aproximación de una raíz de f(x) con una tolerancia = %f' % (x0, Tol)
+    else:
+        r = 'Fracasó en %f iteraciones' % niter
+
+    tabla = tablas.tabla(Iteration=N, xn=xn, fxn=fm, dfxn=dfm, Error=E)
+    return r, N, xn, fm, dfm, E, c, tabla
+
+
+def iteraciones_newton(f_str, x0, Tol, niter, et):
+    """Genera las iteraciones de Newton como filas {'N', 'xn', 'fxn', 'dfxn', 'E'}.
+
+    Cerrar el generador detiene el método.
+    """
+    f = _funcion(f_str)
+    df = _funcion(f_str, 1)
+    for c, x, fe, dfe, error in _pasos_newton(f, df, x0, Tol, niter, et):
+        yield {'N': c, 'xn': float(x), 'fxn': float(fe), 'dfxn': float(dfe), 'E': float(error)}
+
+
+# Aceleraciones de punto fijo: nombre que se muestra en la columna Paso
+ACELERACIONES = {'aitken': 'Aitken', 'steffensen': 'Steffensen'}
+
+
+@np.errstate(all='ignore')
+def punto_fijo(f_str, g_str, x0, Tol, niter, tipe, aceleracion=None):
+    """Punto fijo x = g(x) como pf.m.
+
+    Con aceleracion = 'aitken' cada paso de g va seguido del Δ² de Aitken de
+    los tres últimos valores de la sucesión; con 'steffensen' la sucesión se
+    reinicia desde ese valor cada dos pasos de g. La tabla marca en la columna
+    Paso qué filas son aceleradas.
+    """
+    if aceleracion:
+        return _punto_fijo_acelerado(f_str, g_str, x0, Tol, niter, tipe, aceleracion)
+    f = _funcion(f_str)
+    g = _funcion(g_str)
+
+    c = 0
+    xn = [x0]
+    fm = [f(x0)]
+    fe = fm[0]
+    E = [Tol + 1]
+    error = E[0]
+    N = [c]
+
+    while error > Tol and fe != 0 and c < niter:
+        xn.append(g(x0))
+        fm.append(f(xn[-1]))
+        fe = fm[-1]
+
+        if tipe == 'Cifras Significativas':
+            E.append(abs(xn[-1] - x0) / abs(xn[-1]))
+        else:
+            E.append(abs(xn[-1] - x0))
+
+        error = E[-1]
+        x0 = xn[-1]
+        N.append(c + 1)
+        c = c + 1
+
+    if fe == 0:
+        r = '%f es raíz de f(x)\n' % x0
+    elif error < Tol:
+        r = '%f es una aproximación de una raíz de f(x) con una tolerancia= %f\n' % (x0, Tol)
+    else:
+        r = 'Fracasó en %f iteraciones\n' % niter
+
+    tabla = tablas.tabla(Iteration=N, xn=xn, fxn=fm, E=E)
+    return r, N, xn, fm, E, tabla
+
+
+@np.errstate(all='ignore')
+def _punto_fijo_acelerado(f_str, g_str, x0, Tol, niter, tipe, aceleracion):
+    if aceleracion not in ACELERACIONES:
+        raise ErrorMetodo('Aceleración no reconocida: %s' % aceleracion)
+    f = _funcion(f_str)
+    g = _funcion(g_str)
+
+    def medir(nuevo, anterior):
+        if tipe == 'Cifras Significativas':
+            return abs(nuevo - anterior) / abs(nuevo)
+        return abs(nuevo - anterior)
+
+    # c cuenta las evaluaciones de g; una fila acelerada lleva el número del paso que la produjo
+    c = 0
+    N, xn, fm, E, pasos = [c], [x0], [f(x0)], [Tol + 1], ['Inicial']
+    sucesion = [x0]
+    acelerado = None
+
+    while E[-1] > Tol and fm[-1] != 0 and c < niter:
+        x = g(sucesion[-1])
+        c = c + 1
+        N.append(c)
+        xn.append(x)
+        fm.append(f(x))
+        E.append(medir(x, sucesion[-1]))
+        pasos.append('g(x)')
+        sucesion.append(x)
+        if E[-1] <= Tol or fm[-1] == 0 or len(sucesion) < 3:
+            continue
+
+        # Δ² de Aitken con los tres últimos valores de la sucesión
+        a, b, x = sucesion[-3:]
+        denominador = x - 2 * b + a
+        xa = a - (b - a) ** 2 / denominador if denominador != 0 and np.isfinite(denominador) else x
+        if aceleracion == 'steffensen':
+            # Steffensen compara con el punto donde empezó el ciclo y reinicia desde xa
+            anterior = a
+            sucesion = [xa]
+        else:
+            anterior = x if acelerado is None else acelerado
+        acelerado = xa
+        N.append(c)
+        xn.append(xa)
+        fm.append(f(xa))
+        E.append(medir(xa, anterior))
+        pasos.append(ACELERACIONES[aceleracion])
+
+    x0, fe, error = xn[-1], fm[-1], E[-1]
+    if fe == 0:
+        r = '%f es raíz de f(x)\n' % x0
+    elif error < Tol:
+        r = '%f es una aproximación de una raíz de f(x) con una tolerancia= %f\n' % (x0, Tol)
+    else:
+        r = 'Fracasó en %f iteraciones\n' % niter
+
+    tabla = tablas.tabla(Iteration=N, xn=xn, fxn=fm, E=E, Paso=pasos)
+    return r, N, xn, fm, E, tabla
+
+
+@np.errstate(all='ignore')
+def raices_multiples(fn_str, xi, tol, k, et):
+    if et not in ('Decimales Correctos', 'Cifras Significativas'):
+        raise ErrorMetodo('El tipo de error no es valido')
+
+    fn = _funcion(fn_str)
+    dfn = _funcion(fn_str, 1)  # Primera derivada exacta
+    ddfn = _funcion(fn_str, 2)  # Segunda derivada exacta
+
+    errores = []
+    xis = [xi]
+    error = tol + 1
+    n = 0
+
+    while error > tol and n < k:
+        fxi = fn(xi)
+        fxi_1 = dfn(xi)
+        fxi_2 = ddfn(xi)
+
+        if fxi == 0:
+            errores.append(0)
+            break
+
+        xi_1 = xi - (fxi * fxi_1) / (fxi_1 ** 2 - fxi * fxi_2)
+
+        if et == 'Decimales Correctos':
+            error = abs(xi_1 - xi)
+        else:
+            error = abs(xi_1 - xi) / abs(xi_1)
+
+        errores.append(error)
+        xis.append(xi_1)
+        xi = xi_1
+        n = n + 1
+
+    # Rellenar con NaN si falta un error
+    if len(errores) < len(xis):
+        errores.append(np.nan)
+
+    if fn(xi) == 0:
+        resultado = '%f es raíz de f(x)\n' % xi
+    elif error < tol:
+        resultado = '%f es una aproximación de una raíz de f(x) con una tolerancia = %f\n' % (xi, tol)
+    else:
+        resultado = 'Fracasó en %d iteraciones\n' % k
+
+    tabla = tablas.tabla(**{
+        'Iteración': np.arange(1, len(xis) + 1),
+        'xi': xis,
+        'f(xi)': [fn(v) for v in xis],
+        'Error': errores,
+    })
+    return xi, errores, resultado, tabla
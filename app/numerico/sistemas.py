@@ -0,0 +1,488 @@
+"""Métodos de la Sección 2: sistemas de ecuaciones lineales Ax = b.
+
+Traducción de jacobi.m, gaussSeidel.m y SOR.m. A, b y x0 pueden llegar como
+texto con sintaxis de MATLAB ('[4 -1; -1 4]'), como arreglos de NumPy o, para
+A, como matriz dispersa (ver dispersa()). Cada iteración solo hace productos
+matriz-vector y una sustitución hacia adelante sobre la parte triangular
+inferior de A, así con matrices dispersas el costo por iteración es O(nnz).
+
+Con sistemas grandes no se guardan todas las iteraciones: por encima de
+MAX_HISTORIAL incógnitas solo se devuelve la última.
+
+El radio espectral de la matriz de iteración T se calcula una sola vez por
+solución (con eig en sistemas pequeños y con el método de la potencia en los
+grandes), se guarda por (A, w) en cache.radios y se puede omitir.
+
+barrido_sor() prueba SOR con varios w en paralelo para elegir el factor de
+relajación con menos iteraciones.
+"""
+import atexit
+import functools
+import json
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from app import cache, tablas
+from app.numerico import ErrorMetodo
+from app.numerico.expresiones import compilar
+
+try:
+    import scipy.io
+    import scipy.linalg
+    import scipy.sparse
+    import scipy.sparse.linalg
+except ImportError:  # SciPy es opcional: sin él solo hay matrices densas
+    scipy = None
+
+# Número máximo de incógnitas para guardar el vector de cada iteración
+MAX_HISTORIAL = 100
+
+
+# Lectura de A, b y x0
+
+def _numero(texto):
+    try:
+        return float(texto)
+    except ValueError:
+        # Entradas como 1/3 o pi
+        return float(compilar(texto)(0.0))
+
+
+def leer(valor):
+    """Convierte una matriz o vector de MATLAB ('[1 2; 3 4]') en un arreglo 2D."""
+    if not isinstance(valor, str):
+        return np.atleast_2d(np.asarray(valor, dtype=float))
+    texto = valor.strip()
+    if texto.startswith('{'):
+        return dispersa(json.loads(texto))
+    texto = texto.strip('[]')
+    filas = [fila.replace(',', ' ').split() for fila in texto.replace('\n', ';').split(';')]
+    filas = [fila for fila in filas if fila]
+    if not filas or len({len(fila) for fila in filas}) != 1:
+        raise ErrorMetodo(f"La matriz '{valor}' no tiene una sintaxis válida")
+    return np.array([[_numero(v) for v in fila] for fila in filas])
+
+
+def es_dispersa(A):
+    return scipy is not None and scipy.sparse.issparse(A)
+
+
+def dispersa(valor):
+    """Matriz dispersa CSR a partir de:
+
+    - una matriz de scipy.sparse,
+    - un diccionario COO {'formato': 'coo', 'forma': [m, n], 'filas': [...],
+      'columnas': [...], 'valores': [...]},
+    - un diccionario CSR {'formato': 'csr', 'forma': [m, n], 'indptr': [...],
+      'indices': [...], 'valores': [...]},
+    - un archivo Matrix Market (.mtx) abierto o su ruta.
+    """
+    if scipy is None:
+        raise ErrorMetodo('Las matrices dispersas necesitan el paquete scipy')
+    if scipy.sparse.issparse(valor):
+        return scipy.sparse.csr_matrix(valor, dtype=float)
+    if isinstance(valor, dict):
+        formato = valor.get('formato', 'coo').lower()
+        forma = tuple(valor['forma']) if 'forma' in valor else None
+        if formato == 'coo':
+            matriz = scipy.sparse.coo_matrix((valor['valores'], (valor['filas'], valor['columnas'])), shape=forma)
+        elif formato == 'csr':
+            matriz = scipy.sparse.csr_matrix((valor['valores'], valor['indices'], valor['indptr']), shape=forma)
+        else:
+            raise ErrorMetodo(f"Formato de matriz dispersa no reconocido: '{formato}'")
+        return scipy.sparse.csr_matrix(matriz, dtype=float)
+    try:
+        matriz = scipy.io.mmread(valor)
+    except (ValueError, OSError) as error:
+        raise ErrorMetodo(f'El archivo no es una matriz Matrix Market válida: {error}')
+    if scipy.sparse.issparse(matriz):
+        return scipy.sparse.csr_matrix(matriz, dtype=float)
+    return np.atleast_2d(np.asarray(matriz, dtype=float))
+
+
+def _vector(valor, n=None):
+    if es_dispersa(valor):
+        valor = valor.toarray()
+    v = leer(valor).ravel()
+    if n is not None and len(v) != n:
+        raise ErrorMetodo(f'El vector tiene {len(v)} elementos y el sistema {n} incógnitas')
+    return v
+
+
+def _sistema(x0, A, b):
+    A = leer(A) if not es_dispersa(A) else A
+    n = A.shape[0]
+    if A.shape[1] != n:
+        raise ErrorMetodo('La matriz A debe ser cuadrada')
+    b = _vector(b, n)
+    x0 = np.zeros(n) if x0 is None else _vector(x0, n)
+    return x0, A, b
+
+
+# Partes de A (A = D - L - U como en los archivos .m)
+
+def _diagonal(A):
+    return A.diagonal() if es_dispersa(A) else np.diag(A).copy()
+
+
+def _inferior(A, k=0):
+    return scipy.sparse.tril(A, k, format='csr') if es_dispersa(A) else np.tril(A, k)
+
+
+def _superior(A, k=1):
+    return scipy.sparse.triu(A, k, format='csr') if es_dispersa(A) else np.triu(A, k)
+
+
+def _triangular_inferior(M, y):
+    # Sustitución hacia adelante: resuelve M x = y con M triangular inferior
+    if es_dispersa(M):
+        return scipy.sparse.linalg.spsolve_triangular(M, y, lower=True)
+    if scipy is not None:
+        return scipy.linalg.solve_triangular(M, y, lower=True)
+    x = np.empty_like(y)
+    for i in range(len(y)):
+        x[i] = (y[i] - M[i, :i] @ x[:i]) / M[i, i]
+    return x
+
+
+def _potencia(T, n, maximo=300, tol=1e-7):
+    """Radio espectral de T (dada como función v -> T v) por el método de la potencia.
+
+    Se promedia el crecimiento de los últimos pasos (fórmula de Gelfand), así
+    la estimación también converge cuando el valor propio dominante es complejo.
+    """
+    v = np.random.default_rng(0).standard_normal(n)
+    v /= np.linalg.norm(v)
+    logaritmos = []
+    anterior = None
+    for k in range(1, maximo + 1):
+        v = T(v)
+        crecimiento = np.linalg.norm(v)
+        if crecimiento == 0 or not np.isfinite(crecimiento):
+            return crecimiento
+        logaritmos.append(np.log(crecimiento))
+        v /= crecimiento
+        if k % 20 == 0:
+            estimado = np.exp(np.mean(logaritmos[k // 2:]))
+            if anterior is not None and abs(estimado - anterior) <= tol * max(estimado, 1):
+                break
+            anterior = estimado
+    return np.exp(np.mean(logaritmos[len(logaritmos) // 2:]))
+
+
+def radio_espectral(metodo, A, T, T_densa, w=None):
+    """Radio espectral de la matriz de iteración, guardado por (método, A, w).
+
+    T aplica la matriz de iteración a un vector y T_densa() la arma completa;
+    esta última solo se usa en sistemas densos pequeños, donde eig es exacto.
+    Devuelve el valor y si es una estimación del método de la potencia.
+    """
+    llave = cache.clave('radio', metodo, A, w)
+    guardado = cache.radios.obtener(metodo, llave)
+    if guardado is None:
+        n = A.shape[0]
+        if not es_dispersa(A) and n <= MAX_HISTORIAL:
+            guardado = (float(np.max(np.abs(np.linalg.eigvals(T_densa())))), False)
+        else:
+            guardado = (float(_potencia(T, n)), True)
+        cache.radios.guardar(metodo, llave, guardado)
+    return guardado
+
+
+def _error(x1, x0, absoluto):
+    if absoluto:
+        return np.linalg.norm(x1 - x0, np.inf)
+    return np.linalg.norm((x1 - x0) / x1, np.inf)
+
+
+def _absoluto(tipo):
+    # Los formularios envían 'Decimales Correctos' / 'Cifras Significativas'
+    return tipo in ('Error Absoluto', 'Decimales Correctos')
+
+
+def mat2str(x):
+    """Igual que mat2str de MATLAB para un vector columna."""
+    valores = ['%.15g' % v for v in x]
+    return valores[0] if len(valores) == 1 else '[' + ';'.join(valores) + ']'
+
+
+def _solucion(x):
+    # El vector completo solo para sistemas pequeños; en los grandes basta el tamaño
+    return mat2str(x) if len(x) <= MAX_HISTORIAL else '[vector de %d elementos]' % len(x)
+
+
+def _radio_texto(plantilla, radio):
+    if radio is None:
+        return 'Radio espectral no calculado'
+    valor, estimado = radio
+    texto = plantilla % valor
+    if estimado:
+        # Conservar el salto de línea final de los mensajes de MATLAB
+        sin_salto = texto.rstrip('\n')
+        texto = sin_salto + ' (estimado con el método de la potencia)' + texto[len(sin_salto):]
+    return texto
+
+
+def _pasos(x0, paso, Tol, niter, absoluto):
+    # Ciclo común: x1 = paso(x0) hasta alcanzar la tolerancia o niter
+    c = 0
+    error = Tol + 1
+    while error > Tol and c < niter:
+        # errstate dentro del ciclo: un generador no conserva el del decorador entre pasos
+        with np.errstate(all='ignore'):
+            x1 = paso(x0)
+            error = _error(x1, x0, absoluto)
+        x0 = x1
+        c = c + 1
+        yield c, x1, error
+
+
+@np.errstate(all='ignore')
+def _iterar(x0, paso, Tol, niter, absoluto, historial):
+    N, E, xs = [], [], []
+    c, x1, error = 0, x0, Tol + 1
+    for c, x1, error in _pasos(x0, paso, Tol, niter, absoluto):
+        E.append(error)
+        if historial:
+            xs.append(x1)
+        N.append(c)
+    if not historial:
+        xs = [x1]
+    return N, E, xs, error, c
+
+
+def _paso_jacobi(A, b):
+    # x1 = inv(D)*(L + U)*x0 + inv(D)*b sin formar inv(D): una sola pasada por A
+    d = _diagonal(A)
+    return lambda x: x + (b - A @ x) / d
+
+
+def _paso_gauss_seidel(A, b):
+    # (D - L)*x1 = U*x0 + b, con D - L la parte triangular inferior de A
+    DL = _inferior(A)
+    U = _superior(A)
+    return lambda x: _triangular_inferior(DL, b - U @ x)
+
+
+def _paso_sor(A, b, w):
+    d, M, U, T = _particion_sor(A, w)
+    C = _triangular_inferior(M, w * b)
+    return lambda x: T(x) + C
+
+
+@np.errstate(all='ignore')
+def jacobi(x0, A, b, Tol, niter, error_type, radio=True):
+    x0, A, b = _sistema(x0, A, b)
+    historial = len(b) <= MAX_HISTORIAL
+    N, E, xi, error, c = _iterar(x0, _paso_jacobi(A, b), Tol, niter, _absoluto(error_type), historial)
+
+    valor = None
+    if radio:
+        # T = inv(D)*(L + U) = I - inv(D)*A
+        d = _diagonal(A)
+        valor = radio_espectral('jacobi', A, lambda v: v - (A @ v) / d,
+                                lambda: np.eye(len(b)) - A / d[:, None])
+    Re = _radio_texto('Radio espectral: %f', valor)
+
+    if error < Tol:
+        r = '%s Es una aproximación de la solución del sistema con una tolerancia= %f\n' % (_solucion(xi[-1]), Tol)
+    else:
+        r = 'Fracasó en %f iteraciones\n' % niter
+
+    columnas = {'Iteration': N, 'E': E}
+    if historial:
+        for i, valores in enumerate(zip(*xi)):
+            columnas[f'x{i + 1}'] = valores
+    return r, N, [x.tolist() for x in xi], E, Re, tablas.tabla(**columnas)
+
+
+@np.errstate(all='ignore')
+def gauss_seidel(x0, A, b, et, Tol, niter, radio=True):
+    x0, A, b = _sistema(x0, A, b)
+    historial = len(b) <= MAX_HISTORIAL
+    N, E, xs, error, c = _iterar(x0, _paso_gauss_seidel(A, b), Tol, niter, _absoluto(et), historial)
+    xn = [mat2str(x) for x in xs] if historial else [_solucion(xs[-1])]
+
+    valor = None
+    if radio:
+        # T = inv(D - L)*U
+        DL, U = _inferior(A), _superior(A)
+        valor = radio_espectral('gauss_seidel', A, lambda v: -_triangular_inferior(DL, U @ v),
+                                lambda: -np.linalg.solve(DL, U))
+    re = _radio_texto('Radio espectral de T= %f\n', valor)
+
+    if error < Tol:
+        r = '%s Es una aproximación de la solución del sistema con una tolerancia= %f\n' % (xn[-1], Tol)
+    else:
+        r = 'Fracasó en %f iteraciones\n' % niter
+
+    columnas = {'Iteration': N, 'E': E}
+    if historial:
+        columnas = {'Iteration': N, 'xn': xn, 'E': E}
+    return r, N, xn, E, re, c, tablas.tabla(**columnas)
+
+
+def _particion_sor(A, w):
+    # (D - w*L)*x1 = ((1 - w)*D + w*U)*x0 + w*b, con L = -tril(A, -1) y U = -triu(A, 1)
+    d = _diagonal(A)
+    M = _inferior(A, -1) * w
+    M = M + (scipy.sparse.diags(d, format='csr') if es_dispersa(A) else np.diag(d))
+    U = _superior(A)
+    T = lambda v: _triangular_inferior(M, (1 - w) * d * v - w * (U @ v))
+    return d, M, U, T
+
+
+@np.errstate(all='ignore')
+def radio_sor(A, w):
+    """Radio espectral de T = inv(D - w*L)*((1 - w)*D + w*U), como radio_espectral."""
+    d, M, U, T = _particion_sor(A, w)
+    return radio_espectral('sor', A, T, lambda: np.linalg.solve(M, np.diag((1 - w) * d) - w * U), w)
+
+
+@np.errstate(all='ignore')
+def sor(x0, A, b, Tol, niter, w, tipe, radio=True):
+    x0, A, b = _sistema(x0, A, b)
+    historial = len(b) <= MAX_HISTORIAL
+    n, E, xi, error, c = _iterar(x0, _paso_sor(A, b, w), Tol, niter, tipe != 'Cifras Significativas', historial)
+
+    radio = _radio_texto('El radio espectral es de %f', radio_sor(A, w) if radio else None)
+
+    if error < Tol:
+        r = 'es una aproximación de la solución del sistema con una tolerancia= %f\n' % Tol
+    else:
+        r = 'Fracasó en %d iteraciones\n' % niter
+
+    columnas = {'N': n}
+    if historial:
+        for i, valores in enumerate(zip(*xi)):
+            columnas[f'xi_{i + 1}'] = valores
+    columnas['E'] = E
+    return r, n, [x.tolist() for x in xi], E, radio, tablas.tabla(**columnas)
+
+
+def iteraciones(metodo, x0, A, b, Tol, niter, tipo, w=None):
+    """Genera las iteraciones de 'jacobi', 'gauss_seidel' o 'sor' a medida que se calculan.
+
+    Cada fila es {'N': iteración, 'x': vector (None si el sistema tiene más de
+    MAX_HISTORIAL incógnitas), 'E': error}. Cerrar el generador detiene el método.
+    """
+    x0, A, b = _sistema(x0, A, b)
+    if metodo == 'jacobi':
+        paso, absoluto = _paso_jacobi(A, b), _absoluto(tipo)
+    elif metodo == 'gauss_seidel':
+        paso, absoluto = _paso_gauss_seidel(A, b), _absoluto(tipo)
+    elif metodo == 'sor':
+        paso, absoluto = _paso_sor(A, b, w), tipo != 'Cifras Significativas'
+    else:
+        raise ErrorMetodo(f"Método no reconocido: '{metodo}'")
+    historial = len(b) <= MAX_HISTORIAL
+    for c, x, error in _pasos(x0, paso, Tol, niter, absoluto):
+        yield {'N': c, 'x': x.tolist() if historial else None, 'E': float(error)}
+
+
+# Barrido del factor de relajación de SOR
+
+# Procesos del barrido, compartidos por todas las peticiones. Se crean con el
+# primer barrido usando 'spawn': un fork copiaría los hilos del servidor y los
+# candados que tengan tomados
+_pool = None
+_candado_pool = threading.Lock()
+
+
+def _pool_barrido(procesos):
+    global _pool
+    with _candado_pool:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context('spawn'))
+            atexit.register(_pool.shutdown, cancel_futures=True)
+        return _pool
+
+
+def _descartar_pool(pool):
+    # Un proceso murió: el siguiente barrido crea un pool nuevo
+    global _pool
+    with _candado_pool:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@functools.lru_cache(maxsize=1)
+def _sistema_guardado(ruta):
+    # Cada proceso lee el sistema del barrido una sola vez, no uno por cada w
+    with open(ruta, 'rb') as archivo:
+        return pickle.load(archivo)
+
+
+def _probar_w(ruta, w):
+    # Se ejecuta en un proceso del pool: salida de SOR y radio espectral para un w
+    x0, A, b, Tol, niter, tipe = _sistema_guardado(ruta)
+    radio = radio_sor(A, w)
+    r, n, xi, E, _, tabla = sor(x0, A, b, Tol, niter, w, tipe, radio=False)
+    converge = bool(E) and bool(E[-1] < Tol)
+    salida = (r, n, xi, E, _radio_texto('El radio espectral es de %f', radio), tabla)
+    return float(w), len(n), converge, radio, salida
+
+
+def _orden(fila):
+    # Primero los que convergen, luego menos iteraciones y luego menor radio espectral
+    return not fila[2], fila[1], fila[3][0], fila[0]
+
+
+def barrido_sor(x0, A, b, Tol, niter, tipe, puntos=19, refinamiento=8, procesos=None):
+    """Ejecuta SOR con los mismos A, b y x0 para una malla de w en (0, 2).
+
+    Cada w corre en un proceso distinto. Después de la malla de `puntos` valores
+    se prueban `refinamiento` valores más entre los vecinos del mejor w. Devuelve
+    el mejor w, la salida completa de sor() con ese w y la tabla del barrido
+    (w, iteraciones, convergencia y radio espectral de cada valor probado).
+    """
+    x0, A, b = _sistema(x0, A, b)
+    malla = np.linspace(0, 2, puntos + 2)[1:-1]
+    paso = malla[1] - malla[0] if len(malla) > 1 else 1.0
+
+    # El sistema se serializa una vez en un archivo temporal en lugar de enviarse con cada w
+    ruta = os.path.join(tempfile.gettempdir(), f'barrido-sor-{uuid.uuid4().hex}.pkl')
+    with open(ruta, 'wb') as archivo:
+        pickle.dump((x0, A, b, Tol, niter, tipe), archivo, pickle.HIGHEST_PROTOCOL)
+    pool = _pool_barrido(procesos)
+    resultados, mejor = [], None
+    try:
+        def probar(ws):
+            # Solo se conserva la salida completa del mejor w hasta ahora
+            nonlocal mejor
+            for fila in pool.map(_probar_w, [ruta] * len(ws), ws):
+                resultados.append(fila[:4])
+                if mejor is None or _orden(fila) < _orden(mejor):
+                    mejor = fila
+
+        probar(malla)
+        centro = mejor[0]
+        fina = np.linspace(max(centro - paso, 0), min(centro + paso, 2), refinamiento + 3)[1:-1]
+        probar([w for w in fina if not np.isclose(malla, w).any()])
+    except BrokenProcessPool:
+        _descartar_pool(pool)
+        raise ErrorMetodo('Se detuvo un proceso del barrido de SOR')
+    finally:
+        os.remove(ruta)
+
+    # Los radios calculados en los procesos quedan en la caché de este proceso
+    for w, _, _, radio in resultados:
+        cache.radios.guardar('sor', cache.clave('radio', 'sor', A, w), radio)
+
+    resultados.sort()
+    tabla = tablas.tabla(**{
+        'w': [fila[0] for fila in resultados],
+        'Iteraciones': [fila[1] for fila in resultados],
+        'Converge': ['Sí' if fila[2] else 'No' for fila in resultados],
+        'Radio espectral': [fila[3][0] for fila in resultados],
+    })
+    return mejor[0], mejor[4], tabla
@@ -1,28 +1,24 @@
-from flask import Blueprint, render_template, request, send_file, url_for
-import os, json, csv
-import matlab.engine
-import pandas as pd
-import numpy as np
+from flask import Blueprint, render_template, request, url_for
+
+from app import backend, descargas, flujo, graficas, tablas
+from app.numerico import raices
 
 # Crear el blueprint
 blueprint = Blueprint('seccion_1', __name__)
 
-# Iniciar el motor de MATLAB
-eng = matlab.engine.start_matlab()
-
-# Rutas base
-dir_actual = os.path.dirname(os.path.abspath(__file__))
-dir_matlab = os.path.join(os.path.dirname(dir_actual), 'matlab')
-dir_tables = os.path.join(dir_actual, 'tables')
 
-# Añadir el directorio MATLAB al path
-if os.path.exists(dir_matlab):
-    eng.addpath(dir_matlab)
-    print(f"Ruta añadida correctamente: {dir_matlab}")
-else:
-    print(f"La ruta de MATLAB no existe: {dir_matlab}")
+def _url(grafica):
+    # URL de la gráfica generada, o None si no se pudo dibujar
+    return url_for('artefacto', nombre=grafica) if grafica else None
 
-eng.addpath(dir_matlab)
+def _polinomio(f):
+    # Todas las raíces a la vez si f es un polinomio, o None. Se llama antes que
+    # el método: la descarga de la página es la de la última tabla calculada
+    try:
+        resumen, _, _, _, tabla = backend.raices_polinomio(f)
+    except backend.ErrorMetodo:
+        return None
+    return {'resumen': resumen, 'raices': tablas.filas(tabla)}
 
 # Método del punto fijo
 @blueprint.route('/punto_fijo', methods=['GET', 'POST'])
@@ -36,31 +32,27 @@ def punto_fijo():
             tol = float(request.form['tol'].replace(',', '.'))
             niter = int(request.form['niter'])
             tipe = str(request.form['tipe'])
+            aceleracion = request.form.get('aceleracion', '')
 
             try:
-                # Intentar ejecutar MATLAB
-                [r, N, xn, fm, E] = eng.pf(f, g, x, tol, niter, tipe, nargout=5)
-                N, xn, fm, E = list(N[0]), list(xn[0]), list(fm[0]), list(E[0])
+                # Ejecutar el método en el motor configurado
+                r, N, xn, fm, E, tabla = backend.punto_fijo(f, g, x, tol, niter, tipe, aceleracion)
                 length = len(N)
 
-                # Leer la tabla generada por MATLAB
-                df = pd.read_csv(os.path.join(dir_tables, 'tabla_pf.csv'))
-                df = df.astype(str)
-                data = df.to_dict(orient='records')
-                df.to_excel(os.path.join(dir_tables, 'tabla_pf.xlsx'), index=False)
+                data = tablas.filas(tabla)
 
-                imagen_path = os.path.join('static', 'grafica_pf.png')
+                grafica = graficas.funcion(f, tabla['xn'])
                 return render_template(
                     'Seccion_1/resultado_pf.html',
                     r=r, N=N, xn=xn, fm=fm, E=E,
-                    length=length, data=data,
-                    imagen_path=imagen_path, f=f
+                    length=length, data=data, pasos=tabla.get('Paso'),
+                    imagen_path=_url(grafica), grafica=grafica, f=f
                 )
-            except matlab.engine.MatlabExecutionError as matlab_error:
-                # Capturar errores específicos de MATLAB
+            except backend.ERRORES as error_motor:
+                # Capturar errores específicos del motor de cálculo
                 return render_template(
                     'Seccion_1/formulario_pf.html',
-                    error_message=f"Error en MATLAB: {str(matlab_error)}"
+                    error_message=f"Error en {backend.NOMBRE}: {str(error_motor)}"
                 )
 
         except ValueError:
@@ -79,8 +71,7 @@ def punto_fijo():
 
 @blueprint.route('/pf/descargar', methods=['POST'])
 def descargar_archivo_pf():
-    archivo_path = os.path.join(dir_tables, 'tabla_pf.xlsx')
-    return send_file(archivo_path, as_attachment=True)
+    return descargas.respuesta('punto_fijo')
 
 # Ruta para el método de bisección
 @blueprint.route('/biseccion', methods=['GET', 'POST'])
@@ -96,46 +87,30 @@ def biseccion():
             tipe = str(request.form['tipe'])
 
             try:
-                # Ejecutar la función de MATLAB
-                [r, N, xn, fm, E] = eng.biseccion(f, xi, xs, tol, niter, tipe, nargout=5)
-
-                # Convertir resultados en listas
-                if len(N) != 0:
-                    N, xn, fm, E = list(N[0]), list(xn[0]), list(fm[0]), list(E[0])
-                else:
-                    N, xn, fm, E = [], [], [], []
+                # Ejecutar el método en el motor configurado
+                r, N, xn, fm, E, tabla = backend.biseccion(f, xi, xs, tol, niter, tipe)
 
                 length = len(N)
 
-                # Leer y procesar la tabla de resultados
-                tabla_path = os.path.join(dir_tables, 'tabla_biseccion.csv')
-                if os.path.exists(tabla_path):
-                    df = pd.read_csv(tabla_path)
-                    df = df.astype(str)
-                    data = df.to_dict(orient='records')
-                else:
-                    data = []
-
-                # Procesar la ruta de la gráfica
-                imagen_path = os.path.join(dir_actual, 'static', 'grafica_biseccion.png')
-                if not os.path.exists(imagen_path):
-                    imagen_path = None
-                else:
-                    imagen_path = url_for('static', filename='grafica_biseccion.png')
+                # Procesar la tabla de resultados
+                data = tablas.filas(tabla)
+
+                # Gráfica de f con las iteraciones
+                grafica = graficas.funcion(f, tabla['xn'])
 
                 # Renderizar resultados
                 return render_template(
                     'Seccion_1/resultado_biseccion.html',
                     r=r, N=N, xn=xn, fm=fm, E=E,
                     length=length, data=data,
-                    imagen_path=imagen_path, f=f
+                    imagen_path=_url(grafica), grafica=grafica, f=f
                 )
 
-            except matlab.engine.MatlabExecutionError as matlab_error:
-                # Capturar errores específicos de MATLAB
+            except backend.ERRORES as error_motor:
+                # Capturar errores específicos del motor de cálculo
                 return render_template(
                     'Seccion_1/formulario_biseccion.html',
-                    error_message=f"Error en MATLAB: {str(matlab_error)}"
+                    error_message=f"Error en {backend.NOMBRE}: {str(error_motor)}"
                 )
 
         except ValueError:
@@ -155,11 +130,7 @@ def biseccion():
 # Ruta para descargar el archivo de resultados
 @blueprint.route('/biseccion/descargar', methods=['POST'])
 def descargar_archivo_biseccion():
-    archivo_path = os.path.join(dir_tables, 'tabla_biseccion.xlsx')
-    if os.path.exists(archivo_path):
-        return send_file(archivo_path, as_attachment=True)
-    else:
-        return "Archivo no encontrado", 404
+    return descargas.respuesta('biseccion')
 
 
 #Método de raíces múltiples
@@ -175,27 +146,25 @@ def multiple_roots():
             et = str(request.form['et'])
 
             try:
-                # Llamar a MATLAB
-                [xi, errores, resultado] = eng.raices_multiples(fn, xi, tol, k, et, nargout=3)
+                polinomio = _polinomio(fn)
+                # Ejecutar el método en el motor configurado
+                xi, errores, resultado, tabla = backend.raices_multiples(fn, xi, tol, k, et)
 
-                # Leer resultados del archivo CSV
-                df = pd.read_csv(os.path.join(dir_tables, 'multiple_roots_results.csv'))
-                df = df.astype(str)
-                data = df.to_dict(orient='records')
-                df.to_excel(os.path.join(dir_tables, 'multiple_roots_results.xlsx'), index=False)
+                data = tablas.filas(tabla)
 
-                imagen_path = os.path.join('static', 'grafica_multiple_roots.png')
+                grafica = graficas.funcion(fn, tabla['xi'])
 
                 return render_template(
                     'Seccion_1/resultado_raicesm.html',
-                    data=data, imagen_path=imagen_path, resultado=resultado, fn=fn
+                    data=data, imagen_path=_url(grafica), grafica=grafica, resultado=resultado, fn=fn,
+                    polinomio=polinomio
                 )
 
-            except matlab.engine.MatlabExecutionError as matlab_error:
-                # Capturar errores específicos de MATLAB
+            except backend.ERRORES as error_motor:
+                # Capturar errores específicos del motor de cálculo
                 return render_template(
                     'Seccion_1/formulario_raicesm.html',
-                    error_message=f"Error en MATLAB: {str(matlab_error)}"
+                    error_message=f"Error en {backend.NOMBRE}: {str(error_motor)}"
                 )
 
         except ValueError:
@@ -215,8 +184,7 @@ def multiple_roots():
 
 @blueprint.route('/rm/descargar', methods=['POST'])
 def descargar_archivo_raicesm():
-    archivo_path = os.path.join(dir_tables, 'multiple_roots_results.xlsx')
-    return send_file(archivo_path, as_attachment=True)
+    return descargas.respuesta('raices_multiples')
 
 
 #Método de la secante
@@ -233,36 +201,31 @@ def secante():
             niter = int(request.form['niter'])
 
             try:
-                # Llamar a la función de MATLAB
-                respuesta = eng.secante(f, x0, x1, tol, niter, Terror)
-
-                # Leer el archivo CSV exportado
-                csv_path = os.path.join(dir_tables, 'tabla_secante.csv')
-                df = pd.read_csv(csv_path)
+                polinomio = _polinomio(f)
+                # Ejecutar el método en el motor configurado
+                respuesta, N, xn, fm, E, tabla = backend.secante(f, x0, x1, tol, niter, Terror)
 
                 # Convertir a lista de diccionarios
-                data = df.to_dict(orient='records')
+                data = tablas.filas(tabla)
 
-                # Guardar el archivo Excel (opcional)
-                excel_path = os.path.join(dir_tables, 'tabla_secante.xlsx')
-                df.to_excel(excel_path, index=False)
-
-                # Ruta de la gráfica
-                imagen_path = os.path.join('static', 'grafica_secante.png')
+                # Gráfica de f con las iteraciones
+                grafica = graficas.funcion(f, tabla['xn'])
 
                 return render_template(
                     'Seccion_1/resultado_secante.html',
                     respuesta=respuesta,
                     data=data,
-                    imagen_path=imagen_path,
-                    f=f
+                    imagen_path=_url(grafica),
+                    grafica=grafica,
+                    f=f,
+                    polinomio=polinomio
                 )
 
-            except matlab.engine.MatlabExecutionError as matlab_error:
-                # Capturar errores específicos de MATLAB
+            except backend.ERRORES as error_motor:
+                # Capturar errores específicos del motor de cálculo
                 return render_template(
                     'Seccion_1/formulario_secante.html',
-                    error_message=f"Error en MATLAB: {str(matlab_error)}"
+                    error_message=f"Error en {backend.NOMBRE}: {str(error_motor)}"
                 )
 
         except ValueError:
@@ -282,11 +245,7 @@ def secante():
 
 @blueprint.route('/secante/descargar', methods=['POST'])
 def descargar_archivo():
-    # Ruta del archivo que se va a descargar
-    archivo_path = 'tables/tabla_secante.xlsx'
-
-    # Enviar el archivo al cliente para descargar
-    return send_file(archivo_path, as_attachment=True)
+    return descargas.respuesta('secante')
 
 
 #Método de regla falsa
@@ -303,36 +262,29 @@ def reglaFalsa():
             niter = int(request.form['niter'])
 
             try:
-                # Llamar a la función de MATLAB
-                respuesta = eng.rf(f, x0, x1, tol, niter, Terror)
-
-                # Leer el archivo CSV exportado
-                csv_path = os.path.join(dir_tables, 'tabla_reglaFalsa.csv')
-                df = pd.read_csv(csv_path)
+                # Ejecutar el método en el motor configurado
+                respuesta, tabla = backend.regla_falsa(f, x0, x1, tol, niter, Terror)
 
                 # Convertir a lista de diccionarios
-                data = df.to_dict(orient='records')
+                data = tablas.filas(tabla)
 
-                # Guardar el archivo Excel (opcional)
-                excel_path = os.path.join(dir_tables, 'tabla_reglaFalsa.xlsx')
-                df.to_excel(excel_path, index=False)
-
-                # Ruta de la gráfica
-                imagen_path = os.path.join('static', 'grafica_reglaFalsa.png')
+                # Gráfica de f con las iteraciones
+                grafica = graficas.funcion(f, tabla['x_m'])
 
                 return render_template(
                     'Seccion_1/resultado_reglaFalsa.html',
                     respuesta=respuesta,
                     data=data,
-                    imagen_path=imagen_path,
+                    imagen_path=_url(grafica),
+                    grafica=grafica,
                     f=f
                 )
 
-            except matlab.engine.MatlabExecutionError as matlab_error:
-                # Capturar errores específicos de MATLAB
+            except backend.ERRORES as error_motor:
+                # Capturar errores específicos del motor de cálculo
                 return render_template(
                     'Seccion_1/formulario_reglaFalsa.html',
-                    error_message=f"Error en MATLAB: {str(matlab_error)}"
+                    error_message=f"Error en {backend.NOMBRE}: {str(error_motor)}"
                 )
 
         except ValueError:
@@ -351,11 +303,7 @@ def reglaFalsa():
 
 @blueprint.route('/rf/descargar', methods=['POST'])
 def descargar_archivorf():
-    # Ruta del archivo que se va a descargar
-    archivo_path = 'tables/tabla_reglaFalsa.xlsx'
-
-    # Enviar el archivo al cliente para descargar
-    return send_file(archivo_path, as_attachment=True)
+    return descargas.respuesta('regla_falsa')
 
 #Método de newton
 @blueprint.route('/newton', methods=['GET', 'POST'])
@@ -371,33 +319,25 @@ def newton():
             et = str(request.form['et'])
 
             try:
-                # Llamar a la función de MATLAB
-                [r, N, xn, fm, dfm, E, c] = eng.newton(f, x, tol, niter, et, nargout=7)
+                polinomio = _polinomio(f)
+                # Ejecutar el método en el motor configurado
+                r, N, xn, fm, dfm, E, c, tabla = backend.newton(f, x, tol, niter, et)
+                data = tablas.filas(tabla)
 
-                # Leer archivo CSV
-                csv_path = os.path.join(dir_tables, 'tabla_newton.csv')
-                df = pd.read_csv(csv_path)
-                data = df.to_dict(orient='records')
-
-                # Guardar archivo Excel (opcional)
-                excel_path = os.path.join(dir_tables, 'tabla_newton.xlsx')
-                df.to_excel(excel_path, index=False)
-
-                # Generar URL de la gráfica
-                safe_f_str = ''.join(c if c.isalnum() else '_' for c in f)
-                imagen_path = url_for('static', filename=f'{safe_f_str}.svg')
+                # Gráfica de f con las iteraciones
+                grafica = graficas.funcion(f, tabla['xn'])
 
                 return render_template(
                     'Seccion_1/resultado_newton.html',
                     r=r, f=f, data=data,
-                    imagen_path=imagen_path
+                    imagen_path=_url(grafica), grafica=grafica, polinomio=polinomio
                 )
 
-            except matlab.engine.MatlabExecutionError as matlab_error:
-                # Capturar errores específicos de MATLAB
+            except backend.ERRORES as error_motor:
+                # Capturar errores específicos del motor de cálculo
                 return render_template(
                     'Seccion_1/formulario_newton.html',
-                    error_message=f"Error en MATLAB: {str(matlab_error)}"
+                    error_message=f"Error en {backend.NOMBRE}: {str(error_motor)}"
                 )
 
         except ValueError:
@@ -419,123 +359,226 @@ def newton():
 
 
 
+@blueprint.route('/newton/flujo')
+def flujo_newton():
+    # Iteraciones en vivo con los datos del formulario en la query string
+    datos = request.args
+    try:
+        x = float(datos['x'].replace(',', '.'))
+        tol = float(datos['tol'].replace(',', '.'))
+        niter = int(datos['niter'])
+        filas = raices.iteraciones_newton(datos['f'], x, tol, niter, datos.get('et'))
+    except (KeyError, ValueError):
+        return 'Faltan datos o no son válidos', 400
+    return flujo.respuesta(filas, tol)
+
+
 @blueprint.route('/newton/descargar', methods=['POST'])
 def descargar_archivo_newton():
-    # Ruta del archivo que se va a descargar
-    archivo_path = 'tables/tabla_newton.xlsx'
+    return descargas.respuesta('newton')
 
-    # Enviar el archivo al cliente para descargar
-    return send_file(archivo_path, as_attachment=True)
 
-@blueprint.route('/biseccion/descargar_grafica_svg', methods=['POST'])
-def descargar_grafica_biseccion_svg():
-    # Obtener el nombre de la función desde el formulario
-    f_str = request.form.get('f_str')
-    print(f"Nombre de la función recibido: {f_str}")  # Para depuración
+# Métodos de intervalo superlineales: usan el formulario y el resultado de bisección
+VARIANTES_BRENT = {'brent': 'Brent', 'illinois': 'Illinois (regla falsa modificada)'}
 
-    if not f_str:
-        return "Nombre de la función no proporcionado", 400
 
-    # Generar un nombre seguro para el archivo
-    safe_f_str = ''.join(c if c.isalnum() else '_' for c in f_str)
-    archivo_path = os.path.join(dir_actual, 'static', f'{safe_f_str}.svg')
+@blueprint.route('/brent', methods=['GET', 'POST'])
+def brent():
+    plantilla = dict(metodo='Brent / Illinois', accion=url_for('seccion_1.brent'),
+                     variantes=list(VARIANTES_BRENT.items()))
+    if request.method == 'POST':
+        try:
+            f = str(request.form['f'])
+            xi = float(request.form['xi'].replace(',', '.'))
+            xs = float(request.form['xs'].replace(',', '.'))
+            tol = float(request.form['tol'].replace(',', '.'))
+            niter = int(request.form['niter'])
+            tipe = str(request.form['tipe'])
+            variante = str(request.form['variante'])
+            if variante not in VARIANTES_BRENT:
+                raise ValueError(variante)
 
-    # Verificar si el archivo existe y enviarlo
-    if os.path.exists(archivo_path):
-        return send_file(archivo_path, as_attachment=True, download_name=f'{safe_f_str}.svg')
-    else:
-        return "Gráfica SVG no encontrada", 404
+            try:
+                metodo = backend.brent if variante == 'brent' else backend.illinois
+                r, N, xn, fm, E, tabla = metodo(f, xi, xs, tol, niter, tipe)
+                data = tablas.filas(tabla)
 
+                grafica = graficas.funcion(f, tabla['xn'])
+                return render_template(
+                    'Seccion_1/resultado_biseccion.html',
+                    r=r, N=N, xn=xn, fm=fm, E=E,
+                    length=len(N), data=data,
+                    imagen_path=_url(grafica), grafica=grafica, f=f,
+                    metodo=VARIANTES_BRENT[variante], descarga='seccion_1.descargar_archivo_brent',
+                    variante=variante
+                )
 
+            except backend.ERRORES as error_motor:
+                return render_template(
+                    'Seccion_1/formulario_biseccion.html', **plantilla,
+                    error_message=f"Error en {backend.NOMBRE}: {str(error_motor)}"
+                )
 
-@blueprint.route('/pf/descargar_grafica', methods=['POST'])
-def descargar_grafica_pf():
-    # Obtener el nombre de la función desde el formulario
-    f_str = request.form.get('f_str')
-    print(f"Nombre de la función recibido: {f_str}")  # Depuración
+        except ValueError:
+            return render_template(
+                'Seccion_1/formulario_biseccion.html', **plantilla,
+                error_message="Error en los datos ingresados. Por favor verifica los valores."
+            )
+        except Exception as e:
+            return render_template(
+                'Seccion_1/formulario_biseccion.html', **plantilla,
+                error_message="Error en la sintaxis, para más información revisa el apartado de ayuda."
+            )
 
-    if not f_str:
-        return "Nombre de la función no proporcionado", 400
+    return render_template('Seccion_1/formulario_biseccion.html', **plantilla)
 
-    # Generar el nombre seguro para el archivo
-    safe_f_str = ''.join(c if c.isalnum() else '_' for c in f_str)
-    archivo_path = os.path.join(dir_actual, 'static', f'grafica_{safe_f_str}.svg')
 
-    # Verificar si el archivo existe y enviarlo
-    if os.path.exists(archivo_path):
-        return send_file(archivo_path, as_attachment=True, download_name=f'grafica_{safe_f_str}.svg')
-    else:
-        return "Gráfica SVG no encontrada", 404
+@blueprint.route('/brent/descargar', methods=['POST'])
+def descargar_archivo_brent():
+    variante = request.form.get('variante')
+    if variante not in VARIANTES_BRENT:
+        return 'Variante no reconocida', 400
+    return descargas.respuesta(variante)
 
+# Todas las raíces de f en un intervalo
+@blueprint.route('/todas_raices', methods=['GET', 'POST'])
+def todas_las_raices():
+    if request.method == 'POST':
+        try:
+            f = str(request.form['f'])
+            xi = float(request.form['xi'].replace(',', '.'))
+            xs = float(request.form['xs'].replace(',', '.'))
+            puntos = int(request.form['puntos'])
+            tol = float(request.form['tol'].replace(',', '.'))
+            niter = int(request.form['niter'])
+            tipe = str(request.form['tipe'])
+            metodo = str(request.form['metodo'])
 
-@blueprint.route('/rm/descargar_grafica', methods=['POST'])
-def descargar_grafica_raicesm():
-    # Obtener el nombre de la función desde el formulario
-    fn_str = request.form.get('fn')
-    print(f"Nombre de la función recibido: {fn_str}")  # Para depuración
+            try:
+                r, encontradas, iteraciones, tabla = backend.todas_las_raices(
+                    f, xi, xs, puntos, tol, niter, tipe, metodo)
+                data = tablas.filas(tabla)
 
-    if not fn_str:
-        return "Nombre de la función no proporcionado", 400
+                grafica = graficas.raices(f, xi, xs, encontradas)
+                return render_template(
+                    'Seccion_1/resultado_todas.html',
+                    r=r, f=f, data=data, iteraciones=[tablas.filas(t) for t in iteraciones],
+                    imagen_path=_url(grafica), grafica=grafica
+                )
 
-    # Generar un nombre seguro para el archivo
-    safe_fn_str = ''.join(c if c.isalnum() else '_' for c in fn_str)
-    archivo_path = os.path.join(dir_actual, 'static', f'{safe_fn_str}.svg')
+            except backend.ERRORES as error_motor:
+                return render_template(
+                    'Seccion_1/formulario_todas.html',
+                    error_message=f"Error en {backend.NOMBRE}: {str(error_motor)}"
+                )
+
+        except ValueError:
+            return render_template(
+                'Seccion_1/formulario_todas.html',
+                error_message="Error en los datos ingresados. Por favor verifica los valores."
+            )
+        except Exception as e:
+            return render_template(
+                'Seccion_1/formulario_todas.html',
+                error_message="Error en la sintaxis, para más información revisa el apartado de ayuda."
+            )
+
+    return render_template('Seccion_1/formulario_todas.html')
+
+
+@blueprint.route('/todas_raices/descargar', methods=['POST'])
+def descargar_todas_las_raices():
+    return descargas.respuesta('todas_las_raices')
+
+
+@blueprint.route('/todas_raices/descargar_grafica', methods=['POST'])
+def descargar_grafica_todas_las_raices():
+    return descargas.grafica()
+
+# Newton desde una rejilla de puntos iniciales
+@blueprint.route('/newton/cuencas', methods=['GET', 'POST'])
+def cuencas_newton():
+    if request.method == 'POST':
+        try:
+            f = str(request.form['f'])
+            metodo = str(request.form['metodo'])
+            re_min, re_max, im_min, im_max = (float(request.form[campo].replace(',', '.'))
+                                              for campo in ('re_min', 're_max', 'im_min', 'im_max'))
+            n_re = int(request.form['n_re'])
+            n_im = int(request.form['n_im'])
+            tol = float(request.form['tol'].replace(',', '.'))
+            niter = int(request.form['niter'])
+            et = str(request.form['et'])
+
+            try:
+                r, raices_encontradas, indice, iteraciones, tabla = backend.cuencas_newton(
+                    f, metodo, re_min, re_max, n_re, im_min, im_max, n_im, tol, niter, et)
+                data = tablas.filas(tabla)
+
+                # Mapa de cuencas con las raíces marcadas
+                grafica = graficas.cuencas(f, (re_min, re_max, im_min, im_max), indice, iteraciones,
+                                           raices_encontradas)
+
+                return render_template(
+                    'Seccion_1/resultado_cuencas.html',
+                    r=r, f=f, data=data,
+                    imagen_path=_url(grafica), grafica=grafica
+                )
+
+            except backend.ERRORES as error_motor:
+                return render_template(
+                    'Seccion_1/formulario_cuencas.html',
+                    error_message=f"Error en {backend.NOMBRE}: {str(error_motor)}"
+                )
+
+        except ValueError:
+            return render_template(
+                'Seccion_1/formulario_cuencas.html',
+                error_message="Error en los datos ingresados. Por favor verifica los valores."
+            )
+        except Exception as e:
+            return render_template(
+                'Seccion_1/formulario_cuencas.html',
+                error_message="Error en la sintaxis, para más información revisa el apartado de ayuda."
+            )
+
+    return render_template('Seccion_1/formulario_cuencas.html')
+
+
+@blueprint.route('/newton/cuencas/descargar', methods=['POST'])
+def descargar_cuencas():
+    return descargas.respuesta('cuencas_newton')
+
+
+@blueprint.route('/newton/cuencas/descargar_grafica', methods=['POST'])
+def descargar_grafica_cuencas():
+    return descargas.grafica()
+
+@blueprint.route('/biseccion/descargar_grafica_svg', methods=['POST'])
+def descargar_grafica_biseccion_svg():
+    return descargas.grafica()
+
+
+@blueprint.route('/pf/descargar_grafica', methods=['POST'])
+def descargar_grafica_pf():
+    return descargas.grafica()
+
+
+@blueprint.route('/rm/descargar_grafica', methods=['POST'])
+def descargar_grafica_raicesm():
+    return descargas.grafica()
 
-    # Verificar si el archivo existe y enviarlo
-    if os.path.exists(archivo_path):
-        return send_file(archivo_path, as_attachment=True, download_name=f'{safe_fn_str}.svg')
-    else:
-        return "Gráfica SVG no encontrada", 404
-    
 
 @blueprint.route('/rf/descargar_grafica', methods=['POST'])
 def descargar_grafica_regla_falsa():
-    # Obtener el nombre de la función desde el formulario
-    f_str = request.form.get('f')
-    if not f_str:
-        return "Nombre de la función no proporcionado", 400
+    return descargas.grafica()
 
-    # Generar un nombre seguro para el archivo
-    safe_f_str = ''.join(c if c.isalnum() else '_' for c in f_str)
-    archivo_path = os.path.join(dir_actual, 'static', f'{safe_f_str}.svg')
-
-    # Verificar si el archivo existe y enviarlo
-    if os.path.exists(archivo_path):
-        return send_file(archivo_path, as_attachment=True, download_name=f'{safe_f_str}.svg')
-    else:
-        return "Gráfica SVG no encontrada", 404
 
 @blueprint.route('/secante/descargar_grafica', methods=['POST'])
 def descargar_grafica_secante():
-    # Obtener el nombre de la función desde el formulario
-    func_str = request.form.get('f')
-    if not func_str:
-        return "Nombre de la función no proporcionado", 400
-
-    # Generar un nombre seguro para el archivo
-    safe_func_str = ''.join(c if c.isalnum() else '_' for c in func_str)
-    archivo_path = os.path.join(dir_actual, 'static', f'{safe_func_str}.svg')
-
-    # Verificar si el archivo existe y enviarlo
-    if os.path.exists(archivo_path):
-        return send_file(archivo_path, as_attachment=True, download_name=f'{safe_func_str}.svg')
-    else:
-        return "Gráfica SVG no encontrada", 404
+    return descargas.grafica()
 
 
 @blueprint.route('/newton/descargar_grafica', methods=['POST'])
 def descargar_grafica_newton():
-    # Obtener el nombre de la función desde el formulario
-    f_str = request.form.get('f')
-    if not f_str:
-        return "Nombre de la función no proporcionado", 400
-
-    # Generar un nombre seguro para el archivo
-    safe_f_str = ''.join(c if c.isalnum() else '_' for c in f_str)
-    archivo_path = os.path.join(dir_actual, 'static', f'{safe_f_str}.svg')
-
-    # Verificar si el archivo existe y enviarlo
-    if os.path.exists(archivo_path):
-        return send_file(archivo_path, as_attachment=True, download_name=f'{safe_f_str}.svg')
-    else:
-        return "Gráfica SVG no encontrada", 404
+    return descargas.grafica()
@@ -1,20 +1,61 @@
-from flask import Blueprint, render_template, request, send_file, url_for
-import os, json, csv
-import matlab.engine
-import pandas as pd
+from flask import Blueprint, render_template, request, url_for
+import json
 import numpy as np
 
-blueprint = Blueprint('seccion_2', __name__)
+from app import backend, descargas, flujo, tablas
+from app.numerico import sistemas
 
-eng = matlab.engine.start_matlab()
+blueprint = Blueprint('seccion_2', __name__)
 
-separador = os.path.sep 
-dir_actual = os.path.dirname(os.path.abspath(__file__))
-dir_matlab = separador.join(dir_actual.split(separador)[:-1])+'\matlab'
-dir_tables = os.path.join(dir_actual, 'tables')
-dir_static = os.path.join(os.path.dirname(__file__), 'static')
 
-eng.addpath(dir_matlab)
+def _imagen():
+    # Figura de MATLAB del último resultado (NumPy no la genera)
+    imagenes = backend.imagenes_actuales()
+    return url_for('artefacto', nombre=imagenes[0]) if imagenes and imagenes[0] else None
+
+
+def _sistema_disperso(A, b, x):
+    # Modo disperso: A subida como archivo Matrix Market o escrita como JSON COO/CSR.
+    # En ese caso b también puede subirse como archivo y x0 empieza en ceros.
+    archivo_A = request.files.get('archivo_A')
+    if archivo_A and archivo_A.filename:
+        A = sistemas.dispersa(archivo_A.stream)
+    elif A.strip().startswith('{'):
+        A = sistemas.dispersa(json.loads(A))
+    if sistemas.es_dispersa(A):
+        archivo_b = request.files.get('archivo_b')
+        if archivo_b and archivo_b.filename:
+            b = sistemas.dispersa(archivo_b.stream)
+        x = None
+    return A, b, x
+
+
+def _radio():
+    # El radio espectral se puede omitir para sistemas grandes
+    return 'omitir_radio' not in request.form
+
+
+def _flujo(metodo, tipo):
+    # Iteraciones en vivo con los datos del formulario en la query string
+    datos = request.args
+    try:
+        Tol = float(datos['tol'].replace(',', '.'))
+        niter = int(datos['niter'])
+        w = float(datos['w'].replace(',', '.')) if metodo == 'sor' else None
+        filas = sistemas.iteraciones(metodo, datos['x'], datos['A'], datos['b'], Tol, niter, datos.get(tipo), w)
+    except (KeyError, ValueError):
+        return 'Faltan datos o no son válidos', 400
+    return flujo.respuesta(filas, Tol)
+
+
+def _resultado_disperso(metodo, descarga, r, N, xn, E, radio):
+    # Con miles de incógnitas solo se muestran los errores y el inicio de la solución
+    solucion = xn[-1] if isinstance(xn[-1], list) else None
+    return render_template(
+        'Seccion_2/resultado_disperso.html',
+        metodo=metodo, descarga=descarga, r=r, N=N, E=E, radio=radio,
+        solucion=solucion[:20] if solucion else None, n=len(solucion) if solucion else None
+    )
 
 #Método de Gauss-Seidel
 #Método de Gauss-Seidel
@@ -39,31 +80,21 @@ def gaussSeidel():
                 raise ValueError("El número de iteraciones debe ser un entero positivo.")
 
             try:
-                # Ejecutar MATLAB
-                eng.addpath(dir_matlab)
-                [r, N, xn, E, re, c] = eng.gaussSeidel(x, A, b, et, tol, niter, nargout=6)
+                A, b, x = _sistema_disperso(A, b, x)
+                r, N, xn, E, re, c, tabla = backend.gauss_seidel(x, A, b, et, tol, niter, _radio())
+                if sistemas.es_dispersa(A):
+                    return _resultado_disperso('Gauss-Seidel', 'gaussSeidel/descargar', r, N, xn, E, re)
 
                 # Procesar resultados
-                if isinstance(E, float) and np.isnan(E):
+                if len(E) == 0 or np.isnan(E[0]):
                     length = 0
                 else:
-                    N, xn, E = list(N[0]), list(xn[0]), list(E[0])
                     length = len(N)
 
-                # Leer y procesar el archivo CSV generado por MATLAB
-                tabla_path = os.path.join(dir_tables, 'tabla_gaussSeidel.csv')
-                if os.path.exists(tabla_path):
-                    df = pd.read_csv(tabla_path)
-                    data = df.astype(str).to_dict(orient='records')
-                else:
-                    data = []
+                data = tablas.filas(tabla)
 
                 # Procesar la ruta de la gráfica
-                imagen_path = os.path.join(dir_static, 'grafica_gaussSeidel.png')
-                if not os.path.exists(imagen_path):
-                    imagen_path = None
-                else:
-                    imagen_path = url_for('static', filename='grafica_gaussSeidel.png')
+                imagen_path = _imagen()
 
                 # Renderizar resultados
                 return render_template(
@@ -72,10 +103,11 @@ def gaussSeidel():
                     imagen_path=imagen_path, c=c, niter=niter
                 )
 
-            except matlab.engine.MatlabExecutionError as matlab_error:
-                # Capturar errores de MATLAB y renderizar el formulario con un mensaje de error
-                error_message = f"Error en MATLAB: {str(matlab_error)}"
+            except backend.ERRORES as error_motor:
+                # Capturar errores del motor y renderizar el formulario con un mensaje de error
+                error_message = f"Error en {backend.NOMBRE}: {str(error_motor)}"
                 return render_template(
+                    'Seccion_2/formulario_gaussSeidel.html',
                     error_message=error_message
                 )
 
@@ -98,13 +130,14 @@ def gaussSeidel():
     # Si es una solicitud GET, renderizar el formulario vacío
     return render_template('Seccion_2/formulario_gaussSeidel.html')  
 
+@blueprint.route('/gaussSeidel/flujo')
+def flujo_gaussSeidel():
+    return _flujo('gauss_seidel', 'et')
+
+
 @blueprint.route('/gaussSeidel/descargar', methods=['POST'])
 def descargar_archivo_gaussSeidel():
-    # Ruta del archivo que se va a descargar
-    archivo_path = 'tables/tabla_gaussSeidel.xlsx'
-
-    # Enviar el archivo al cliente para descargar
-    return send_file(archivo_path, as_attachment=True)
+    return descargas.respuesta('gauss_seidel')
 
 #Método de Jacobi
 @blueprint.route('/jacobi', methods=['GET', 'POST'])
@@ -128,31 +161,21 @@ def jacobi():
                 raise ValueError("El número de iteraciones debe ser un entero positivo.")
 
             try:
-                # Ejecutar MATLAB
-                eng.addpath(dir_matlab)
-                [r, N, xn, E, Re] = eng.jacobi(x, A, b, tol, niter, error_type, nargout=5)
+                A, b, x = _sistema_disperso(A, b, x)
+                r, N, xn, E, Re, tabla = backend.jacobi(x, A, b, tol, niter, error_type, _radio())
+                if sistemas.es_dispersa(A):
+                    return _resultado_disperso('Jacobi', 'jacobi/descargar', r, N, xn, E, Re)
 
                 # Procesar resultados
                 if not np.isnan(xn[0][0]):
-                    N, E = list(N[0]), list(E[0])
                     length = len(N)
                 else:
                     length = 0
 
-                # Leer y procesar el archivo CSV generado por MATLAB
-                tabla_path = os.path.join(dir_tables, 'tabla_jacobi.csv')
-                if os.path.exists(tabla_path):
-                    df = pd.read_csv(tabla_path)
-                    data = df.astype(str).to_dict(orient='records')
-                else:
-                    data = []
+                data = tablas.filas(tabla)
 
                 # Procesar la ruta de la gráfica
-                imagen_path = os.path.join(dir_static, 'grafica_jacobi.png')
-                if not os.path.exists(imagen_path):
-                    imagen_path = None
-                else:
-                    imagen_path = url_for('static', filename='grafica_jacobi.png')
+                imagen_path = _imagen()
 
                 # Renderizar resultados
                 return render_template(
@@ -161,9 +184,9 @@ def jacobi():
                     imagen_path=imagen_path
                 )
 
-            except matlab.engine.MatlabExecutionError as matlab_error:
-                # Capturar errores de MATLAB y renderizar el formulario con un mensaje de error
-                error_message = f"Error en MATLAB: {str(matlab_error)}"
+            except backend.ERRORES as error_motor:
+                # Capturar errores del motor y renderizar el formulario con un mensaje de error
+                error_message = f"Error en {backend.NOMBRE}: {str(error_motor)}"
                 return render_template(
                     'Seccion_2/formulario_jacobi.html',
                     error_message=error_message
@@ -190,13 +213,14 @@ def jacobi():
 
 
 
+@blueprint.route('/jacobi/flujo')
+def flujo_jacobi():
+    return _flujo('jacobi', 'error_type')
+
+
 @blueprint.route('/jacobi/descargar', methods=['POST'])
 def descargar_archivo_jacobi():
-    # Ruta del archivo que se va a descargar
-    archivo_path = 'tables/tabla_jacobi.xlsx'
-
-    # Enviar el archivo al cliente para descargar
-    return send_file(archivo_path, as_attachment=True)
+    return descargas.respuesta('jacobi')
 
 
 #Método de sor
@@ -224,33 +248,22 @@ def sor():
                 raise ValueError("El factor de relajación (w) debe estar entre 0 y 2.")
 
             try:
-                # Ejecutar MATLAB
-                eng.addpath(dir_matlab)
-                [r, n, xi, E, radio] = eng.SOR(x0, A, b, Tol, niter, w, tipe, nargout=5)
+                # xi queda con una fila por iteración
+                A, b, x0 = _sistema_disperso(A, b, x0)
+                r, n, xi, E, radio, tabla = backend.sor(x0, A, b, Tol, niter, w, tipe, _radio())
+                if sistemas.es_dispersa(A):
+                    return _resultado_disperso('SOR', 'sor/descargar', r, n, xi, E, radio)
 
                 # Procesar resultados
                 if not np.isnan(xi[0][0]):
-                    n, E = list(n[0]), list(E[0])
                     length = len(n)
                 else:
                     length = 0
 
-                xi = [[xi[j][i] for j in range(len(xi))] for i in range(len(xi[0]))]
-
-                # Leer y procesar el archivo CSV generado por MATLAB
-                tabla_path = os.path.join(dir_tables, 'tabla_sor.csv')
-                if os.path.exists(tabla_path):
-                    df = pd.read_csv(tabla_path)
-                    data = df.astype(str).to_dict(orient='records')
-                else:
-                    data = []
+                data = tablas.filas(tabla)
 
                 # Procesar la ruta de la gráfica
-                imagen_path = os.path.join(dir_static, 'grafica_sor.png')
-                if not os.path.exists(imagen_path):
-                    imagen_path = None
-                else:
-                    imagen_path = url_for('static', filename='grafica_sor.png')
+                imagen_path = _imagen()
 
                 # Renderizar resultados
                 return render_template(
@@ -259,9 +272,9 @@ def sor():
                     imagen_path=imagen_path
                 )
 
-            except matlab.engine.MatlabExecutionError as matlab_error:
-                # Capturar errores de MATLAB y renderizar el formulario con un mensaje de error
-                error_message = f"Error en MATLAB: {str(matlab_error)}"
+            except backend.ERRORES as error_motor:
+                # Capturar errores del motor y renderizar el formulario con un mensaje de error
+                error_message = f"Error en {backend.NOMBRE}: {str(error_motor)}"
                 return render_template(
                     'Seccion_2/formulario_sor.html',
                     error_message=error_message
@@ -286,11 +299,76 @@ def sor():
     # Si es una solicitud GET, renderizar el formulario vacío
     return render_template('Seccion_2/formulario_sor.html')
 
+@blueprint.route('/sor/flujo')
+def flujo_sor():
+    return _flujo('sor', 'et')
+
+
 @blueprint.route('/sor/descargar', methods=['POST'])
 def descargar_archivo_sor():
-    # Ruta del archivo que se va a descargar
-    archivo_path = 'tables/tabla_sor.xlsx'
+    return descargas.respuesta('sor')
+
+
+#Búsqueda del w óptimo de SOR
+@blueprint.route('/sor/optimo', methods=['GET', 'POST'])
+def sor_optimo():
+    if request.method == 'POST':
+        try:
+            # Validar y procesar datos del formulario
+            x0 = str(request.form['x'])
+            A = request.form['A']
+            b = str(request.form['b'])
+            Tol = float(request.form['tol'].replace(',', '.'))
+            niter = int(request.form['niter'])
+            puntos = int(request.form.get('puntos') or 19)
+            tipe = str(request.form['et'])
+
+            # Validaciones de entrada
+            if not A or not b or not x0:
+                raise ValueError("Debe ingresar las matrices A, b y el vector inicial x.")
+            if Tol <= 0:
+                raise ValueError("La tolerancia debe ser un valor positivo.")
+            if niter <= 0:
+                raise ValueError("El número de iteraciones debe ser un entero positivo.")
+            if puntos < 2 or puntos > 199:
+                raise ValueError("El número de valores de w debe estar entre 2 y 199.")
 
-    # Enviar el archivo al cliente para descargar
-    return send_file(archivo_path, as_attachment=True)
+            try:
+                A, b, x0 = _sistema_disperso(A, b, x0)
+                w, r, n, xi, E, radio, tabla, barrido = backend.barrido_sor(x0, A, b, Tol, niter, tipe, puntos)
+                solucion = xi[-1] if xi and len(xi[-1]) <= 20 else None
+
+                return render_template(
+                    'Seccion_2/resultado_sor_optimo.html',
+                    w=round(w, 4), r=r, n=n, radio=radio, solucion=solucion,
+                    data=tablas.filas(barrido)
+                )
+
+            except backend.ERRORES as error_motor:
+                error_message = f"Error en {backend.NOMBRE}: {str(error_motor)}"
+                return render_template(
+                    'Seccion_2/formulario_sor_optimo.html',
+                    error_message=error_message
+                )
+
+        except ValueError as ve:
+            # Errores específicos de validación
+            return render_template(
+                'Seccion_2/formulario_sor_optimo.html',
+                error_message=str(ve)
+            )
+
+        except Exception as e:
+            # Capturar cualquier otro error
+            error_message = "Error de sintaxis, para más información ir al apartado de ayuda."
+            return render_template(
+                'Seccion_2/formulario_sor_optimo.html',
+                error_message=error_message
+            )
+
+    # Si es una solicitud GET, renderizar el formulario vacío
+    return render_template('Seccion_2/formulario_sor_optimo.html')
 
+@blueprint.route('/sor/optimo/descargar', methods=['POST'])
+def descargar_archivo_sor_optimo():
+    return descargas.respuesta('barrido_sor')
@@ -1,19 +1,22 @@
-from flask import Blueprint, render_template, request, send_file
-import os, json, csv
-import matlab.engine
-import pandas as pd
+from flask import Blueprint, render_template, request, url_for
+import json
 import numpy as np
 
+from app import backend, descargas, graficas, tablas
+from app.numerico import interpolacion
+
 blueprint = Blueprint('seccion_3', __name__)
 
-eng = matlab.engine.start_matlab()
+# Tramos del trazador que se muestran en la página
+MAX_TRAMOS = 1000
 
-separador = os.path.sep 
-dir_actual = os.path.dirname(os.path.abspath(__file__))
-dir_matlab = separador.join(dir_actual.split(separador)[:-1])+'\matlab'
-dir_tables = os.path.join(dir_actual, 'tables')
+def _url(grafica):
+    # URL de la gráfica generada, o None si no se pudo dibujar
+    return url_for('artefacto', nombre=grafica) if grafica else None
 
-eng.addpath(dir_matlab)
+def _vector_texto(texto):
+    # '[1, 2, 3]' o '[1 2 3]' como en MATLAB
+    return np.array(texto.strip().strip('[]').replace(',', ' ').split(), dtype=float)
 
 @blueprint.route('/lagrange', methods=['POST', 'GET'])
 def lagrange():
@@ -22,35 +25,21 @@ def lagrange():
         x = json.loads(request.form['vectorx'])
         y = json.loads(request.form['vectory'])
         
-        eng.addpath(dir_matlab)
-        
-        matx = matlab.double(x)
-        maty = matlab.double(y)
-        
-        respuesta = eng.lagrange(matx, maty)
+        polinomio, respuesta, interpolante, tabla = backend.lagrange(x, y)
         print("respuesta",respuesta)
 
-        df = pd.read_csv(os.path.join(dir_tables,'tabla_lagrange.csv'))
-        polinomio = df['Polinomio'][0]
-          
-        data = df.to_dict(orient='records')
+        data = tablas.filas(tabla)
         #print("data",data)
 
-        df.to_excel(os.path.join(dir_tables,'tabla_lagrange.xlsx'), index=False)
-
         # Gráfica
-        imagen_path = os.path.join('static','grafica_lagrange.png')  # Ruta de la imagen
+        imagen_path = _url(graficas.polinomio(respuesta, x, y, 'Polinomio de Lagrange'))
         return render_template('Seccion_3/resultado_lagrange.html',respuesta=polinomio, data=data, imagen_path=imagen_path)
         
     return render_template('Seccion_3/lagrange.html')
 
 @blueprint.route('/lagrange/descargar', methods=['POST'])
 def descargar_archivoLagrange():
-    # Ruta del archivo que se va a descargar
-    archivo_path = 'tables/tabla_lagrange.xlsx'
-
-    # Enviar el archivo al cliente para descargar
-    return send_file(archivo_path, as_attachment=True)
+    return descargas.respuesta('lagrange')
 
 @blueprint.route('/newtonint', methods=['POST', 'GET'])
 def newtonint():
@@ -61,39 +50,19 @@ def newtonint():
         print(x)
         print(y)
         
-        eng.addpath(dir_matlab)
-        
-        matx = matlab.double(x)
-        maty = matlab.double(y)
-        
-        respuesta = eng.Newtonint(matx, maty)
+        polinomio, respuesta, data, interpolante, tabla = backend.newtonint(x, y)
         print("respuesta",respuesta)
 
-        df = pd.read_csv(os.path.join(dir_tables,'tabla_polnewton.csv'))
-        polinomio = df['Polinomio'][0]
-          
-        data = pd.read_csv(os.path.join(dir_tables,'tabla_newtonint.csv'))
-
-        # Escribe los datos en un nuevo archivo Excel
-        data.to_excel(os.path.join(dir_tables,'tabla_newtonint.xlsx'), index=False) 
-
-        with open(os.path.join(dir_tables,'tabla_newtonint.csv'), 'r') as file:
-            csv_reader = csv.reader(file)
-            data = list(csv_reader)
 
         # Gráfica
-        imagen_path = os.path.join('static','grafica_newtonint.png')  # Ruta de la imagen
+        imagen_path = _url(graficas.polinomio(respuesta, x, y, 'Interpolación de Newton con diferencias divididas'))
         return render_template('Seccion_3/resultado_newtonint.html',respuesta=polinomio, data=data, imagen_path=imagen_path)
         
     return render_template('Seccion_3/newtonint.html')
 
 @blueprint.route('/newtonint/descargar', methods=['POST'])
 def descargar_archivoNewtonInt():
-    # Ruta del archivo que se va a descargar
-    archivo_path = 'tables/tabla_newtonInt.xlsx'
-
-    # Enviar el archivo al cliente para descargar
-    return send_file(archivo_path, as_attachment=True)
+    return descargas.respuesta('newtonint')
 
 
 @blueprint.route('/vandermonde', methods=['POST', 'GET'])
@@ -102,34 +71,25 @@ def vandermonde():
     
         x = json.loads(request.form['vectorx'])
         y = json.loads(request.form['vectory'])
+        base = request.form.get('base') or 'potencias'
         
-        eng.addpath(dir_matlab)
-        
-        matx = matlab.double(x)
-        maty = matlab.double(y)
-        
-        respuesta = eng.vander(matx, maty)
+        polinomio, respuesta, interpolante, condicion, tabla = backend.vandermonde(x, y, base)
         print("respuesta",respuesta)
 
-        df = pd.read_csv(os.path.join(dir_tables, 'pol_vandermonde.csv'))
-        polinomio = df['Polinomio'][0]
-          
-        data = df.to_dict(orient='records')
+        data = tablas.filas(tabla)
         #print("data",data)
 
-        df.to_excel(os.path.join(dir_tables, 'pol_vandermonde.xlsx'), index=False) 
-
         # Gráfica
-        imagen_path = os.path.join('static', 'grafica_vander.png')
-        return render_template('Seccion_3/resultado_vander.html',respuesta=polinomio, data=data, imagen_path=imagen_path)
+        imagen_path = _url(graficas.polinomio(respuesta, x, y, 'Polinomio usando matriz de Vandermonde'))
+        return render_template('Seccion_3/resultado_vander.html',respuesta=polinomio, data=data, imagen_path=imagen_path,
+                               condicion=condicion, base=interpolacion.BASES[base],
+                               confiable=condicion < interpolacion.CONDICION_MAXIMA)
         
     return render_template('Seccion_3/vandermonde.html')
 
 @blueprint.route('/vandermonde/descargar', methods=['POST'])
 def descargar_polvander():
-    archivo_path = 'tables/pol_vandermonde.xlsx'
-
-    return send_file(archivo_path, as_attachment=True)
+    return descargas.respuesta('vandermonde')
 
 
 @blueprint.route('/spline', methods=['POST', 'GET'])
@@ -140,17 +100,13 @@ def spline():
         y = request.form['y']
         d = int(request.form['d'])
         
-        eng.addpath(dir_matlab)
-        
-        respuesta = eng.spline(x, y, d)
+        respuesta, interpolante, tabla = backend.spline(x, y, d)
         print("respuesta",respuesta)
 
-        df = pd.read_csv(os.path.join(dir_tables, 'tabla_spline.csv'))
-        df = df.astype(str)
-        data = df.to_dict(orient='records')
-        df.to_excel(os.path.join(dir_tables, 'tabla_spline.xlsx'), index=False) 
-
-        imagen_path = os.path.join('static', 'grafica_spline.png')
+        try:
+            imagen_path = _url(graficas.tramos(respuesta, _vector_texto(x), _vector_texto(y), 'Interpolación Spline'))
+        except ValueError:
+            imagen_path = None
 
         # Eliminar los corchetes al principio y al final del string
         x = x.strip("[]")
@@ -162,14 +118,13 @@ def spline():
             grado.append(d)
             d = d - 1
 
-        return render_template('Seccion_3/resultado_spline.html',respuesta=respuesta, data=data, imagen_path=imagen_path, x=x, grado = grado, g=g)
+        # Con muchos datos la página solo muestra los primeros tramos; la descarga los tiene todos
+        tramos = len(respuesta)
+        return render_template('Seccion_3/resultado_spline.html',respuesta=respuesta[:MAX_TRAMOS], imagen_path=imagen_path, x=x, grado = grado, g=g,
+                               tramos=tramos, max_tramos=MAX_TRAMOS)
         
     return render_template('Seccion_3/spline.html')
 
 @blueprint.route('/spline/descargar', methods=['POST'])
 def descargar_archivoSpline():
-    # Ruta del archivo que se va a descargar
-    archivo_path = 'tables/tabla_spline.xlsx'
-
-    # Enviar el archivo al cliente para descargar
-    return send_file(archivo_path, as_attachment=True)
\ No newline at end of file
+    return descargas.respuesta('spline')
@@ -0,0 +1,66 @@
+"""Sesiones de interpolación de Newton con datos que llegan de a uno.
+
+Cada sesión conserva su tabla de diferencias divididas
+(app/numerico/interpolacion.py) entre peticiones: agregar un punto solo
+calcula la fila nueva. Las sesiones viven en memoria, se identifican con un id
+aleatorio y se cierran solas después de config.SESION_EDAD segundos sin usarse.
+"""
+import threading
+import time
+import uuid
+
+from app import config
+from app.numerico.interpolacion import NewtonIncremental
+
+
+class DemasiadasSesiones(Exception):
+    """No hay espacio para otra sesión."""
+
+
+class Sesion:
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.newton = NewtonIncremental()
+        self.creada = self.usada = time.time()
+        # Dos peticiones a la misma sesión no agregan filas a la vez
+        self.candado = threading.Lock()
+
+
+class Sesiones:
+    """Sesiones abiertas, con un máximo y cierre por inactividad."""
+
+    def __init__(self, maximo=1000, edad=3600):
+        self.maximo = maximo
+        self.edad = edad
+        self._sesiones = {}
+        self._candado = threading.Lock()
+
+    def abrir(self):
+        sesion = Sesion()
+        with self._candado:
+            self._purgar()
+            if len(self._sesiones) >= self.maximo:
+                raise DemasiadasSesiones(f'Hay {self.maximo} sesiones abiertas')
+            self._sesiones[sesion.id] = sesion
+        return sesion
+
+    def obtener(self, id_sesion):
+        """La sesión, o None si no existe o se cerró por inactividad."""
+        with self._candado:
+            self._purgar()
+            sesion = self._sesiones.get(id_sesion)
+            if sesion is not None:
+                sesion.usada = time.time()
+            return sesion
+
+    def cerrar(self, id_sesion):
+        with self._candado:
+            return self._sesiones.pop(id_sesion, None) is not None
+
+    def _purgar(self):
+        limite = time.time() - self.edad
+        for id_sesion in [i for i, s in self._sesiones.items() if s.usada < limite]:
+            del self._sesiones[id_sesion]
+
+
+sesiones = Sesiones(maximo=config.SESIONES_MAXIMAS, edad=config.SESION_EDAD)
@@ -119,7 +119,8 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
 
-    document.getElementById('submitMatrix').addEventListener('click', function() {
+    // Los dos botones del formulario (Enviar y Ver iteraciones en vivo) envían la matriz
+    const llenarCampos = function() {
         const matrix = getMatrixValues();
         const vector = getVectorValues();
         const x = getXValues();
@@ -129,7 +130,12 @@ document.addEventListener('DOMContentLoaded', function() {
         matrixDataInput.value = matlabMatrix;
         vectorDataInput.value = matlabVector;
         xDataInput.value = matlabX;
-    });
+    };
+    document.getElementById('submitMatrix').addEventListener('click', llenarCampos);
+    const verVivo = document.getElementById('verVivo');
+    if (verVivo) {
+        verVivo.addEventListener('click', llenarCampos);
+    }
 
     // Inicializar la matriz con el tamaño inicial
     generateMatrixVector(matrixSize);
@@ -0,0 +1,84 @@
+"""Tablas de iteraciones en memoria.
+
+Una tabla es un diccionario ordenado {nombre de columna: arreglo de NumPy},
+con los mismos nombres de columna que usaban los CSV de app/tables.
+"""
+import csv
+import importlib.util
+import io
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+# Parquet es opcional: pandas lo escribe con pyarrow o fastparquet
+PARQUET = any(importlib.util.find_spec(motor) for motor in ('pyarrow', 'fastparquet'))
+
+
+def tabla(**columnas):
+    """Arma una tabla a partir de columnas con nombre."""
+    return {nombre: np.asarray(valores) for nombre, valores in columnas.items()}
+
+
+def longitud(tabla):
+    for valores in tabla.values():
+        return len(valores)
+    return 0
+
+
+def filas(tabla):
+    """Convierte la tabla en una lista de filas {columna: texto} para las plantillas."""
+    columnas = [(nombre, [str(v) for v in valores]) for nombre, valores in tabla.items()]
+    return [{nombre: valores[i] for nombre, valores in columnas}
+            for i in range(longitud(tabla))]
+
+
+def _celda(valor):
+    # Tipos de Python para openpyxl; NaN queda como celda vacía e Inf como texto
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and not np.isfinite(valor):
+        return None if np.isnan(valor) else str(valor)
+    return valor
+
+
+def _xlsx(tabla):
+    # Modo write-only de openpyxl: las filas se escriben sin armar la hoja en memoria
+    libro = openpyxl.Workbook(write_only=True)
+    hoja = libro.create_sheet()
+    hoja.append(list(tabla))
+    for fila in zip(*tabla.values()):
+        hoja.append([_celda(v) for v in fila])
+    salida = io.BytesIO()
+    libro.save(salida)
+    return salida.getvalue()
+
+
+def _csv(tabla):
+    salida = io.StringIO()
+    escritor = csv.writer(salida)
+    escritor.writerow(list(tabla))
+    for fila in zip(*tabla.values()):
+        escritor.writerow([v.item() if isinstance(v, np.generic) else v for v in fila])
+    return salida.getvalue().encode('utf-8')
+
+
+def _parquet(tabla):
+    if not PARQUET:
+        raise ValueError('Exportar a Parquet necesita el paquete pyarrow o fastparquet')
+    salida = io.BytesIO()
+    pd.DataFrame(tabla).to_parquet(salida, index=False)
+    return salida.getvalue()
+
+
+# Formatos de exportación: función y tipo MIME
+FORMATOS = {
+    'xlsx': (_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'csv': (_csv, 'text/csv'),
+    'parquet': (_parquet, 'application/vnd.apache.parquet'),
+}
+
+
+def exportar(tabla, formato='xlsx'):
+    """Contenido del archivo con la tabla en el formato pedido (ver FORMATOS)."""
+    return FORMATOS[formato][0](tabla)
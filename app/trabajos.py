@@ -0,0 +1,265 @@
+"""Cola de trabajos en segundo plano para los métodos pesados.
+
+En lugar de resolver dentro del hilo de la petición, /trabajos/<método> deja el
+problema en una cola y devuelve un id de inmediato. Un grupo acotado de hilos
+(config.TRABAJADORES) toma los trabajos en orden; el cliente consulta
+/trabajos/<id> hasta que el estado sea 'terminado', 'error', 'cancelado' o
+'vencido'.
+
+Cada hilo resuelve sus trabajos en un proceso propio (multiprocessing con
+'spawn', que no hereda los hilos ni los candados del servidor). Ni MATLAB ni
+NumPy se pueden interrumpir desde otro hilo, así que al cancelar un trabajo en
+ejecución o al vencer su tiempo límite se mata ese proceso y el hilo queda
+libre para el siguiente trabajo. Con MATLAB cada proceso abre su propio motor,
+fuera del pool de las páginas (ver config.TRABAJADORES).
+"""
+import atexit
+import multiprocessing
+import queue
+import signal
+import sys
+import threading
+import time
+import uuid
+from multiprocessing.connection import wait
+
+from app import config
+
+EN_COLA, EJECUTANDO, TERMINADO, ERROR, CANCELADO, VENCIDO = (
+    'en_cola', 'ejecutando', 'terminado', 'error', 'cancelado', 'vencido')
+FINALES = (TERMINADO, ERROR, CANCELADO, VENCIDO)
+
+# Segundos entre revisiones de un trabajo en ejecución (cancelado o vencido)
+INTERVALO = 0.2
+
+_contexto = multiprocessing.get_context('spawn')
+
+
+class ColaLlena(Exception):
+    """No hay espacio en la cola para otro trabajo."""
+
+
+class Trabajo:
+    def __init__(self, metodo, funcion, args, tiempo_limite):
+        self.id = uuid.uuid4().hex
+        self.metodo = metodo
+        self.funcion = funcion
+        self.args = args
+        self.tiempo_limite = tiempo_limite
+        self.estado = EN_COLA
+        self.resultado = None
+        self.error = None
+        self.creado = time.time()
+        self.inicio = None
+        self.fin = None
+        self.listo = threading.Event()
+
+    def resumen(self):
+        """Estado del trabajo para la respuesta JSON (sin el resultado)."""
+        return {
+            'id': self.id,
+            'metodo': self.metodo,
+            'estado': self.estado,
+            'error': self.error,
+            'espera': round((self.inicio or time.time()) - self.creado, 3),
+            'duracion': round((self.fin or time.time()) - self.inicio, 3) if self.inicio else None,
+        }
+
+
+def _atender(conexion):
+    # Proceso de un trabajador: recibe (funcion, args) y devuelve (resultado, error)
+    from app import motor_matlab
+    motor_matlab.pool.maximo = 1
+    # Al terminarlo se cierran su motor y sus procesos con atexit
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(1))
+    while True:
+        try:
+            funcion, args = conexion.recv()
+        except EOFError:
+            return
+        try:
+            respuesta = funcion(*args), None
+        except Exception as e:
+            respuesta = None, str(e) or type(e).__name__
+        try:
+            conexion.send(respuesta)
+        except Exception as e:
+            conexion.send((None, f'El resultado no se puede enviar: {e}'))
+
+
+class _Proceso:
+    """Proceso hijo de un hilo trabajador. Se inicia con el primer trabajo y
+    de nuevo después de matarlo."""
+
+    def __init__(self):
+        self._proceso = None
+        self._conexion = None
+
+    def ejecutar(self, trabajo, vencer):
+        """(resultado, error) de funcion(*args). Si el trabajo deja de estar en
+        ejecución o supera su tiempo límite, mata el proceso y devuelve (None, None)."""
+        if self._proceso is None:
+            conexion, hija = _contexto.Pipe()
+            # No es daemon: barrido_sor abre sus propios procesos
+            proceso = _contexto.Process(target=_atender, args=(hija,), name='trabajo')
+            try:
+                proceso.start()
+            finally:
+                hija.close()
+            self._proceso, self._conexion = proceso, conexion
+        self._conexion.send((trabajo.funcion, trabajo.args))
+        limite = trabajo.inicio + trabajo.tiempo_limite
+        while True:
+            listos = wait([self._conexion, self._proceso.sentinel], INTERVALO)
+            if self._conexion in listos:
+                try:
+                    return self._conexion.recv()
+                except (EOFError, OSError):
+                    listos = [self._proceso.sentinel]
+            if listos:
+                self.detener()
+                return None, 'El proceso del trabajo terminó inesperadamente'
+            if time.time() >= limite:
+                vencer(trabajo)
+            if trabajo.estado != EJECUTANDO:
+                self.detener()
+                return None, None
+
+    def detener(self):
+        if self._proceso is None:
+            return
+        self._proceso.terminate()
+        self._proceso.join(5)
+        if self._proceso.is_alive():
+            # Atascado dentro de MATLAB o de una rutina en C
+            self._proceso.kill()
+            self._proceso.join()
+        self._conexion.close()
+        self._proceso = self._conexion = None
+
+
+class ColaTrabajos:
+    """Cola acotada con un grupo fijo de hilos que se inician con el primer trabajo."""
+
+    def __init__(self, trabajadores=2, maximo=100, tiempo_limite=300, conservar=600):
+        self.trabajadores = trabajadores
+        self.maximo = maximo
+        self.tiempo_limite = tiempo_limite
+        self.conservar = conservar
+        self._cola = queue.Queue()
+        self._trabajos = {}
+        self._contadores = {}
+        self._candado = threading.Lock()
+        self._hilos = []
+        self._procesos = []
+
+    def enviar(self, metodo, funcion, args, tiempo_limite=None):
+        """Agrega funcion(*args) a la cola y devuelve el Trabajo. tiempo_limite
+        puede bajar el de la cola, no subirlo."""
+        tiempo_limite = min(tiempo_limite or self.tiempo_limite, self.tiempo_limite)
+        trabajo = Trabajo(metodo, funcion, args, tiempo_limite)
+        if self.trabajadores < 1:
+            raise ColaLlena('La cola no tiene trabajadores: con MATLAB se necesitan al menos 2 motores')
+        with self._candado:
+            self._purgar()
+            if self._cola.qsize() >= self.maximo:
+                raise ColaLlena(f'La cola tiene {self.maximo} trabajos pendientes')
+            self._iniciar_hilos()
+            self._trabajos[trabajo.id] = trabajo
+            self._cola.put(trabajo)
+        return trabajo
+
+    def obtener(self, id_trabajo):
+        with self._candado:
+            return self._trabajos.get(id_trabajo)
+
+    def esperar(self, id_trabajo, segundos):
+        """Espera hasta `segundos` a que el trabajo termine (consulta larga)."""
+        trabajo = self.obtener(id_trabajo)
+        if trabajo is not None and segundos > 0:
+            trabajo.listo.wait(segundos)
+        return trabajo
+
+    def cancelar(self, id_trabajo):
+        """Cancela el trabajo si todavía no terminó. Devuelve False si no existe o ya terminó."""
+        with self._candado:
+            trabajo = self._trabajos.get(id_trabajo)
+            if trabajo is None or trabajo.estado in FINALES:
+                return False
+            self._terminar(trabajo, CANCELADO)
+        return True
+
+    def estadisticas(self):
+        with self._candado:
+            estados = {}
+            for trabajo in self._trabajos.values():
+                estados[trabajo.estado] = estados.get(trabajo.estado, 0) + 1
+            return {
+                'trabajadores': self.trabajadores,
+                'en_cola': estados.get(EN_COLA, 0),
+                'ejecutando': estados.get(EJECUTANDO, 0),
+                'maximo_cola': self.maximo,
+                'estados': estados,
+                'totales': dict(self._contadores),
+            }
+
+    def cerrar(self):
+        """Mata los procesos de los trabajadores (al salir del servidor)."""
+        for proceso in self._procesos:
+            proceso.detener()
+
+    # Hilos
+
+    def _iniciar_hilos(self):
+        while len(self._hilos) < self.trabajadores:
+            proceso = _Proceso()
+            hilo = threading.Thread(target=self._trabajar, args=(proceso,),
+                                    name=f'trabajo-{len(self._hilos) + 1}', daemon=True)
+            hilo.start()
+            self._hilos.append(hilo)
+            self._procesos.append(proceso)
+
+    def _trabajar(self, proceso):
+        while True:
+            trabajo = self._cola.get()
+            with self._candado:
+                if trabajo.estado != EN_COLA:
+                    continue  # Cancelado mientras esperaba
+                trabajo.estado = EJECUTANDO
+                trabajo.inicio = time.time()
+            try:
+                resultado, error = proceso.ejecutar(trabajo, self._vencer)
+            except Exception as e:
+                proceso.detener()
+                resultado, error = None, str(e) or type(e).__name__
+            with self._candado:
+                if trabajo.estado == EJECUTANDO:
+                    # Si se canceló o venció mientras corría, el resultado se descarta
+                    trabajo.resultado, trabajo.error = resultado, error
+                    self._terminar(trabajo, ERROR if error is not None else TERMINADO)
+
+    def _vencer(self, trabajo):
+        with self._candado:
+            if trabajo.estado == EJECUTANDO:
+                trabajo.error = f'Superó el tiempo límite de {trabajo.tiempo_limite:g} s'
+                self._terminar(trabajo, VENCIDO)
+
+    def _terminar(self, trabajo, estado):
+        trabajo.estado = estado
+        trabajo.fin = time.time()
+        self._contadores[estado] = self._contadores.get(estado, 0) + 1
+        trabajo.listo.set()
+
+    def _purgar(self):
+        # Olvidar los trabajos terminados hace más de `conservar` segundos
+        limite = time.time() - self.conservar
+        for id_trabajo in [i for i, t in self._trabajos.items() if t.estado in FINALES and t.fin < limite]:
+            del self._trabajos[id_trabajo]
+
+
+cola = ColaTrabajos(
+    trabajadores=config.TRABAJADORES,
+    maximo=config.COLA_MAXIMA,
+    tiempo_limite=config.TIEMPO_TRABAJO,
+)
+atexit.register(cola.cerrar)
@@ -1,4 +1,4 @@
-function [Tabla] = Newtonint(x, y)
+function [Tabla, pol] = Newtonint(x, y)
     format long
     
     % Convertir x e y a matrices numéricas
@@ -29,48 +29,13 @@ function [Tabla] = Newtonint(x, y)
         pol = pol + coef(i+1) * acum; %subtermino de polinomio de newton: pn(x) = b0 + b1(x-x0)+...+bn(x-x0)(x-x1)...(x-xn-1)
     end
     
-    currentDir = fileparts(mfilename('fullpath'));
-    
-    tablesDir = fullfile(currentDir, '..', 'app', 'tables');
-    mkdir(tablesDir);
-    cd(tablesDir);
-
     % Mostrar la tabla de diferencias divididas
     disp('Tabla de diferencias divididas de Newton:');
     disp(Tabla);
-    csv_file_path = fullfile(tablesDir, 'tabla_newtonint.csv');
-    
-    % Guardar la tabla con decimales
-    writetable(array2table(Tabla), csv_file_path, 'Delimiter', ',', 'WriteVariableNames', false);
-    
+
     % Mostrar el polinomio de interpolación
     disp('Polinomio de interpolacion:');
     disp(pol);
 
-    % Generar valores de x para graficar
-    xpol = min(x):0.001:max(x);
-    p = zeros(size(xpol));
-    
-    % Calcular el polinomio para cada grado
-    for i = 1:length(pol)
-        p = p + pol(i) * xpol.^(length(pol)-i);
-    end
-
-    figure
-    hold on
-    plot(x, y, 'r*', xpol, p, 'b')
-    legend('Datos', 'Polinomio de Interpolacion')
-    xlabel('x')
-    ylabel('y')
-    title('Interpolacion de Newton con Diferencias Divididas')
-    grid on
-    
-    % Guardar la gráfica en un archivo PNG
-
-    img = getframe(gcf);
-    staticDir = fullfile(currentDir, '..', 'app', 'static');
-    mkdir(staticDir);
-    imgPath = fullfile(staticDir, 'grafica_newtonInt.png');
-    imwrite(img.cdata, imgPath);
-    hold off;
+    % La gráfica se dibuja en Python (app/graficas.py)
 end
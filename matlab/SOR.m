@@ -2,8 +2,14 @@
 %Ax=b con base en una condición inicial x0,mediante el método Gauss Seidel (relajado), depende del valor de w 
 %entre (0,2)
 
-function [r, n, xi, E, radio] = SOR(x0, A, b, Tol, niter, w, tipe)
+function [r, n, xi, E, radio] = SOR(x0, A, b, Tol, niter, w, tipe, calcular_radio, ruta_grafica)
     format long;
+    if nargin < 8
+        calcular_radio = true;
+    end
+    if nargin < 9
+        ruta_grafica = 'app/static/grafica_sor.png';
+    end
     A = eval(A);
     b = eval(b);
     x0 = eval(x0);
@@ -17,12 +23,14 @@ function [r, n, xi, E, radio] = SOR(x0, A, b, Tol, niter, w, tipe)
     E = [];  % Lista para almacenar errores
     n = [];  % Lista para almacenar n
 
+    % Matrices de la iteración: se arman una sola vez y sin inversas.
+    % M es triangular inferior, así M \ y es una sustitución hacia adelante
+    M = D - w * L;
+    Nw = (1 - w) * D + w * U;
+    C = M \ (w * b);
+
     while error > Tol && c < niter
-        T = inv(D - w * L) * ((1 - w) * D + w * U);
-        radio_value= max(abs(eig(T))); 
-        radio = sprintf('El radio espectral es de %f', radio_value);
-        C = w * inv(D - w * L) * b;
-        x1 = T * x0 + C;
+        x1 = M \ (Nw * x0) + C;
         if strcmp(tipe, 'Cifras Significativas')
             error = norm((x1 - x0) ./ x1, 'inf');
         else
@@ -36,16 +44,20 @@ function [r, n, xi, E, radio] = SOR(x0, A, b, Tol, niter, w, tipe)
         c = c + 1;
     end
     
+    % Radio espectral de T = inv(D - w*L)*((1 - w)*D + w*U), una vez por solución
+    if calcular_radio
+        radio = sprintf('El radio espectral es de %f', max(abs(eig(M \ Nw))));
+    else
+        radio = 'Radio espectral no calculado';
+    end
+
     if error < Tol
         r = sprintf('es una aproximación de la solución del sistema con una tolerancia= %f\n', Tol);
     else
         r = sprintf('Fracasó en %d iteraciones\n', niter);
     end
 
-    T = table(n', xi', E', 'VariableNames', {'N', 'xi', 'E'});
-    csv_file_path = "app/tables/tabla_sor.csv";
-    writetable(T, csv_file_path)
-    
+    % La tabla de resultados (N, xi_1, ..., xi_n, E) se arma en Python con n, xi y E
     % Crear la figura para visualizar la matriz A, el vector solución x, y el vector b
     [sizee, const]= calculate(length(b));
     fig = figure('Visible','off');
@@ -93,7 +105,7 @@ function [r, n, xi, E, radio] = SOR(x0, A, b, Tol, niter, w, tipe)
     end
 
     % Guardar la figura como PNG
-    saveas(fig, 'app/static/grafica_sor.png');
+    saveas(fig, ruta_grafica);
     close(fig);
 end
 
@@ -74,51 +74,6 @@ function [r, N, xn, fm, E] = biseccion(f_str, xi, xs, Tol, niter, tipe)
     N = N_list;
     xn = xn_list;
 
-    % Guardar la tabla de resultados en un archivo CSV solo si el intervalo es adecuado
-    if ~isempty(N_list)
-        currentDir = fileparts(mfilename('fullpath')); % Directorio actual del script
-        tablesDir = fullfile(currentDir, '..', 'app', 'tables'); % Ruta a la carpeta "tables"
-        if ~exist(tablesDir, 'dir') % Si la carpeta no existe, crearla
-            mkdir(tablesDir);
-        end
-        % Generar la tabla y escribirla en un archivo CSV
-        csv_file_path = fullfile(tablesDir, 'tabla_biseccion.csv');
-        T = table(N', xn', fm', E', 'VariableNames', {'Iteration', 'xn', 'fxn', 'E'});
-        writetable(T, csv_file_path);
-        disp(['Tabla de resultados generada en: ', csv_file_path]);
-    else
-        warning('No se pudo generar la tabla de resultados porque N_list está vacío.');
-    end
-
-        % Crear y guardar la gráfica de resultados solo si xn no está vacío
-    if isempty(xn)
-        warning('La lista xn está vacía. No se puede generar la gráfica.');
-    else
-        fig = figure('Visible', 'off');
-        hold on;
-        xplot = linspace(min(xn) - 0.5, max(xn) + 0.5, 1000); % Rango de la gráfica
-        yline(0, '--', 'Color', 'black'); % Línea del eje Y
-        plot(xplot, f(xplot), 'b', 'LineWidth', 1.5); % Gráfica de la función
-        scatter(xn, f(xn), 'r', 'filled'); % Puntos intermedios
-        scatter(xn(end), f(xn(end)), 'g', 'filled', 'DisplayName', 'Raíz aproximada'); % Raíz aproximada
-        legend('Función', 'Iteraciones', 'Raíz aproximada');
-        title(['f(x) = ', f_str]); % Título dinámico con la función
-        xlabel('x');
-        ylabel('f(x)');
-        grid on;
-
-        % Generar un nombre seguro para el archivo basado en la función
-        safe_f_str = regexprep(f_str, '[^a-zA-Z0-9]', '_');
-
-        % Guardar en formato SVG
-        staticDir = fullfile(currentDir, '..', 'app', 'static'); % Ruta a la carpeta "static"
-        if ~exist(staticDir, 'dir')
-            mkdir(staticDir);
-        end
-        svgPath = fullfile(staticDir, [ safe_f_str, '.svg']);
-        saveas(fig, svgPath, 'svg');
-
-        disp(['Gráfica SVG generada en: ', svgPath]);
-        close(fig);
-    end
+    % La tabla de resultados (Iteration, xn, fxn, E) se arma en Python con N, xn, fm y E
+    % La gráfica se dibuja en Python (app/graficas.py)
 end
@@ -1,4 +1,10 @@
-function [r, N, xn, E, re, c] = gaussSeidel(x0, A, b, et, Tol, niter)
+function [r, N, xn, E, re, c] = gaussSeidel(x0, A, b, et, Tol, niter, calcular_radio, ruta_grafica)
+    if nargin < 7
+        calcular_radio = true;
+    end
+    if nargin < 8
+        ruta_grafica = 'app/static/grafica_gaussSeidel.png';
+    end
     disp(x0)
     disp(A)
     disp(b)
@@ -12,12 +18,14 @@ function [r, N, xn, E, re, c] = gaussSeidel(x0, A, b, et, Tol, niter)
     U = -triu(A, 1);
     N(c+1) = c;
 
+    % D - L es triangular inferior: cada iteración es una sustitución hacia adelante
+    DL = D - L;
+    C = DL \ b;
+
     while error > Tol && c < niter
-        T = inv(D-L) * U;
-        C = inv(D-L) * b;
-        x1 = T * x0 + C;
+        x1 = DL \ (U * x0) + C;
 
-        if strcmp(et, 'Error Absoluto')
+        if strcmp(et, 'Error Absoluto') || strcmp(et, 'Decimales Correctos')
             E(c+1)=norm(x1-x0,'inf');
         else
             E(c+1) = norm((x1 - x0) ./ x1, 'inf');
@@ -28,21 +36,21 @@ function [r, N, xn, E, re, c] = gaussSeidel(x0, A, b, et, Tol, niter)
         c = c + 1;
         xn{c} = mat2str(x1);
     end
-    Re=max(abs(eig(T)));
-    
+    % Radio espectral de T = inv(D - L)*U, una vez por solución
+    if calcular_radio
+        re = sprintf('Radio espectral de T= %f\n', max(abs(eig(DL \ U))));
+    else
+        re = 'Radio espectral no calculado';
+    end
+
     if error < Tol
-        re = sprintf('Radio espectral de T= %f\n',Re)
-        r = sprintf('%s Es una aproximación de la solución del sistema con una tolerancia= %f\n',xn{c}, Tol)
+        r = sprintf('%s Es una aproximación de la solución del sistema con una tolerancia= %f\n',xn{c}, Tol);
     else 
-        re = sprintf('Radio espectral de T= %f\n',Re)
-        r = sprintf('Fracasó en %f iteraciones\n', niter) 
+        r = sprintf('Fracasó en %f iteraciones\n', niter);
     end
 
 
-    T = table(N', xn', E', 'VariableNames', {'Iteration', 'xn', 'E'});
-    csv_file_path = "app/tables/tabla_gaussSeidel.csv";
-    writetable(T, csv_file_path)
-    
+    % La tabla de resultados (Iteration, xn, E) se arma en Python con N, xn y E
 
     % Crear la figura para visualizar la matriz A, el vector solución x, y el vector b
     [sizee, const]= calculate(length(b));
@@ -92,7 +100,7 @@ function [r, N, xn, E, re, c] = gaussSeidel(x0, A, b, et, Tol, niter)
 
     
     % Guardar la figura como PNG
-    saveas(fig, 'app/static/grafica_gaussSeidel.png');
+    saveas(fig, ruta_grafica);
     close(fig);
    
 end
@@ -1,4 +1,10 @@
-function [r, N, xi, E, Re] = jacobi(x0, A, b, Tol, niter, error_type)
+function [r, N, xi, E, Re] = jacobi(x0, A, b, Tol, niter, error_type, calcular_radio, ruta_grafica)
+    if nargin < 7
+        calcular_radio = true;
+    end
+    if nargin < 8
+        ruta_grafica = '';
+    end
     x0 = eval(x0);
     A = eval(A);
     b = eval(b);
@@ -7,12 +13,16 @@ function [r, N, xi, E, Re] = jacobi(x0, A, b, Tol, niter, error_type)
     D = diag(diag(A));
     L = -tril(A, -1);
     U = -triu(A, +1);
-    Tr = inv(D) * (L + U);
-    C = inv(D) * b;
+    % inv(D) solo divide cada fila entre su elemento de la diagonal
+    d = diag(A);
+    Tr = (L + U) ./ d;
+    C = b ./ d;
 
-    autovalores = eig(Tr);
-    calculo_re = max(abs(autovalores));
-    Re = sprintf('Radio espectral: %f', calculo_re);
+    if calcular_radio
+        Re = sprintf('Radio espectral: %f', max(abs(eig(Tr))));
+    else
+        Re = 'Radio espectral no calculado';
+    end
 
     xi = []; % Inicializar xi como una matriz vacía
     E = [];  % Inicializar E como una lista vacía
@@ -21,7 +31,7 @@ function [r, N, xi, E, Re] = jacobi(x0, A, b, Tol, niter, error_type)
     while error > Tol && c < niter
         x1 = Tr * x0 + C;
 
-        if strcmp(error_type, 'Error Absoluto')
+        if strcmp(error_type, 'Error Absoluto') || strcmp(error_type, 'Decimales Correctos')
             E(c + 1) = norm(x1 - x0, 'inf');
         else
             E(c + 1) = norm((x1 - x0) ./ x1, 'inf');
@@ -40,18 +50,8 @@ function [r, N, xi, E, Re] = jacobi(x0, A, b, Tol, niter, error_type)
         r = sprintf('Fracasó en %f iteraciones\n', niter); 
     end
 
-    % Guardar los resultados en un archivo CSV
-    xi_table = array2table(xi, 'VariableNames', arrayfun(@(i) sprintf('x%d', i), 1:size(xi, 2), 'UniformOutput', false));
-    T = table(N', E', 'VariableNames', {'Iteration', 'E'});
-    T = [T, xi_table];
-    
+    % La tabla de resultados (Iteration, E, x1, ..., xn) se arma en Python con N, E y xi
     currentDir = fileparts(mfilename('fullpath'));
-    tablesDir = fullfile(currentDir, '..', 'app', 'tables');
-    if ~exist(tablesDir, 'dir')
-        mkdir(tablesDir);
-    end
-    csvFilePath = fullfile(tablesDir, 'tabla_jacobi.csv');
-    writetable(T, csvFilePath);
 
     % Crear la figura para visualizar la matriz A, el vector solución x, y el vector b
     [sizee, const]= calculate(length(b));
@@ -106,6 +106,10 @@ function [r, N, xi, E, Re] = jacobi(x0, A, b, Tol, niter, error_type)
         mkdir(staticDir);  % Crea el directorio si no existe
     end
     imgPath = fullfile(staticDir, 'grafica_jacobi.png');
+    if ~isempty(ruta_grafica)
+        % Ruta propia de la petición (ver _figura en app/backend.py)
+        imgPath = ruta_grafica;
+    end
     img = getframe(gcf);
     imwrite(img.cdata, imgPath);
     hold off;
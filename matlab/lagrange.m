@@ -17,34 +17,6 @@ function [pol] = lagrange(vectorx, vectory)
     end
     pol = sum(Tabla);
 
-    % Convertir el polinomio a una cadena de texto
-    polinomio_str = sprintf('%f ', pol);  % Crear una cadena con coeficientes
-
-    % Guardar el polinomio en un archivo CSV
-    tabla = table({polinomio_str}, 'VariableNames', {'Polinomio'});
-    currentDir = fileparts(mfilename('fullpath'));
-    tablesDir = fullfile(currentDir, '..', 'app', 'tables');
-    mkdir(tablesDir);
-
-    csv_file_path = fullfile(tablesDir, 'tabla_lagrange.csv');
-    writetable(tabla, csv_file_path);
-
-    % Crear un conjunto de puntos para graficar el polinomio
-    x_vals = linspace(min(xv), max(xv), 1000);
-    y_vals = polyval(pol, x_vals);
-
-    % Graficar el polinomio resultante
-    figure;
-    plot(x_vals, y_vals, 'r', xv, yv, 'bo'); % Polinomio en rojo, puntos en azul
-    title('Polinomio de Lagrange');
-    xlabel('x');
-    ylabel('y');
-    legend('Polinomio de Lagrange', 'Puntos de entrada');
-    grid on;
-
-    img = getframe(gcf);
-    staticDir = fullfile(currentDir, '..', 'app', 'static');
-    mkdir(staticDir);
-    imgPath = fullfile(staticDir, 'grafica_lagrange.png');
-    imwrite(img.cdata, imgPath);
+    % La cadena del polinomio se arma en Python con los coeficientes pol
+    % La gráfica se dibuja en Python (app/graficas.py)
 end
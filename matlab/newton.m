@@ -59,55 +59,6 @@ function [r, N, xn, fm, dfm, E, c] = newton(f_str, x0, Tol, niter, et)
     dfm = dfm(1:max_length);
     E = E(1:max_length);
 
-    % Crear y guardar tabla CSV
-    T = table(N', xn', fm', dfm', E', 'VariableNames', {'Iteration', 'xn', 'fxn', 'dfxn', 'Error'});
-
-    currentDir = fileparts(mfilename('fullpath'));
-    tablesDir = fullfile(currentDir, '..', 'app', 'tables');
-    if ~exist(tablesDir, 'dir')
-        mkdir(tablesDir);
-    end
-    csv_file_path = fullfile(tablesDir, 'tabla_newton.csv');
-    writetable(T, csv_file_path);
-
-    % Crear gráfica
-    disp('Iniciando generación de gráfica...');
-    fig = figure('Visible', 'off');
-
-    x_min = min(xn) - 2;
-    x_max = max(xn) + 2;
-
-    % Validar si x_min y x_max son iguales
-    if x_min == x_max
-        x_min = x_min - 1;
-        x_max = x_max + 1;
-    end
-
-    disp(['Rango de x: ', num2str(x_min), ' a ', num2str(x_max)]);
-
-    x_plot = linspace(x_min, x_max, 100);
-    y_plot = arrayfun(f, x_plot);
-
-    hold on;
-    yline(0, '--k'); % Línea horizontal en y = 0
-    plot(x_plot, y_plot, 'b', 'LineWidth', 1.5); % Curva de la función
-    scatter(xn, arrayfun(f, xn), 'ro'); % Puntos de las iteraciones
-    title(['f(x) = ' f_str]); % Título dinámico con la función
-    xlabel('x');
-    ylabel('f(x)');
-    grid on;
-
-    % Guardar gráfica como SVG
-    staticDir = fullfile(currentDir, '..', 'app', 'static');
-    if ~exist(staticDir, 'dir')
-        mkdir(staticDir);
-    end
-
-    % Generar nombre seguro para el archivo
-    safe_f_str = regexprep(f_str, '[^a-zA-Z0-9]', '_');
-    svgPath = fullfile(staticDir, [safe_f_str '.svg']);
-    disp(['Guardando gráfica como: ', svgPath]);
-    saveas(fig, svgPath, 'svg'); % Guardar como SVG
-    close(fig); % Cerrar la figura
-
+    % La tabla de resultados (Iteration, xn, fxn, dfxn, Error) se arma en Python
+    % La gráfica se dibuja en Python (app/graficas.py)
 end
@@ -47,45 +47,6 @@ function [r, N, xn, fm, E] = pf(f_str, g_str, x0, Tol, niter, tipe)
         r = sprintf('Fracasó en %f iteraciones\n', niter);
     end
 
-    % Guardar los resultados en un archivo CSV
-    currentDir = fileparts(mfilename('fullpath'));
-    tablesDir = fullfile(currentDir, '..', 'app', 'tables');
-    if ~exist(tablesDir, 'dir')
-        mkdir(tablesDir);
-    end
-    csv_file_path = fullfile(tablesDir, 'tabla_pf.csv');
-    T = table(N', xn', fm', E', 'VariableNames', {'Iteration', 'xn', 'fxn', 'E'});
-    writetable(T, csv_file_path);
-
-    % Generar un nombre seguro para el archivo basado en la función
-    safe_f_str = regexprep(f_str, '[^a-zA-Z0-9]', '_'); % Reemplazar caracteres no permitidos
-
-    % Generar y guardar la gráfica como SVG
-    fig = figure('Visible', 'off');
-    x_min = min(xn) - 2;
-    x_max = max(xn) + 2;
-    xplot = linspace(x_min, x_max, 1000);
-    yplot = arrayfun(f, xplot);
-
-    hold on;
-    yline(0, '--', 'Color', 'black'); % Línea del eje Y
-    plot(xplot, yplot, 'b', 'LineWidth', 1.5); % Curva de la función
-    scatter(xn(end), fm(end), 'r', 'filled', 'DisplayName', 'Raíz aproximada'); % Raíz aproximada
-    title(['f(x) = ' f_str]); % Título dinámico con la función
-    xlabel('x');
-    ylabel('f(x)');
-    legend;
-    grid on;
-
-
-    staticDir = fullfile(currentDir, '..', 'app', 'static');
-    if ~exist(staticDir, 'dir')
-        mkdir(staticDir);
-    end
-    svgPath = fullfile(staticDir, ['grafica_' safe_f_str '.svg']);
-    saveas(fig, svgPath, 'svg'); % Guardar como SVG
-    disp(['Gráfica SVG generada en: ', svgPath]);
-
-    hold off;
-    close(fig);
+    % La tabla de resultados (Iteration, xn, fxn, E) se arma en Python con N, xn, fm y E
+    % La gráfica se dibuja en Python (app/graficas.py)
 end
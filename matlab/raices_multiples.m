@@ -1,4 +1,4 @@
-function [xi, errores, resultado] = multiple_roots(fn_str, xi, tol, k, et)
+function [xi, errores, resultado, xis, fxis] = multiple_roots(fn_str, xi, tol, k, et)
     % Validar el tipo de error
     if ~ismember(et, {'Decimales Correctos', 'Cifras Significativas'})
         error('El tipo de error no es valido');
@@ -55,43 +55,8 @@ function [xi, errores, resultado] = multiple_roots(fn_str, xi, tol, k, et)
         resultado = sprintf('Fracasó en %d iteraciones\n', k);
     end
 
-    % Graficar resultados
-    fig = figure('Visible', 'off');
-    x_vals = linspace(min(xis) - 1, max(xis) + 1, 1000);
-    y_vals = arrayfun(fn, x_vals);
-    plot(x_vals, y_vals, 'b', 'LineWidth', 1.5);
-    hold on;
-    scatter(xis, arrayfun(fn, xis), 'ro');
-    title(['f(x) = ', fn_str]); % Título dinámico
-    xlabel('x');
-    ylabel('f(x)');
-    grid on;
+    % La gráfica se dibuja en Python (app/graficas.py)
 
-    % Generar un nombre seguro para el archivo basado en la función
-    safe_fn_str = regexprep(fn_str, '[^a-zA-Z0-9]', '_');
-
-    % Guardar la gráfica
-    currentDir = fileparts(mfilename('fullpath'));
-    staticDir = fullfile(currentDir, '..', 'app', 'static');
-    if ~exist(staticDir, 'dir')
-        mkdir(staticDir);
-    end
-
-    % Guardar como SVG
-    svgPath = fullfile(staticDir, [safe_fn_str, '.svg']);
-    saveas(fig, svgPath, 'svg');
-    disp(['Gráfica SVG generada en: ', svgPath]);
-
-    close(fig);
-
-
-    % Guardar resultados en un archivo CSV
-    T = table((1:length(xis))', xis', arrayfun(fn, xis)', errores', ...
-        'VariableNames', {'Iteración', 'xi', 'f(xi)', 'Error'});
-    tablesDir = fullfile(currentDir, '..', 'app', 'tables');
-    if ~exist(tablesDir, 'dir')
-        mkdir(tablesDir);
-    end
-    csvFilePath = fullfile(tablesDir, 'multiple_roots_results.csv');
-    writetable(T, csvFilePath);
+    % Columnas de la tabla de resultados (Iteración, xi, f(xi), Error)
+    fxis = arrayfun(fn, xis);
 end
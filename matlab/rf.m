@@ -1,4 +1,4 @@
-function [respuesta] = ReglaFalsa(func, x0, x1, Tol, niter, Terror)
+function [respuesta, n, xm, xi, xs, fm, fi, fs, E] = ReglaFalsa(func, x0, x1, Tol, niter, Terror)
     % Convertir la función de entrada a un handle de función
     f = str2func(['@(x)', func]);
 
@@ -9,21 +9,16 @@ function [respuesta] = ReglaFalsa(func, x0, x1, Tol, niter, Terror)
     fi(c) = f(xi(c));
     fs(c) = f(xs(c));
 
-    % Verificar raíces inmediatas
-    if fi(c) == 0
-        xm(c) = xi(c);
-        fm(c) = f(xm(c));
-        E(c) = 0;
-        respuesta = sprintf('El límite inferior %f es raíz de f(x)', xi(c));
-        return;
-    elseif fs(c) == 0
-        xm(c) = xs(c);
-        fm(c) = f(xm(c));
-        E(c) = 0;
-        respuesta = sprintf('El límite superior %f es raíz de f(x)', xs(c));
-        return;
-    elseif fi(c) * fs(c) > 0
-        respuesta = 'El intervalo proporcionado no es adecuado.';
+    % Verificar raíces inmediatas (sin tabla de iteraciones)
+    if fi(c) == 0 || fs(c) == 0 || fi(c) * fs(c) > 0
+        if fi(c) == 0
+            respuesta = sprintf('El límite inferior %f es raíz de f(x)', xi(c));
+        elseif fs(c) == 0
+            respuesta = sprintf('El límite superior %f es raíz de f(x)', xs(c));
+        else
+            respuesta = 'El intervalo proporcionado no es adecuado.';
+        end
+        [n, xm, xi, xs, fm, fi, fs, E] = deal([]);
         return;
     end
 
@@ -71,39 +66,7 @@ function [respuesta] = ReglaFalsa(func, x0, x1, Tol, niter, Terror)
         respuesta = sprintf('Fracasó en %d iteraciones', niter);
     end
 
-    % Crear tabla de resultados
-    T = table((1:c)', xm', xi', xs', fm', fi', fs', E', ...
-        'VariableNames', ["n", "x_m", "x_i", "x_s", "f_m", "f_i", "f_s", "E"]);
-
-    % Guardar tabla como CSV
-    currentDir = fileparts(mfilename('fullpath'));
-    tablesDir = fullfile(currentDir, '..', 'app', 'tables');
-    if ~exist(tablesDir, 'dir')
-        mkdir(tablesDir);
-    end
-    csvFilePath = fullfile(tablesDir, 'tabla_reglaFalsa.csv');
-    writetable(T, csvFilePath);
-
-    % Graficar resultados
-    fig = figure('Visible', 'off');
-    xplot = linspace(min([xi, xs]) - 1, max([xi, xs]) + 1, 1000);
-    plot(xplot, arrayfun(f, xplot), 'b', 'LineWidth', 1.5);
-    hold on;
-    scatter(xm, arrayfun(f, xm), 'ro');
-    yline(0, '--k');
-    title(['f(x) = ', func]); % Título dinámico
-    xlabel('x');
-    ylabel('f(x)');
-    grid on;
-
-    % Guardar la gráfica con un nombre dinámico basado en la función
-    safe_func = regexprep(func, '[^a-zA-Z0-9]', '_');
-    staticDir = fullfile(currentDir, '..', 'app', 'static');
-    if ~exist(staticDir, 'dir')
-        mkdir(staticDir);
-    end
-    svgPath = fullfile(staticDir, [safe_func, '.svg']);
-    saveas(fig, svgPath, 'svg');
-    disp(['Gráfica SVG generada en: ', svgPath]);
-    close(fig);
+    % Columnas de la tabla de resultados (n, x_m, x_i, x_s, f_m, f_i, f_s, E)
+    n = 1:c;
+    % La gráfica se dibuja en Python (app/graficas.py)
 end
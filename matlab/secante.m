@@ -66,39 +66,6 @@ function [respuesta, N, XN, fm, E] = secante(func, x0, x1, Tol, niter, Terror)
     fm = fm(1:c + 2);
     E = E(1:c + 2);
 
-    % Crear tabla de resultados
-    T = table(N', XN', fm', E', 'VariableNames', {'Iteration', 'xn', 'fxn', 'Error'});
-
-    % Guardar tabla como CSV
-    currentDir = fileparts(mfilename('fullpath'));
-    tablesDir = fullfile(currentDir, '..', 'app', 'tables');
-    if ~exist(tablesDir, 'dir')
-        mkdir(tablesDir);
-    end
-    csvFilePath = fullfile(tablesDir, 'tabla_secante.csv');
-    writetable(T, csvFilePath);
-
-    % Crear gráfica de convergencia
-    fig = figure('Visible', 'off');
-    xplot = linspace(min(XN) - 1, max(XN) + 1, 1000);
-    plot(xplot, arrayfun(f, xplot), 'b', 'LineWidth', 1.5);
-    hold on;
-    scatter(XN, arrayfun(f, XN), 'ro');
-    yline(0, '--k');
-    title(['f(x) = ', func]); % Título dinámico
-    xlabel('x');
-    ylabel('f(x)');
-    grid on;
-
-    % Generar nombre seguro para el archivo basado en la función
-    safe_func_name = regexprep(func, '[^a-zA-Z0-9]', '_');
-
-    % Guardar como SVG
-    staticDir = fullfile(currentDir, '..', 'app', 'static');
-    if ~exist(staticDir, 'dir')
-        mkdir(staticDir);
-    end
-    svgPath = fullfile(staticDir, [safe_func_name, '.svg']);
-    saveas(fig, svgPath, 'svg');
-    close(fig);
+    % La tabla de resultados (Iteration, xn, fxn, Error) se arma en Python con N, XN, fm y E
+    % La gráfica se dibuja en Python (app/graficas.py)
 end
@@ -128,33 +128,7 @@ function [Tabla] = spline(x,y,d)
     val = A\b; % Cambiado a `\` para mayor estabilidad numérica
     Tabla = reshape(val, d+1, n-1)';
 
-    % Exportar la tabla a un archivo CSV
-    csv_file_path = "app/tables/tabla_spline.csv";
-    writematrix(Tabla, csv_file_path);
-
-    % Graficar los resultados
-    fig = figure('Visible', 'off');
-    hold on;
-    plot(x, y, 'ro', 'MarkerFaceColor', 'r'); % Puntos originales
-    
-    for i = 1:n-1
-        xx = linspace(x(i), x(i+1), 100);
-        if d == 1
-            yy = Tabla(i,1)*xx + Tabla(i,2);
-        elseif d == 2
-            yy = Tabla(i,1)*xx.^2 + Tabla(i,2)*xx + Tabla(i,3);
-        elseif d == 3
-            yy = Tabla(i,1)*xx.^3 + Tabla(i,2)*xx.^2 + Tabla(i,3)*xx + Tabla(i,4);
-        end
-        plot(xx, yy, 'b-');
-    end
-    title('Interpolación Spline');
-    xlabel('x');
-    ylabel('y');
-    img = getframe(gcf);
-    imwrite(img.cdata, 'app/static/grafica_spline.png');
-    hold off
-    close(fig);
+    % La gráfica se dibuja en Python (app/graficas.py)
 end
     
     
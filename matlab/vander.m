@@ -1,4 +1,4 @@
-function [pol] = vandermonde(vectorx, vectory)
+function [pol, poly_str] = vandermonde(vectorx, vectory)
     % Asignar los vectores de entrada
     xv = vectorx;
     yv = vectory;
@@ -51,35 +51,5 @@ function [pol] = vandermonde(vectorx, vectory)
         end
     end
     
-    % Guardar el polinomio en un archivo CSV
-    tabla = table({poly_str}, 'VariableNames', {'Polinomio'});
-    currentDir = fileparts(mfilename('fullpath'));
-    tablesDir = fullfile(currentDir, '..', 'app', 'tables');
-    if ~exist(tablesDir, 'dir')
-        mkdir(tablesDir);
-    end
-    csv_file_path = fullfile(tablesDir, 'pol_vandermonde.csv');
-    writetable(tabla, csv_file_path);
-
-    % Crear un conjunto de puntos para graficar el polinomio
-    x_vals = linspace(min(xv), max(xv), 1000);
-    y_vals = polyval(pol, x_vals);
-
-    % Graficar el polinomio resultante
-    figure;
-    plot(x_vals, y_vals, 'r', xv, yv, 'bo'); % Polinomio en rojo, puntos en azul
-    title('Polinomio usando matriz de Vandermonde');
-    xlabel('x');
-    ylabel('y');
-    legend('Polinomio', 'Puntos de entrada');
-    grid on;
-    img = getframe(gcf);
-    staticDir = fullfile(currentDir, '..', 'app', 'static');
-    if ~exist(staticDir, 'dir')
-        mkdir(staticDir);  % Crea el directorio si no existe
-    end
-    imgPath = fullfile(staticDir, 'grafica_vander.png');
-
-    imwrite(img.cdata, imgPath);
-
+    % La gráfica se dibuja en Python (app/graficas.py)
 end
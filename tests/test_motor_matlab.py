@@ -0,0 +1,80 @@
+"""Pool de motores de app/motor_matlab.py con el motor falso (sin MATLAB)."""
+import threading
+import time
+
+import pytest
+
+from app.motor_matlab import ErrorMatlab, ErrorMotor, MotorFalso, PoolMotores
+
+
+def test_inicia_motores_bajo_demanda():
+    pool = PoolMotores(2, iniciar=MotorFalso, espera=1)
+    assert pool.estado() == {'maximo': 2, 'creados': 0, 'libres': 0}
+    with pool.motor() as eng:
+        assert pool.estado()['creados'] == 1
+        assert eng.biseccion('x^2 - 2', 0.0, 2.0, 1e-7, 100, 'Decimales Correctos', nargout=5)[0]
+    assert pool.estado() == {'maximo': 2, 'creados': 1, 'libres': 1}
+
+
+def test_espera_total_acotada():
+    espera = 0.3
+    pool = PoolMotores(1, iniciar=MotorFalso, espera=espera)
+    ocupado, terminar = threading.Event(), threading.Event()
+
+    def ocupar():
+        with pool.motor():
+            ocupado.set()
+            terminar.wait()
+
+    def despertar():
+        # Avisos que no liberan ningún motor no deben reiniciar la espera
+        while not terminar.is_set():
+            with pool._condicion:
+                pool._condicion.notify_all()
+            time.sleep(0.02)
+
+    threading.Thread(target=ocupar, daemon=True).start()
+    ocupado.wait()
+    threading.Thread(target=despertar, daemon=True).start()
+
+    tiempos, errores = [], []
+
+    def pedir():
+        inicio = time.monotonic()
+        try:
+            with pool.motor():
+                pass
+        except ErrorMotor as e:
+            errores.append(e)
+        tiempos.append(time.monotonic() - inicio)
+
+    hilos = [threading.Thread(target=pedir) for _ in range(3)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join(5)
+    terminar.set()
+
+    assert len(errores) == 3
+    assert all(espera - 0.05 <= t < espera + 0.5 for t in tiempos)
+
+
+def test_descarta_motor_cerrado():
+    pool = PoolMotores(1, iniciar=MotorFalso, espera=1)
+    with pool.motor() as eng:
+        pass
+    eng.quit()
+    with pool.motor() as nuevo:
+        assert nuevo is not eng
+        assert nuevo.activo
+    assert pool.estado() == {'maximo': 1, 'creados': 1, 'libres': 1}
+
+
+def test_error_de_matlab_devuelve_el_motor():
+    pool = PoolMotores(1, iniciar=MotorFalso, espera=1)
+    with pytest.raises(ErrorMatlab):
+        with pool.motor() as eng:
+            raise ErrorMatlab('Error en el código del usuario')
+    assert pool.estado() == {'maximo': 1, 'creados': 1, 'libres': 1}
+    with pool.motor() as otro:
+        assert otro is eng